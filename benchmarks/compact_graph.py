@@ -0,0 +1,95 @@
+r"""Benchmark the memory used by CompactGraph and DependencyGraph on a large graph.
+
+A random graph with the given number of modules, each importing other modules
+and a few external packages, is built with both classes, the same way CodeParser
+adds the modules and their imports. The peak memory measured by tracemalloc,
+the build time and the time to compute the dependency matrix and node degrees
+are reported.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.compact_graph --modules 100000
+"""
+import argparse
+import random
+import tracemalloc
+from time import perf_counter
+
+from benchmarks.utilities import EXTERNAL_PACKAGES
+from depender.graph import CompactGraph, DependencyGraph
+
+
+def generate_edges(module_count: int, imports_per_module: int, seed: int = 0):
+    rng = random.Random(seed)
+    modules = [
+        "generated.sub{}.module{}".format(i // 50, i) for i in range(module_count)
+    ]
+    edges = list()
+    for module in modules:
+        for _ in range(imports_per_module):
+            if rng.random() < 0.3:
+                edges.append((module, rng.choice(EXTERNAL_PACKAGES), True))
+            else:
+                edges.append((module, rng.choice(modules), False))
+    return modules, edges
+
+
+def build(graph, modules, edges):
+    for module in modules:
+        graph.add_node(module, label=module, package="generated")
+    for source, sink, external in edges:
+        if external:
+            graph.add_node(sink, label=sink + " external", external=True)
+        else:
+            graph.add_node(sink, label=sink)
+        graph.add_edge(source, sink)
+    return graph
+
+
+def measure(name, function):
+    tracemalloc.start()
+    start = perf_counter()
+    result = function()
+    elapsed = perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        "{:<24s} {:8.3f}s  retained {:8.2f} MiB  peak {:8.2f} MiB".format(
+            name, elapsed, current / 2**20, peak / 2**20
+        )
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=20000)
+    parser.add_argument("--imports", type=int, default=10)
+    args = parser.parse_args()
+
+    modules, edges = generate_edges(args.modules, args.imports)
+    print("modules: {}, imports: {}".format(len(modules), len(edges)))
+    graph = measure(
+        "DependencyGraph build", lambda: build(DependencyGraph(), modules, edges)
+    )
+    measure(
+        "DependencyGraph degrees",
+        lambda: (dict(graph.in_degree()), dict(graph.out_degree())),
+    )
+    graph = None
+    compact_graph = measure(
+        "CompactGraph build",
+        lambda: build(CompactGraph(), modules, edges),
+    )
+    # Merge the added edges into the CSR arrays
+    measure("CompactGraph adjacency", compact_graph.adjacency)
+    measure(
+        "CompactGraph degrees",
+        lambda: (compact_graph.in_degree(), compact_graph.out_degree()),
+    )
+    if args.modules <= 5000:
+        measure("CompactGraph matrix", compact_graph.dependency_matrix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+r"""Benchmark the construction of the dependency matrix of a large graph.
+
+The dense and sparse matrices returned by DependencyGraph.dependency_matrix
+are compared to the list of lists that the backends used to fill edge by edge.
+The time and peak memory measured by tracemalloc are reported.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.dependency_matrix --modules 5000
+"""
+import argparse
+import tracemalloc
+from time import perf_counter
+
+from benchmarks.compact_graph import build, generate_edges
+from depender.graph import DependencyGraph
+
+
+def legacy_matrix(graph):
+    graph.layout(matrix=True)
+    node_count = graph.number_of_nodes()
+    matrix = [[0 for _ in range(node_count)] for _ in range(node_count)]
+    for (source, sink, values) in graph.edges.data():
+        matrix[graph.nodes[source]["index"]][graph.nodes[sink]["index"]] = values[
+            "count"
+        ]
+    return matrix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=5000)
+    parser.add_argument("--imports", type=int, default=10)
+    args = parser.parse_args()
+
+    modules, edges = generate_edges(args.modules, args.imports)
+    graph = build(DependencyGraph(), modules, edges)
+    print(
+        "nodes: {}, edges: {}".format(graph.number_of_nodes(), graph.number_of_edges())
+    )
+    for name, function in [
+        ("list of lists", lambda: legacy_matrix(graph)),
+        ("dense", lambda: graph.dependency_matrix()),
+        ("sparse", lambda: graph.dependency_matrix(sparse=True)),
+    ]:
+        tracemalloc.start()
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            "{:<14s} {:8.3f}s  peak memory {:9.2f} MiB".format(
+                name, elapsed, peak / 2**20
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+r"""Benchmark traverse_directory on a tree containing a large excluded subtree.
+
+The current implementation is compared to the previous one, which walked
+the excluded subtree and collected all directories before yielding them.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.directory_traversal --excluded-files 50000
+"""
+import argparse
+import os
+import tempfile
+from pathlib import Path
+from typing import Collection
+
+from benchmarks.utilities import generate_package, timeit
+from depender.parse.utilities import traverse_directory
+
+
+def check_if_skip_directory(
+    directory: Path, excluded_directories: Collection[Path]
+) -> bool:
+    if directory in excluded_directories or "__pycache__" in directory.name:
+        return True
+    else:
+        return False
+
+
+def legacy_traverse_directory(
+    directory, excluded_directories, depth, followlinks, breadth_first=False
+):
+    root_depth = len(directory.parents)
+    dirlist = list()
+    for root, dirs, files in os.walk(directory.resolve(), followlinks=followlinks):
+        root = Path(root).resolve()
+        if check_if_skip_directory(root, excluded_directories):
+            continue
+        current_depth = len(root.parents) - root_depth
+        if current_depth > depth >= 0:
+            continue
+        dirs = [Path(dir) for dir in dirs if not dir.startswith(".")]
+        files = [Path(file) for file in files]
+        dirlist.append((root, dirs, files))
+        if breadth_first:
+            dirlist = sorted(dirlist, key=lambda x: len(x[0].parents))
+    for root, dirs, files in dirlist:
+        yield root, dirs, files
+
+
+def generate_excluded_tree(root: Path, file_count: int, files_per_directory: int):
+    for i in range(0, file_count, files_per_directory):
+        directory = root.joinpath("group{}".format(i // 1000), "dir{}".format(i))
+        directory.mkdir(parents=True)
+        for j in range(files_per_directory):
+            directory.joinpath("file{}.js".format(j)).write_text("")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=500)
+    parser.add_argument("--excluded-files", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        package_path = generate_package(Path(tmp_dir), module_count=args.modules)
+        excluded_path = package_path / "node_modules"
+        generate_excluded_tree(excluded_path, args.excluded_files, 20)
+        excluded_directories = [excluded_path.resolve()]
+        print(
+            "modules: {}, files in the excluded subtree: {}".format(
+                args.modules, args.excluded_files
+            )
+        )
+        for breadth_first in (False, True):
+            timings = dict()
+            for name, function in (
+                ("legacy", legacy_traverse_directory),
+                ("current", traverse_directory),
+            ):
+                timings[name], _ = timeit(
+                    lambda: list(
+                        function(
+                            package_path,
+                            excluded_directories,
+                            depth=-1,
+                            followlinks=False,
+                            breadth_first=breadth_first,
+                        )
+                    ),
+                    repeat=args.repeat,
+                )
+            print(
+                "breadth_first={!s:<5} legacy: {:.3f}s current: {:.3f}s"
+                " speedup x{:.2f}".format(
+                    breadth_first,
+                    timings["legacy"],
+                    timings["current"],
+                    timings["legacy"] / timings["current"],
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
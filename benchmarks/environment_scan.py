@@ -0,0 +1,75 @@
+r"""Benchmark EnvironmentParser on a generated site-packages directory.
+
+The whole environment, parsed in a single run with one node per distribution,
+is compared to running CodeParser.parse_project once per installed package,
+which is what the command line interface had to do before.
+The peak memory of the environment scan is reported for several batch sizes.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.environment_scan --distributions 600 --jobs 0
+"""
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.utilities import generate_site_packages, timeit
+from depender.parse.code import CodeParser
+from depender.parse.environment import EnvironmentParser
+
+
+def per_package_scan(site_packages: Path, jobs: int) -> None:
+    for package_path in sorted(site_packages.iterdir()):
+        if package_path.joinpath("__init__.py").is_file():
+            CodeParser().parse_project(
+                package_path, is_module=False, excluded_directories=[], jobs=jobs
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--distributions", type=int, default=100)
+    parser.add_argument("--modules", type=int, default=50)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        site_packages = generate_site_packages(
+            Path(tmp_dir),
+            distribution_count=args.distributions,
+            modules_per_distribution=args.modules,
+        )
+        print(
+            "distributions: {}, modules per distribution: {}, jobs: {}".format(
+                args.distributions, args.modules, args.jobs
+            )
+        )
+        best, _ = timeit(
+            lambda: per_package_scan(site_packages, args.jobs), repeat=args.repeat
+        )
+        print("once per package  {:8.3f}s".format(best))
+        best, _ = timeit(
+            lambda: EnvironmentParser().parse_environment(
+                [str(site_packages)], jobs=args.jobs
+            ),
+            repeat=args.repeat,
+        )
+        print("environment scan  {:8.3f}s".format(best))
+        for batch_size in (500, 2000, 10000):
+            tracemalloc.start()
+            EnvironmentParser(batch_size=batch_size).parse_environment(
+                [str(site_packages)], jobs=args.jobs
+            )
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                "batch size {:<6d}  peak memory {:8.2f} MiB".format(
+                    batch_size, peak / 2**20
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
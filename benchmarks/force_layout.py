@@ -0,0 +1,52 @@
+r"""Benchmark force_directed_layout on random graphs of increasing size.
+
+It is compared to networkx's spring_layout, which computes the repulsion
+between all pairs of nodes, on the graphs that are small enough.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.force_layout --sizes 1000,10000,50000
+"""
+import argparse
+
+import networkx as nx
+import numpy as np
+
+from benchmarks.utilities import timeit
+from depender.graph.layout import force_directed_layout
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=str, default="1000,5000,10000")
+    parser.add_argument("--edges-per-node", type=int, default=3)
+    parser.add_argument("--max-networkx-size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    for node_count in map(int, args.sizes.split(",")):
+        random_state = np.random.RandomState(0)
+        edge_count = node_count * args.edges_per_node
+        sources = random_state.randint(0, node_count, edge_count)
+        # Mostly local edges, as between the modules of a sub-package
+        sinks = (sources + random_state.randint(1, 50, edge_count)) % node_count
+        best, _ = timeit(
+            lambda: force_directed_layout(node_count, sources, sinks),
+            repeat=args.repeat,
+        )
+        line = "nodes={:<7d} edges={:<7d} force_directed_layout {:8.3f}s".format(
+            node_count, edge_count, best
+        )
+        if node_count <= args.max_networkx_size:
+            graph = nx.Graph()
+            graph.add_nodes_from(range(node_count))
+            graph.add_edges_from(zip(sources, sinks))
+            networkx_best, _ = timeit(
+                lambda: nx.spring_layout(graph, seed=0), repeat=args.repeat
+            )
+            line += "  spring_layout {:8.3f}s".format(networkx_best)
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
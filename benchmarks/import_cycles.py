@@ -0,0 +1,93 @@
+r"""Benchmark the detection of import cycles on a graph with 100k edges.
+
+Each generated module imports modules defined before it, as in a layered
+code base, except for a small fraction of imports going the other way which
+create import cycles. The time taken by DependencyGraph to find the strongly
+connected components, to print the --report-cycles output and to compute
+the DSM order is compared to networkx.strongly_connected_components.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.import_cycles --modules 20000 --imports 5
+"""
+import argparse
+import io
+import random
+from contextlib import redirect_stdout
+
+import networkx as nx
+
+from benchmarks.utilities import timeit
+from depender.cli import print_cycles
+from depender.graph import DependencyGraph
+
+
+def generate_graph(
+    module_count: int, imports_per_module: int, back_edges: float, seed: int = 0
+) -> DependencyGraph:
+    rng = random.Random(seed)
+    graph = DependencyGraph()
+    modules = ["generated.module{}".format(i) for i in range(module_count)]
+    for module in modules:
+        graph.add_node(module, label=module)
+    for i, module in enumerate(modules[1:], 1):
+        for _ in range(imports_per_module):
+            if rng.random() < back_edges and i + 1 < module_count:
+                # Import one of the next modules, creating a small cycle
+                imported = rng.randrange(i + 1, min(module_count, i + 20))
+            else:
+                imported = rng.randrange(max(0, i - 200), i)
+            graph.add_edge(module, modules[imported], count=1)
+    return graph
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=20000)
+    parser.add_argument("--imports", type=int, default=5)
+    parser.add_argument("--back-edges", type=float, default=0.01)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    graph = generate_graph(args.modules, args.imports, args.back_edges)
+    print(
+        "modules: {}, edges: {}".format(
+            graph.number_of_nodes(), graph.number_of_edges()
+        )
+    )
+
+    def components():
+        # Drop the cached components
+        graph._component_version = -1
+        return graph.strongly_connected_components()
+
+    def report():
+        graph._component_version = -1
+        with redirect_stdout(io.StringIO()):
+            print_cycles(graph)
+
+    def dsm_order():
+        graph._component_version = -1
+        return graph.node_order("dsm")
+
+    networkx_time, _ = timeit(
+        lambda: list(nx.strongly_connected_components(graph)), repeat=args.repeat
+    )
+    print("networkx components       {:8.3f}s".format(networkx_time))
+    for name, function in (
+        ("DependencyGraph components", components),
+        ("--report-cycles output", report),
+        ("DSM order", dsm_order),
+    ):
+        best, _ = timeit(function, repeat=args.repeat)
+        print("{:<26}{:8.3f}s".format(name, best))
+    cycles = graph.cycles()
+    print(
+        "cycles: {}, largest: {} modules".format(
+            len(cycles), len(cycles[0]) if cycles else 0
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+r"""Benchmark the resolution of import records to the nodes of the dependency graph.
+
+The records of a generated package, whose modules have hundreds of imports,
+are extracted once and then resolved by ImportResolver and by the previous
+implementation, which called importlib.util.resolve_name and probed the graph
+for every imported name.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.import_resolution --modules 2000 --imports 300
+"""
+import argparse
+import importlib.util
+import tempfile
+from pathlib import Path
+
+from benchmarks.utilities import generate_package, timeit
+from depender.parse.code import CodeParser
+from depender.parse.utilities import FileIndex
+
+
+def legacy_resolve(graph, packages, records, package_name):
+    imported_nodes = list()
+    for record in records:
+        if record.kind == "import" or record.module is None:
+            for name in record.names:
+                imported_module = importlib.util.resolve_name(name, package_name)
+                if graph.has_node(imported_module):
+                    imported_nodes.append((imported_module, {"label": imported_module}))
+                elif imported_module.split(".")[0] not in packages:
+                    package = imported_module.split(".")[0]
+                    imported_nodes.append((package, {"external": True}))
+        elif record.kind == "from":
+            imported_from_module = importlib.util.resolve_name(
+                record.module, package_name
+            )
+            if graph.has_node(imported_from_module):
+                imported_nodes.append((imported_from_module, {}))
+            else:
+                for name in record.names:
+                    module_dot_path = ".".join([imported_from_module, name])
+                    if graph.has_node(module_dot_path):
+                        imported_nodes.append((module_dot_path, {}))
+    return imported_nodes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=1000)
+    parser.add_argument("--imports", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        package_path = generate_package(
+            Path(tmp_dir),
+            module_count=args.modules,
+            imports_per_module=args.imports,
+            body_lines=0,
+        )
+        code_parser = CodeParser()
+        code_parser.packages.add(package_path.name)
+        file_list = code_parser.find_all_package_modules(FileIndex(package_path, []))
+        all_records = list(
+            CodeParser.extract_all_imports(
+                [filepath for filepath, _ in file_list], parse_importlib=True
+            )
+        )
+        print("modules: {}, imports per module: {}".format(args.modules, args.imports))
+
+        def resolve():
+            resolver = code_parser.resolver
+            # Start from an empty memo on every run
+            resolver._clear_memo()
+            for (_, module_dot_path), records in zip(file_list, all_records):
+                code_parser.resolve_import_records(records, module_dot_path, True)
+
+        def legacy():
+            for records in all_records:
+                legacy_resolve(
+                    code_parser.graph,
+                    code_parser.packages,
+                    records,
+                    package_path.name,
+                )
+
+        legacy_time, _ = timeit(legacy, repeat=args.repeat)
+        print("legacy resolution   {:8.3f}s".format(legacy_time))
+        best, _ = timeit(resolve, repeat=args.repeat)
+        print(
+            "ImportResolver      {:8.3f}s  speedup x{:.2f}".format(
+                best, legacy_time / best
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+r"""Benchmark the fast, statement only, import scanner against the full syntax tree walk.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.import_scanner --modules 200 --body-lines 500
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks.utilities import generate_package, timeit
+from depender.parse.code import extract_imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=200)
+    parser.add_argument("--body-lines", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        package_path = generate_package(
+            Path(tmp_dir), module_count=args.modules, body_lines=args.body_lines
+        )
+        filepaths = list(package_path.rglob("*.py"))
+        print("files: {}, body lines: {}".format(len(filepaths), args.body_lines))
+        # Both scanners must find the same imports, only the walk finds unused names
+        for filepath in filepaths:
+            assert sorted(extract_imports(filepath, fast=True)) == sorted(
+                record._replace(unused=())
+                for record in extract_imports(filepath, fast=False)
+            )
+        timings = dict()
+        for fast in (False, True):
+            timings[fast], _ = timeit(
+                lambda: [
+                    extract_imports(filepath, fast=fast) for filepath in filepaths
+                ],
+                repeat=args.repeat,
+            )
+        print("walk: {:8.3f}s".format(timings[False]))
+        print(
+            "fast: {:8.3f}s  speedup x{:.2f}".format(
+                timings[True], timings[False] / timings[True]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
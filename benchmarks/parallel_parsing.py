@@ -0,0 +1,45 @@
+r"""Benchmark the scaling of CodeParser.parse_project with the number of worker processes.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.parallel_parsing --modules 5000
+"""
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks.utilities import generate_package, timeit
+from depender.parse.code import CodeParser
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    jobs_list = sorted({1, 2, 4, 8, 16, cpu_count} & set(range(1, cpu_count + 1)))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        package_path = generate_package(Path(tmp_dir), module_count=args.modules)
+        print("modules: {}, cores: {}".format(args.modules, cpu_count))
+        serial_time = None
+        for jobs in jobs_list:
+            best, _ = timeit(
+                lambda: CodeParser().parse_project(
+                    package_path, is_module=False, excluded_directories=[], jobs=jobs
+                ),
+                repeat=args.repeat,
+            )
+            if serial_time is None:
+                serial_time = best
+            print(
+                "jobs={:<3d} {:8.3f}s  speedup x{:.2f}".format(
+                    jobs, best, serial_time / best
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+r"""Benchmark transitive dependency queries on a graph with 40k modules.
+
+The reachability index returned by DependencyGraph.reachability is built,
+then used to list the transitive imports and importers of a sample of modules
+and to compute the transitive fan-out and fan-in of every module. The same
+queries are answered with networkx.descendants and networkx.ancestors, whose
+time for every module is extrapolated from the sample.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.reachability --modules 40000 --imports 5
+"""
+import argparse
+import random
+
+import networkx as nx
+
+from benchmarks.import_cycles import generate_graph
+from benchmarks.utilities import timeit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=40000)
+    parser.add_argument("--imports", type=int, default=5)
+    parser.add_argument("--back-edges", type=float, default=0.01)
+    parser.add_argument("--sample", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    graph = generate_graph(args.modules, args.imports, args.back_edges)
+    sample = random.Random(0).sample(list(graph), args.sample)
+    print(
+        "modules: {}, edges: {}".format(
+            graph.number_of_nodes(), graph.number_of_edges()
+        )
+    )
+
+    def networkx_queries():
+        for node in sample:
+            nx.descendants(graph, node)
+            nx.ancestors(graph, node)
+
+    networkx_time, _ = timeit(networkx_queries, repeat=1)
+    print(
+        "networkx, {} modules      {:8.3f}s  all modules (extrapolated) {:8.1f}s".format(
+            args.sample, networkx_time, networkx_time * len(graph) / args.sample
+        )
+    )
+
+    def build():
+        # Drop the cached components
+        graph._component_version = -1
+        return graph.reachability()
+
+    build_time, _ = timeit(build, repeat=args.repeat)
+    index = graph.reachability()
+    print("index construction        {:8.3f}s".format(build_time))
+
+    def index_queries():
+        for node in sample:
+            index.descendants(node)
+            index.ancestors(node)
+
+    best, _ = timeit(index_queries, repeat=args.repeat)
+    print("index, {} modules         {:8.3f}s".format(args.sample, best))
+
+    def bulk():
+        index._counts = None
+        return index.fan_out(), index.fan_in()
+
+    best, _ = timeit(bulk, repeat=args.repeat)
+    print("index, all fan-out/fan-in {:8.3f}s".format(best))
+    print(
+        "index size                {:8.1f} MiB".format(index.closure.nbytes / 2**20)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+r"""Benchmark the construction of structure graphs of wide directories.
+
+A tree made of a few directories holding tens of thousands of files each
+is built in memory with StructureGraph.add_children and with the previous
+implementation of StructureGraph.add_edge, which listed the successors
+of the parent twice for every added edge. StructureParser is then run
+on a generated directory holding the same number of files.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.structure_graph --files 50000
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks import structure_layout
+from benchmarks.utilities import timeit
+from depender.graph import StructureGraph
+from depender.parse.structure import StructureParser
+
+
+class LegacyStructureGraph(structure_layout.LegacyStructureGraph):
+    def add_edge(self, source: str, sink: str, **kwargs):
+        self.add_node(source)
+        self.add_node(sink)
+        super(StructureGraph, self).add_edge(source, sink, **kwargs)
+        self.nodes[source]["children"] += [sink]
+        self.nodes[sink]["parent"] = source
+        self.nodes[sink]["ancestor"] = sink
+        self.nodes[sink]["index"] = len(list(self.successors(source)))
+        if len(list(self.successors(source))) > 1:
+            self.nodes[sink]["leftmost_sibling"] = next(iter(self.successors(source)))
+            self.nodes[sink]["left_sibling"] = list(self.successors(source))[-2]
+
+
+def legacy_build(directories, files_per_directory):
+    graph = LegacyStructureGraph()
+    graph.add_node("root", label="root", type="root")
+    for directory in directories:
+        graph.add_node(directory, label=directory, type="directory")
+        graph.add_edge("root", directory)
+        for j in range(files_per_directory):
+            name = "file{}.py".format(j)
+            graph.add_node(directory + "/" + name, label=name, type="file")
+            graph.add_edge(directory, directory + "/" + name)
+    return graph
+
+
+def build(directories, files_per_directory):
+    graph = StructureGraph()
+    graph.add_node("root", label="root", type="root")
+    graph.add_children(
+        "root",
+        [
+            (directory, {"label": directory, "type": "directory"})
+            for directory in directories
+        ],
+    )
+    for directory in directories:
+        graph.add_children(
+            directory,
+            [
+                (
+                    directory + "/file{}.py".format(j),
+                    {"label": "file{}.py".format(j), "type": "file"},
+                )
+                for j in range(files_per_directory)
+            ],
+        )
+    return graph
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--directories", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    files_per_directory = args.files // args.directories
+    directories = ["dir{}".format(i) for i in range(args.directories)]
+    print(
+        "directories: {}, files per directory: {}".format(
+            args.directories, files_per_directory
+        )
+    )
+    legacy_time, _ = timeit(
+        lambda: legacy_build(directories, files_per_directory), repeat=1
+    )
+    print("legacy add_edge     {:8.3f}s".format(legacy_time))
+    best, _ = timeit(
+        lambda: build(directories, files_per_directory), repeat=args.repeat
+    )
+    print(
+        "add_children        {:8.3f}s  speedup x{:.2f}".format(best, legacy_time / best)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir, "tree")
+        for directory in directories:
+            root.joinpath(directory).mkdir(parents=True)
+            for j in range(files_per_directory):
+                root.joinpath(directory, "file{}.py".format(j)).touch()
+        best, _ = timeit(
+            lambda: StructureParser().parse_project(root, [], depth=-1),
+            repeat=args.repeat,
+        )
+        print("StructureParser     {:8.3f}s".format(best))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+r"""Benchmark the layout of structure graphs with 100k nodes.
+
+StructureGraph.layout, an iterative implementation of Buchheim's algorithm
+working on arrays indexed by node id, is compared to the previous recursive
+implementation, which read and wrote the networkx attributes of the nodes.
+Both give the same coordinates. The trees are random, wide, i.e. a few
+directories holding many files, and deep, which the recursive implementation
+can only lay out after raising the recursion limit.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.structure_layout --nodes 100000
+"""
+import argparse
+import math
+import random
+import sys
+
+from benchmarks.utilities import timeit
+from depender.graph import StructureGraph
+
+
+class LegacyStructureGraph(StructureGraph):
+    r"""StructureGraph as it was before its nodes were slimmed down,
+    with the previous recursive layout
+    """
+
+    def add_node(self, node_for_adding, **attr):
+        properties = {}
+        if node_for_adding not in self.nodes:
+            properties = {
+                "children": [],
+                "parent": None,
+                "ancestor": None,
+                "leftmost_sibling": None,
+                "left_sibling": None,
+                "thread": None,
+                "x": 0,
+                "y": 0,
+                "width": 0,
+                "height": 0,
+                "index": 0,
+                "shift": 0,
+                "modifier": 0,
+                "change": 0,
+            }
+        properties.update(**attr)
+        super(StructureGraph, self).add_node(node_for_adding, **properties)
+
+    def add_edge(self, source: str, sink: str, **kwargs):
+        self.add_node(source)
+        self.add_node(sink)
+        super(StructureGraph, self).add_edge(source, sink, **kwargs)
+        siblings = self.nodes[source]["children"]
+        self.nodes[sink]["parent"] = source
+        self.nodes[sink]["ancestor"] = sink
+        if siblings:
+            self.nodes[sink]["leftmost_sibling"] = siblings[0]
+            self.nodes[sink]["left_sibling"] = siblings[-1]
+        siblings.append(sink)
+        self.nodes[sink]["index"] = len(siblings)
+
+    def add_children(self, parent, children):
+        self.add_node(parent)
+        for child, attributes in children:
+            self.add_node(child, **attributes)
+            self.add_edge(parent, child)
+
+    def layout(self, **kwargs):
+        base_distance_x = kwargs.pop("base_distance_x", 1.0)
+        base_distance_y = kwargs.pop("base_distance_y", 1.0)
+        root_node = self.root_node
+        if root_node is not None:
+            self._first_walk(root_node, base_distance=base_distance_x)
+            self._second_walk(
+                root_node, -self.nodes[root_node]["x"], base_distance=base_distance_y
+            )
+
+    def _first_walk(self, current_node: str, base_distance: float = 1.0):
+        # Get the current node's children and count them
+        children = self.nodes[current_node]["children"]
+        children_count = len(children)
+        if children_count == 0:
+            left_sibling = self.nodes[current_node].get("left_sibling", None)
+            if left_sibling:
+                self.nodes[current_node]["x"] = (
+                    self.nodes[left_sibling]["x"]
+                    + (
+                        self.nodes[left_sibling]["width"]
+                        + self.nodes[current_node]["width"]
+                    )
+                    / 2
+                    + base_distance
+                )
+            else:
+                self.nodes[current_node]["x"] = 0
+        else:
+            # Make the default ancestor the leftmost child of the current node
+            default_ancestor = children[0]
+            for child in children:
+                self._first_walk(child, base_distance)
+                default_ancestor = self._apportion(
+                    child, default_ancestor, base_distance
+                )
+
+            self._execute_shifts(current_node)
+            # Compute the current node's children's center point's x coordinate
+            if len(children) % 2 == 0:
+                midpoint = (
+                    self.nodes[children[0]]["x"] + self.nodes[children[-1]]["x"]
+                ) / 2
+            else:
+                midpoint = self.nodes[children[len(children) // 2]]["x"]
+            # If the current node has no left sibling i.e. is the leftmost one
+            # then assign the midpoint coordinate to it, else shift from its left sibling
+            # and compute the modifier value
+            left_sibling = self.nodes[current_node].get("left_sibling", None)
+            if left_sibling:
+                self.nodes[current_node]["x"] = (
+                    self.nodes[left_sibling]["x"]
+                    + (
+                        self.nodes[left_sibling]["width"]
+                        + self.nodes[current_node]["width"]
+                    )
+                    / 2
+                    + base_distance
+                )
+                self.nodes[current_node]["modifier"] = (
+                    self.nodes[current_node]["x"] - midpoint
+                )
+            else:
+                self.nodes[current_node]["x"] = midpoint
+
+    def _second_walk(
+        self,
+        current_node,
+        modifier: float = 0,
+        depth: int = 0,
+        base_distance: float = 1,
+    ):
+        # Shift the current node's x position by an amount equal to modifier
+        # and increment modifier by an amount equal to the current node's modifier property
+        self.nodes[current_node]["x"] += modifier
+        modifier += self.nodes[current_node]["modifier"]
+        # The current node's y position is equal to the current depth times 1 + the height
+        self.nodes[current_node]["y"] = -depth * (
+            self.nodes[current_node]["height"] + base_distance
+        )
+        for child in self.nodes[current_node]["children"]:
+            self._second_walk(child, modifier, depth + 1, base_distance)
+
+    def _apportion(
+        self, current_node: str, default_ancestor: str, base_distance: float
+    ):
+        left_sibling = self.nodes[current_node]["left_sibling"]
+        leftmost_sibling = self.nodes[current_node]["leftmost_sibling"]
+        if left_sibling is not None and leftmost_sibling is not None:
+            v_inner_right = v_outer_right = current_node
+            v_inner_left = left_sibling
+            v_outer_left = leftmost_sibling
+            sir = self.nodes[v_inner_right]["modifier"]
+            sor = self.nodes[v_outer_right]["modifier"]
+            sil = self.nodes[v_inner_left]["modifier"]
+            sol = self.nodes[v_outer_left]["modifier"]
+            # Traverse the contours
+            next_inner_left = self._next_right(v_inner_left)
+            next_inner_right = self._next_left(v_inner_right)
+            next_outer_left = self._next_left(v_outer_left)
+            next_outer_right = self._next_right(v_outer_right)
+            while (
+                next_inner_left
+                and next_inner_right
+                and next_outer_right
+                and next_outer_left
+            ):
+                v_inner_left = next_inner_left
+                v_inner_right = next_inner_right
+                v_outer_left = next_outer_left
+                v_outer_right = next_outer_right
+                self.nodes[v_outer_right]["ancestor"] = current_node
+                # shift = (v_inner_left.x + sil) - (v_inner_right.x + sir)
+                shift = (
+                    (self.nodes[v_inner_left]["x"] + sil)
+                    - (self.nodes[v_inner_right]["x"] + sir)
+                    + (
+                        self.nodes[v_inner_left]["width"]
+                        + self.nodes[v_inner_right]["width"]
+                    )
+                    / 2
+                    + base_distance
+                )
+                if shift > 0:
+                    a = self._ancestor(v_inner_left, current_node, default_ancestor)
+                    self._move_subtree(a, current_node, shift)
+                    sir = sir + shift
+                    sor = sor + shift
+                sil += self.nodes[v_inner_left]["modifier"]
+                sir += self.nodes[v_inner_right]["modifier"]
+                sol += self.nodes[v_outer_left]["modifier"]
+                sor += self.nodes[v_outer_right]["modifier"]
+                # Get the next elements in the contours
+                next_inner_left = self._next_right(v_inner_left)
+                next_inner_right = self._next_left(v_inner_right)
+                next_outer_left = self._next_left(v_outer_left)
+                next_outer_right = self._next_right(v_outer_right)
+            if self._next_right(v_inner_left) and not self._next_right(v_outer_right):
+                self.nodes[v_outer_right]["thread"] = self._next_right(v_inner_left)
+                self.nodes[v_outer_right]["modifier"] += sil - sor
+            if self._next_left(v_inner_right) and not self._next_left(v_outer_left):
+                self.nodes[v_outer_left]["thread"] = self._next_left(v_inner_right)
+                self.nodes[v_outer_left]["modifier"] += sir - sol
+            default_ancestor = current_node
+        return default_ancestor
+
+    def _move_subtree(self, left_ancestor, right_ancestor, shift: float) -> None:
+        num_subtrees_between_ancestors = (
+            self.nodes[right_ancestor]["index"] - self.nodes[left_ancestor]["index"]
+        )
+        self.nodes[right_ancestor]["change"] -= shift / num_subtrees_between_ancestors
+        self.nodes[right_ancestor]["shift"] += shift
+        self.nodes[left_ancestor]["change"] += shift / num_subtrees_between_ancestors
+        self.nodes[right_ancestor]["x"] += shift
+        self.nodes[right_ancestor]["modifier"] += shift
+
+    def _execute_shifts(self, node):
+        shift = change = 0  # type: float
+        for child in list(reversed(self.nodes[node]["children"])):
+            self.nodes[child]["x"] += shift
+            self.nodes[child]["modifier"] += shift
+            change += self.nodes[child]["change"]
+            shift += self.nodes[child]["shift"] + change
+
+    def _next_left(self, node):
+        children = self.nodes[node]["children"]
+        thread = self.nodes[node]["thread"]
+        if children:
+            return children[0]
+        else:
+            return thread
+
+    def _next_right(self, node):
+        children = self.nodes[node]["children"]
+        thread = self.nodes[node]["thread"]
+        if children:
+            return children[-1]
+        else:
+            return thread
+
+    def _ancestor(self, node_1, node_2, default_ancestor):
+        node_1_ancestor = self.nodes[node_1]["ancestor"]
+        node_2_parent = self.nodes[node_2]["parent"]
+        if node_1_ancestor and node_2_parent:
+            if node_1_ancestor in self.nodes[node_2_parent]["children"]:
+                return node_1_ancestor
+        return default_ancestor
+
+
+def generate_tree(graph: StructureGraph, shape: str, node_count: int, seed: int = 0):
+    rng = random.Random(seed)
+    children = {"0": []}
+    for i in range(1, node_count):
+        if shape == "wide":
+            parent = str(i % 10) if i >= 10 else "0"
+        elif shape == "deep":
+            parent = str(i - 1) if i % 2 else str(i - 2 if i > 1 else 0)
+        else:
+            # A random node among the last ones, most of them being leaves
+            parent = str(rng.randrange(max(0, i - 50), i))
+        children.setdefault(parent, []).append(str(i))
+    for parent, parent_children in children.items():
+        graph.add_children(
+            parent,
+            [(child, {"width": 1.0 + len(child) / 10}) for child in parent_children],
+        )
+    return graph
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * args.nodes))
+    print("nodes: {}".format(args.nodes))
+    for shape in ("random", "wide", "deep"):
+        legacy_graph = generate_tree(LegacyStructureGraph(), shape, args.nodes)
+        graph = generate_tree(StructureGraph(), shape, args.nodes)
+        try:
+            legacy_time, _ = timeit(legacy_graph.layout, repeat=1)
+        except RecursionError:
+            legacy_time = float("nan")
+        best, _ = timeit(graph.layout, repeat=args.repeat)
+        if not math.isnan(legacy_time):
+            assert all(
+                (graph.nodes[node]["x"], graph.nodes[node]["y"])
+                == (legacy_graph.nodes[node]["x"], legacy_graph.nodes[node]["y"])
+                for node in graph
+            )
+        print(
+            "{:<7} legacy {:8.3f}s  current {:8.3f}s  speedup x{:.2f}".format(
+                shape, legacy_time, best, legacy_time / best
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+r"""Compare the memory used by structure graphs with slim and with legacy nodes.
+
+The structure graph of a data repository, a few levels of directories holding
+many files, is built and laid out with StructureGraph, whose nodes only hold
+their label, type and coordinates, and with the previous implementation,
+whose nodes held the 14 properties used by the layout. The memory used by
+the graph once built, the peak memory while it is laid out and the memory
+still used after the layout are measured with tracemalloc.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.structure_memory --files 500000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.structure_layout import LegacyStructureGraph
+from depender.graph import StructureGraph
+
+
+def build(graph: StructureGraph, file_count: int, files_per_directory: int):
+    graph.add_node("data", label="data", type="root")
+    directory_count = max(file_count // files_per_directory, 1)
+    for i in range(directory_count):
+        directory = "data/dir{}".format(i // 100)
+        if directory not in graph:
+            graph.add_children(
+                "data", [(directory, {"label": directory, "type": "directory"})]
+            )
+        sub_directory = directory + "/sub{}".format(i)
+        graph.add_children(
+            directory, [(sub_directory, {"label": sub_directory, "type": "directory"})]
+        )
+        graph.add_children(
+            sub_directory,
+            [
+                (
+                    sub_directory + "/file{}.csv".format(j),
+                    {"label": "file{}.csv".format(j), "type": "file"},
+                )
+                for j in range(files_per_directory)
+            ],
+        )
+    return graph
+
+
+def measure(graph_class, file_count: int, files_per_directory: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    graph = build(graph_class(), file_count, files_per_directory)
+    built = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    graph.layout()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "nodes": graph.number_of_nodes(),
+        "built": built / 2**20,
+        "peak": peak / 2**20,
+        "after": current / 2**20,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=500000)
+    parser.add_argument("--files-per-directory", type=int, default=500)
+    args = parser.parse_args()
+
+    for name, graph_class in (
+        ("legacy", LegacyStructureGraph),
+        ("current", StructureGraph),
+    ):
+        result = measure(graph_class, args.files, args.files_per_directory)
+        print(
+            "{:<8} nodes: {nodes}  built: {built:.1f} MiB  "
+            "peak during layout: {peak:.1f} MiB  "
+            "after layout: {after:.1f} MiB".format(name, **result)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+r"""Benchmark StructureParser on a large tree of files.
+
+The current parser, built on the os.DirEntry objects of a single scan,
+is compared to the previous one which wrapped every name in Path
+instances and called Path.is_file on each entry.
+The number of stat calls made from Python and the peak memory are reported.
+
+Run it from the repository's root with:
+
+    python -m benchmarks.structure_parsing --files 200000
+"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+
+from depender.graph import StructureGraph
+from depender.parse.structure import StructureParser
+from depender.parse.utilities import traverse_directory
+
+
+def legacy_parse_project(package_path, excluded_directories, follow_links, depth):
+    graph = StructureGraph()
+    for root, dirs, files in traverse_directory(
+        package_path, excluded_directories, depth=depth, followlinks=follow_links
+    ):
+        if not graph.has_node(str(root)):
+            graph.add_node(str(root), label=root.name, type="root")
+        for element in dirs + files:
+            if "__pycache__" == element.name or ".pyc" == element.suffix:
+                continue
+            full_path = root / element
+            if full_path.is_file():
+                graph.add_node(str(full_path), label=full_path.name, type="file")
+            else:
+                graph.add_node(str(full_path), label=full_path.name, type="directory")
+            graph.add_edge(str(root), str(full_path))
+    return graph
+
+
+@contextmanager
+def count_stat_calls(counter: dict):
+    original_stat = os.stat
+
+    def stat(*args, **kwargs):
+        counter["stat"] += 1
+        return original_stat(*args, **kwargs)
+
+    os.stat = stat
+    try:
+        yield
+    finally:
+        os.stat = original_stat
+
+
+def generate_tree(root: Path, file_count: int, files_per_directory: int) -> None:
+    for i in range(0, file_count, files_per_directory):
+        directory = root.joinpath("level{}".format(i // 10000), "dir{}".format(i))
+        directory.mkdir(parents=True)
+        for j in range(files_per_directory):
+            directory.joinpath("file{}.py".format(j)).touch()
+
+
+def measure(function) -> dict:
+    counter = {"stat": 0}
+    tracemalloc.start()
+    start = perf_counter()
+    with count_stat_calls(counter):
+        graph = function()
+    counter["time"] = perf_counter() - start
+    counter["peak"] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    counter["nodes"] = graph.number_of_nodes()
+    return counter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=200000)
+    parser.add_argument("--files-per-directory", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir, "tree")
+        generate_tree(root, args.files, args.files_per_directory)
+        print("files: {}".format(args.files))
+        for name, function in (
+            ("legacy", lambda: legacy_parse_project(root, [], True, -1)),
+            (
+                "current",
+                lambda: StructureParser().parse_project(root, [], True, depth=-1),
+            ),
+        ):
+            result = measure(function)
+            print(
+                "{:<8} nodes: {nodes}  stat calls: {stat}  "
+                "peak memory: {peak:.1f} MiB  time: {time:.2f}s "
+                "(timed with tracemalloc enabled)".format(name, **result)
+            )
+
+
+if __name__ == "__main__":
+    main()
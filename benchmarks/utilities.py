@@ -0,0 +1,117 @@
+import random
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+EXTERNAL_PACKAGES = ["os", "sys", "json", "re", "typing", "numpy", "networkx"]
+
+
+def generate_package(
+    root: Path,
+    name: str = "generated",
+    module_count: int = 1000,
+    modules_per_package: int = 50,
+    imports_per_module: int = 10,
+    body_lines: int = 20,
+    seed: int = 0,
+) -> Path:
+    r"""Generate a synthetic package whose modules import each other.
+
+    Args:
+        root: Directory in which the package is created
+        name: Name of the package
+        module_count: Total number of modules
+        modules_per_package: Number of modules in each sub-package
+        imports_per_module: Number of import statements at the top of each module
+        body_lines: Number of function definitions following the imports
+        seed: Seed of the random number generator
+
+    Returns:
+        Path to the root of the generated package
+    """
+    rng = random.Random(seed)
+    package_path = root / name
+    package_path.mkdir(parents=True, exist_ok=True)
+    package_path.joinpath("__init__.py").write_text("")
+    module_names = list()
+    for i in range(module_count):
+        sub_package = "sub{}".format(i // modules_per_package)
+        module_names.append("{}.{}.module{}".format(name, sub_package, i))
+    for i, module_name in enumerate(module_names):
+        parts = module_name.split(".")
+        directory = package_path.joinpath(*parts[1:-1])
+        if not directory.exists():
+            directory.mkdir(parents=True)
+            directory.joinpath("__init__.py").write_text("")
+        lines = list()
+        for _ in range(imports_per_module):
+            if rng.random() < 0.3:
+                lines.append("import {}".format(rng.choice(EXTERNAL_PACKAGES)))
+            else:
+                imported = rng.choice(module_names).rsplit(".", 1)
+                lines.append("from {} import {}".format(*imported))
+        for j in range(body_lines):
+            lines.append(
+                "\n\ndef function_{0}(x):\n    y = [x * k for k in range({0})]\n"
+                "    return {{'value': sum(y), 'name': str(x)}}".format(j)
+            )
+        directory.joinpath(parts[-1] + ".py").write_text("\n".join(lines) + "\n")
+    return package_path
+
+
+def generate_site_packages(
+    root: Path,
+    distribution_count: int = 100,
+    modules_per_distribution: int = 50,
+    imports_per_module: int = 10,
+    seed: int = 0,
+) -> Path:
+    r"""Generate a fake site-packages directory whose distributions import each other.
+
+    Each distribution is a generated package, whose modules import
+    each other's modules and the modules of other distributions,
+    together with the dist-info metadata listing its files.
+
+    Returns:
+        Path to the generated site-packages directory
+    """
+    rng = random.Random(seed)
+    site_packages = root / "site-packages"
+    site_packages.mkdir(parents=True, exist_ok=True)
+    names = ["dist{}".format(i) for i in range(distribution_count)]
+    for i, name in enumerate(names):
+        package_path = generate_package(
+            site_packages,
+            name=name,
+            module_count=modules_per_distribution,
+            imports_per_module=imports_per_module,
+            seed=seed + i,
+        )
+        files = sorted(
+            filepath.relative_to(site_packages).as_posix()
+            for filepath in package_path.rglob("*.py")
+        )
+        # Import a few other distributions from the package's root
+        imported = rng.sample(names, min(5, len(names)))
+        package_path.joinpath("__init__.py").write_text(
+            "".join("import {}\n".format(other) for other in imported)
+        )
+        dist_info = site_packages / "{}-1.0.dist-info".format(name)
+        dist_info.mkdir()
+        dist_info.joinpath("METADATA").write_text(
+            "Metadata-Version: 2.1\nName: {}\nVersion: 1.0\n".format(name)
+        )
+        dist_info.joinpath("RECORD").write_text(
+            "".join("{},,\n".format(file) for file in files)
+        )
+    return site_packages
+
+
+def timeit(function: Callable, repeat: int = 3) -> Tuple[float, List[float]]:
+    r"""Run the given function several times and return the best and all timings"""
+    timings = list()
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        timings.append(perf_counter() - start)
+    return min(timings), timings
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional, Tuple, Union
+from typing import Dict, Optional, Tuple, Union
 
+from depender.graph.cache import LayoutCache
 from depender.graph.dependency import DependencyGraph
 from depender.graph.structure import StructureGraph
 
@@ -13,11 +14,71 @@ class BaseBackend(ABC):
         format: Optional[str] = None,
         figure_dimensions: Tuple[float, float] = (1280, 960),
         dpi: int = 100,
+        layout_cache: Optional[LayoutCache] = None,
+        matrix_order: str = "insertion",
     ) -> None:
         self.output_dir = Path(output_dir)
         self.format = format
         self.figure_dimensions = figure_dimensions
         self.dpi = dpi
+        self.layout_cache = layout_cache
+        # Order of the rows and columns of the dependency matrices,
+        # see DependencyGraph.node_order
+        self.matrix_order = matrix_order
+
+    def layout_dependency_graph(self, graph: DependencyGraph) -> None:
+        r"""Layout the given dependency graph, starting from the positions
+        saved in the layout cache, if any, and save the resulting positions
+        """
+        if self.layout_cache is None:
+            graph.layout(graph=True)
+            return
+        graph.layout(graph=True, positions=self.layout_cache.get("dependency_graph"))
+        self.layout_cache.set(
+            "dependency_graph", {node: graph.nodes[node]["position"] for node in graph}
+        )
+        self.layout_cache.save()
+
+    def layout_structure_graph(self, graph: StructureGraph) -> None:
+        r"""Layout the given structure graph, reusing the coordinates saved
+        in the layout cache if the graph and the size of its nodes are unchanged
+        """
+        if self.layout_cache is None:
+            graph.layout()
+            return
+        signature = LayoutCache.signature(graph, ("width", "height"))
+        graph.layout(
+            coordinates=self.layout_cache.get("structure_graph", signature=signature)
+        )
+        self.layout_cache.set(
+            "structure_graph",
+            {node: (graph.nodes[node]["x"], graph.nodes[node]["y"]) for node in graph},
+            signature=signature,
+        )
+        self.layout_cache.save()
+
+    @staticmethod
+    def has_import_times(graph: DependencyGraph) -> bool:
+        r"""Check whether the import times of the graph's nodes were measured,
+        see depender.parse.importtime.ImportTimeParser
+        """
+        return any(
+            "cumulative_time" in attributes for attributes in graph.nodes.values()
+        )
+
+    def dependency_node_values(self, graph: DependencyGraph) -> Dict[str, float]:
+        r"""Return the value by which each node of a dependency graph is sized
+        and colored: its cumulative import time, in milliseconds, if the import times
+        were measured, otherwise its out degree minus its in degree
+        """
+        if self.has_import_times(graph):
+            return {
+                node: attributes.get("cumulative_time", 0) / 1000
+                for node, attributes in graph.nodes.items()
+            }
+        return {
+            node: graph.out_degree(node) - graph.in_degree(node) for node in graph.nodes
+        }
 
     @abstractmethod
     def plot(self, *args, **kwargs):
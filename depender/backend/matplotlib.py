@@ -3,8 +3,9 @@ import numpy as np
 from depender.backend.base import BaseBackend
 from depender.graph import DependencyGraph, StructureGraph
 from matplotlib import cm
-from matplotlib.collections import LineCollection
-from matplotlib.patches import FancyArrowPatch
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import Normalize
+from matplotlib.patches import FancyArrowPatch, Rectangle
 
 
 class MatplotlibBackend(BaseBackend):
@@ -19,18 +20,13 @@ class MatplotlibBackend(BaseBackend):
         fig.tight_layout()
         output_file = (self.output_dir / filename).with_suffix(self.format)
         fig.savefig(output_file)
+        # Release the figure, graphs can be saved repeatedly in watch mode
+        plt.close(fig)
 
     def plot_dependency_matrix(self, graph: DependencyGraph, **kwargs):
-        graph.layout(matrix=True)
-        node_names = graph.nodes()
-        node_count = graph.number_of_nodes()
-
-        matrix = [[0 for _ in range(node_count)] for _ in range(node_count)]
-        for (source, sink, values) in graph.edges.data():
-            matrix[graph.nodes[source]["index"]][graph.nodes[sink]["index"]] = values[
-                "count"
-            ]
-            # matrix[graph.get_node(sink).index, graph.get_node(source).index] -= 1
+        node_names = graph.node_order(self.matrix_order)
+        node_count = len(node_names)
+        matrix = graph.dependency_matrix(sparse=True, order=self.matrix_order).tocoo()
         cmap = plt.get_cmap("coolwarm")
         fig, ax = plt.subplots(
             figsize=(
@@ -39,7 +35,27 @@ class MatplotlibBackend(BaseBackend):
             ),
             dpi=self.dpi,
         )
-        ax.matshow(matrix, cmap=cmap, aspect="equal", origin="upper", alpha=0.7)
+        # Only the non-zero cells are drawn, over a background
+        # that has the color of the zero cells
+        norm = Normalize(vmin=0, vmax=max(matrix.data.max(initial=0), 1))
+        ax.add_patch(
+            Rectangle(
+                (-0.5, -0.5), node_count, node_count, color=cmap(norm(0)), alpha=0.7
+            )
+        )
+        corners = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]])
+        cells = PolyCollection(
+            np.stack([matrix.col, matrix.row], axis=-1)[:, np.newaxis, :] + corners,
+            array=matrix.data,
+            cmap=cmap,
+            norm=norm,
+            alpha=0.7,
+        )
+        ax.add_collection(cells)
+        ax.set_xlim(-0.5, node_count - 0.5)
+        ax.set_ylim(node_count - 0.5, -0.5)
+        ax.set_aspect("equal")
+        ax.xaxis.tick_top()
         # Major ticks
         major_tick_locations = np.arange(node_count)
         ax.set_xticks(major_tick_locations)
@@ -69,7 +85,7 @@ class MatplotlibBackend(BaseBackend):
             self.save_to_file(fig, filename="dependency_matrix")
 
     def plot_dependency_graph(self, graph: DependencyGraph, **kwargs):
-        graph.layout(graph=True)
+        self.layout_dependency_graph(graph)
         fig, ax = plt.subplots(
             figsize=(
                 self.figure_dimensions[0] / self.dpi,
@@ -101,8 +117,7 @@ class MatplotlibBackend(BaseBackend):
         else:
             self.save_to_file(fig, filename="structure_graph")
 
-    @staticmethod
-    def _plot_dependency_nodes(graph: DependencyGraph, ax=None):
+    def _plot_dependency_nodes(self, graph: DependencyGraph, ax=None):
         if ax is None:
             ax = plt.gca()
         node_x, node_y = [], []
@@ -113,17 +128,28 @@ class MatplotlibBackend(BaseBackend):
         node_colors = list()
         base_size = 40
 
+        node_values = self.dependency_node_values(graph)
+        if self.has_import_times(graph):
+            # Up to 20 times larger for the slowest import
+            max_value = max(max(node_values.values()), 1e-9)
+            size_multipliers = {
+                node: 20 * value / max_value for node, value in node_values.items()
+            }
+            cmap = plt.get_cmap("Reds")
+            # Nodes that take no time to import keep a visible color
+            norm = Normalize(-0.2 * max_value, max_value)
+        else:
+            size_multipliers = {node: abs(value) for node, value in node_values.items()}
+            cmap = plt.get_cmap("coolwarm")
+            norm = None
         for node in graph.nodes:
-            degree = graph.out_degree(node) - graph.in_degree(node)
-            size_multiplier = abs(degree)
-            node_colors.append(degree)
-            node_size = base_size * (1 + size_multiplier)
+            node_colors.append(node_values[node])
+            node_size = base_size * (1 + size_multipliers[node])
             node_sizes.append(node_size)
             graph.nodes[node]["size"] = node_size
 
-        cmap = plt.get_cmap("coolwarm")
         node_scatter = ax.scatter(
-            node_x, node_y, s=node_sizes, c=node_colors, cmap=cmap, alpha=0.7
+            node_x, node_y, s=node_sizes, c=node_colors, cmap=cmap, norm=norm, alpha=0.7
         )
         node_scatter.set_zorder(2)
 
@@ -138,8 +164,8 @@ class MatplotlibBackend(BaseBackend):
             )
         edge_positions = np.asarray(edge_positions)
         edge_collection = list()
-        for (source_name, sink_name), (source, sink) in zip(
-            graph.edges(), edge_positions
+        for (source_name, sink_name, context), (source, sink) in zip(
+            graph.edges.data("context", default="module"), edge_positions
         ):
             x1, y1 = source
             x2, y2 = sink
@@ -154,12 +180,13 @@ class MatplotlibBackend(BaseBackend):
                 shrinkB=edge_end_offset,
                 alpha=0.7,
                 zorder=1,
+                # Imports that are not executed at module level are dashed
+                linestyle="-" if context == "module" else "--",
             )
             edge_collection.append(arrow)
             ax.add_patch(arrow)
 
-    @staticmethod
-    def _plot_structure_nodes(graph: StructureGraph, ax=None) -> None:
+    def _plot_structure_nodes(self, graph: StructureGraph, ax=None) -> None:
         if ax is None:
             ax = plt.gca()
         fig = plt.gcf()
@@ -195,7 +222,7 @@ class MatplotlibBackend(BaseBackend):
             node_attr["width"] = extents[1, 0] - extents[0, 0]
             node_attr["height"] = height
         # Layout the graph after setting nodes' width and height
-        graph.layout()
+        self.layout_structure_graph(graph)
         x, y = zip(
             *[(node_attr["x"], node_attr["y"]) for node_attr in graph.nodes.values()]
         )
@@ -1,24 +1,55 @@
+import glob
 import sys
 from importlib.util import find_spec
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 
 import click
 from click_spinner import spinner  # type: ignore
+from networkx import descendants
 from depender.backend import get_backend
+from depender.graph import DependencyGraph, LayoutCache, StructureGraph
+from depender.parse.cache import ParseCache
 from depender.parse.code import CodeParser
+from depender.parse.importtime import ImportTimeParser
+from depender.parse.size import ModuleSizeParser
 from depender.parse.structure import StructureParser
+from depender.parse.utilities import FileIndex
+from depender.watch import ProjectWatcher
 
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"], ignore_unknown_options=True)
 
 
 @click.command(context_settings=CONTEXT_SETTINGS)
-@click.argument("path-or-name", nargs=1)
+@click.argument("path-or-name", nargs=1, required=False)
 @click.argument(
     "excluded-dirs",
     nargs=-1,
     type=click.Path(exists=False, file_okay=False, resolve_path=False),
 )
+@click.option(
+    "-p",
+    "--package",
+    "packages",
+    type=click.STRING,
+    multiple=True,
+    help="Additional package to analyze, can be given several times",
+)
+@click.option(
+    "--workspace",
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+    default=None,
+    help="File listing the packages to analyze, one path, name or glob per line",
+)
+@click.option(
+    "--environment",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    show_default=True,
+    help="When set, the distributions installed in the current environment"
+    " are analyzed instead of a package",
+)
 @click.option(
     "-o",
     "--output-dir",
@@ -43,6 +74,63 @@ CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"], ignore_unknown_optio
     show_default=True,
     help="Backend used for plotting",
 )
+@click.option(
+    "--matrix-order",
+    type=click.Choice(["insertion", "dsm"]),
+    default="insertion",
+    show_default=True,
+    help="Order of the dependency matrix, 'dsm' groups import cycles into blocks"
+    " on the diagonal and puts imported modules before the modules importing them",
+)
+@click.option(
+    "--report-cycles",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    show_default=True,
+    help="When set, the import cycles found in the dependency graph are printed",
+)
+@click.option(
+    "--report-reachability",
+    type=click.INT,
+    default=0,
+    show_default=True,
+    help="Number of modules with the largest transitive fan-out and fan-in"
+    " to print, 0 prints none",
+)
+@click.option(
+    "--import-time",
+    "import_modules",
+    type=click.STRING,
+    multiple=True,
+    help="Module, e.g. the package or its entry point, imported in a subprocess"
+    " with 'python -X importtime' to size and color the nodes by their cumulative"
+    " import time and print the most expensive import chains,"
+    " can be given several times",
+)
+@click.option(
+    "--startup-report",
+    "startup_entry",
+    type=click.STRING,
+    default=None,
+    help="Module, e.g. the entry point of a program, whose startup is analyzed:"
+    " the heaviest chain of imports executed when it is imported and the heavy"
+    " third-party packages imported through only one or two imports, which are"
+    " candidates for lazy imports, are printed. The modules are weighted"
+    " by their import time if measured with --import-time,"
+    " otherwise by the size of their source",
+)
+@click.option(
+    "--report-dead-imports",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    show_default=True,
+    help="When set, the imports of names that are never used and the modules"
+    " imported again are printed, with the modules that would no longer be"
+    " imported at startup, by the --startup-report module if given,"
+    " once they are removed",
+)
 @click.option(
     "--dims",
     "--image-dimensions",
@@ -74,17 +162,101 @@ CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"], ignore_unknown_optio
     show_default=True,
     help="Depth of the directory recursion",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.INT,
+    default=1,
+    show_default=True,
+    help="Number of processes used to parse the modules, 0 uses all available cores",
+)
+@click.option(
+    "--fast-scan",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    show_default=True,
+    help="When set, only the statements of each module are searched for imports",
+)
+@click.option(
+    "--eager-only",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    show_default=True,
+    help="When set, only the imports executed when the modules are imported are"
+    " kept, leaving out the ones inside functions, under TYPE_CHECKING"
+    " or in 'except ImportError' handlers",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(exists=False, file_okay=False, resolve_path=True),
+    default=".depender_cache",
+    show_default=True,
+    help="Directory in which the parsed imports are cached between runs",
+)
+@click.option(
+    "--no-cache",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    show_default=True,
+    help="When set, neither the parsed imports nor the layouts of the graphs"
+    " are cached",
+)
+@click.option(
+    "--clear-cache",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    show_default=True,
+    help="When set, the cache and the saved layouts are cleared"
+    " before parsing the package",
+)
+@click.option(
+    "--watch",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    show_default=True,
+    help="When set, the package is watched for changes and the graphs"
+    " are rendered again whenever they change, requires --format",
+)
+@click.option(
+    "--watch-interval",
+    type=click.FLOAT,
+    default=1.0,
+    show_default=True,
+    help="Number of seconds between two checks for changes in watch mode",
+)
 @click.version_option()
 def main(
-    path_or_name: str,
+    path_or_name: Optional[str],
     excluded_dirs: List[str],
+    packages: List[str],
+    workspace: Optional[str],
+    environment: bool,
     output_dir: str,
     format: str,
     backend: str,
+    matrix_order: str,
+    report_cycles: bool,
+    report_reachability: int,
+    import_modules: List[str],
+    startup_entry: Optional[str],
+    report_dead_imports: bool,
     image_dimensions: str,
     include_external: bool,
     no_follow_links: bool,
     depth: int,
+    jobs: int,
+    fast_scan: bool,
+    eager_only: bool,
+    cache_dir: str,
+    no_cache: bool,
+    clear_cache: bool,
+    watch: bool,
+    watch_interval: float,
 ) -> None:
     r"""Depender command line interface
 
@@ -93,67 +265,583 @@ def main(
     PATH_OR_NAME should be either:
         - the path (relative or absolute) to the root of a Python package or module
         - the name of an installed package
+        - a glob pattern matching the paths of several packages or modules
 
     EXCLUDED_DIRS should be, if provided, the paths relative to the package of one or more directories
     to exclude from the graph.
+
+    When several packages are given, through a glob pattern, --package or --workspace,
+    they are analyzed together: imports between them become edges between their modules,
+    the graphs of each package are written to a sub-directory of the output directory
+    and the combined dependency graph and matrix are written to the output directory.
+
+    When --environment is set, the graph has a node per distribution installed
+    in the current environment instead.
+    """
+    targets = list(packages)
+    if path_or_name is not None:
+        targets.insert(0, path_or_name)
+    if workspace is not None:
+        targets += read_workspace(workspace)
+    if environment:
+        if targets or watch or import_modules or startup_entry or report_dead_imports:
+            click.echo(
+                "--environment cannot be combined with packages, --watch,"
+                " --import-time, --startup-report or --report-dead-imports"
+            )
+            sys.exit(1)
+    elif not targets:
+        click.echo("No package was given")
+        sys.exit(1)
+    found_packages = list()
+    for target in targets:
+        if glob.has_magic(target):
+            for match in sorted(glob.glob(target)):
+                found_package = find_package(match)
+                if found_package is not None:
+                    found_packages.append(found_package)
+        else:
+            found_package = find_package(target)
+            if found_package is None:
+                click.echo(f"Could not find a package or a module at '{target}'")
+                sys.exit(1)
+            found_packages.append(found_package)
+    if not found_packages and not environment:
+        click.echo("Could not find any package or module")
+        sys.exit(1)
+    # Modules are named after their package and each package gets its own
+    # output directory, so two different packages cannot have the same name
+    package_names: Dict[str, Path] = dict()
+    unique_packages = list()
+    for package_path, is_module in found_packages:
+        resolved_path = package_path.resolve()
+        previous_path = package_names.get(package_path.stem)
+        if previous_path is None:
+            package_names[package_path.stem] = resolved_path
+            unique_packages.append((package_path, is_module))
+        elif previous_path != resolved_path:
+            click.echo(
+                f"Found two packages named '{package_path.stem}',"
+                f" at '{previous_path}' and '{resolved_path}'"
+            )
+            sys.exit(1)
+    found_packages = unique_packages
+    if watch and len(found_packages) > 1:
+        click.echo("Watch mode only supports a single package")
+        sys.exit(1)
+    if watch and format is None:
+        click.echo("Watch mode requires an output format to be given with --format")
+        sys.exit(1)
+    # Get the desired image dimensions
+    image_width, image_height = map(int, image_dimensions.split(","))
+    # Instantiate the parsers
+    if clear_cache:
+        ParseCache(cache_dir).clear()
+    cache = None if no_cache else ParseCache(cache_dir)
+    # Instantiate the backend
+    backend = get_backend(backend)(
+        output_dir=output_dir,
+        format=format,
+        figure_dimensions=(image_width, image_height),
+        layout_cache=get_layout_cache(output_dir, format, no_cache, clear_cache),
+        matrix_order=matrix_order,
+    )
+    if environment:
+        try:
+            # Imported here as it needs importlib_metadata before python 3.8
+            from depender.parse.environment import EnvironmentParser
+        except ImportError as error:
+            click.echo(
+                f"--environment requires importlib.metadata or importlib_metadata:"
+                f" {error}"
+            )
+            sys.exit(1)
+        click.echo("Parsing environment...")
+        with spinner():
+            code_graph = EnvironmentParser().parse_environment(
+                include_external=include_external,
+                jobs=jobs,
+                cache=cache,
+                fast_scan=fast_scan,
+                eager_only=eager_only,
+            )
+            if cache is not None:
+                cache.save()
+        if report_cycles:
+            print_cycles(code_graph)
+        if report_reachability > 0:
+            print_reachability(code_graph, report_reachability)
+        click.echo("Plotting graphs...")
+        with spinner():
+            backend.plot_dependency_matrix(code_graph)
+            backend.plot_dependency_graph(code_graph)
+        click.echo("Done")
+        return
+
+    if len(found_packages) > 1:
+        click.echo(f"Parsing {len(found_packages)} packages...")
+        code_graph, structure_graphs = parse_packages(
+            found_packages,
+            excluded_dirs,
+            include_external=include_external,
+            follow_links=not no_follow_links,
+            depth=depth,
+            jobs=jobs,
+            cache=cache,
+            fast_scan=fast_scan,
+            eager_only=eager_only,
+        )
+        if report_cycles:
+            print_cycles(code_graph)
+        if report_reachability > 0:
+            print_reachability(code_graph, report_reachability)
+        if import_modules:
+            measure_import_times(code_graph, import_modules, found_packages)
+        if startup_entry is not None:
+            print_startup_report(code_graph, startup_entry, found_packages)
+        if report_dead_imports:
+            print_dead_imports(code_graph, found_packages, startup_entry)
+        click.echo("Plotting graphs...")
+        with spinner():
+            for package_name, structure_graph in structure_graphs.items():
+                package_output_dir = backend.output_dir / package_name
+                package_backend = type(backend)(
+                    output_dir=package_output_dir,
+                    format=format,
+                    figure_dimensions=(image_width, image_height),
+                    layout_cache=get_layout_cache(
+                        package_output_dir, format, no_cache, clear_cache
+                    ),
+                    matrix_order=matrix_order,
+                )
+                if format is not None:
+                    package_backend.output_dir.mkdir(parents=True, exist_ok=True)
+                package_graph = code_graph.package_subgraph(package_name)
+                package_backend.plot_dependency_matrix(package_graph)
+                package_backend.plot_dependency_graph(package_graph)
+                package_backend.plot_structure_graph(structure_graph)
+            backend.plot_dependency_matrix(code_graph)
+            backend.plot_dependency_graph(code_graph)
+        click.echo("Done")
+        return
+
+    package_path, is_module = found_packages[0]
+    click.echo("Parsing package...")
+    if watch:
+        watcher = ProjectWatcher(
+            package_path,
+            is_module,
+            excluded_dirs,
+            include_external=include_external,
+            follow_links=not no_follow_links,
+            depth=depth,
+            jobs=jobs,
+            cache=cache,
+            fast_scan=fast_scan,
+            eager_only=eager_only,
+        )
+        with spinner():
+            watcher.refresh()
+        code_graph = watcher.dependency_graph
+        structure_graph = watcher.structure_graph
+    else:
+        code_graph, structure_graph = parse_package(
+            package_path,
+            is_module,
+            excluded_dirs,
+            include_external=include_external,
+            follow_links=not no_follow_links,
+            depth=depth,
+            jobs=jobs,
+            cache=cache,
+            fast_scan=fast_scan,
+            eager_only=eager_only,
+        )
+    if report_cycles:
+        print_cycles(code_graph)
+    if report_reachability > 0:
+        print_reachability(code_graph, report_reachability)
+    if import_modules:
+        measure_import_times(code_graph, import_modules, found_packages)
+    if startup_entry is not None:
+        print_startup_report(code_graph, startup_entry, found_packages)
+    if report_dead_imports:
+        print_dead_imports(code_graph, found_packages, startup_entry)
+    # Layout and write to file
+    click.echo("Plotting graphs...")
+    with spinner():
+        backend.plot_dependency_matrix(code_graph)
+        backend.plot_dependency_graph(code_graph)
+        backend.plot_structure_graph(structure_graph)
+    click.echo("Done")
+
+    if watch:
+
+        def on_change(dependency_changed: bool, structure_changed: bool) -> None:
+            click.echo("Change detected, plotting graphs...")
+            if dependency_changed:
+                backend.plot_dependency_matrix(watcher.dependency_graph)
+                backend.plot_dependency_graph(watcher.dependency_graph)
+            if structure_changed:
+                backend.plot_structure_graph(watcher.structure_graph)
+            click.echo("Done")
+
+        click.echo("Watching for changes, press Ctrl+C to stop")
+        try:
+            watcher.watch(on_change, interval=watch_interval)
+        except KeyboardInterrupt:
+            pass
+
+
+def get_layout_cache(
+    output_dir: Union[str, Path], format: Optional[str], no_cache: bool, clear: bool
+) -> Optional[LayoutCache]:
+    r"""Return the cache of the layouts saved alongside the graphs rendered
+    to the given output directory, or None if the graphs are not rendered to files
+    or if caching is disabled
+    """
+    if format is None:
+        return None
+    layout_cache = LayoutCache(Path(output_dir) / "layout.json")
+    if clear:
+        layout_cache.clear()
+    return None if no_cache else layout_cache
+
+
+def print_cycles(graph: DependencyGraph) -> None:
+    r"""Print the import cycles of the given graph, the largest ones first"""
+    cycles = graph.cycles()
+    if not cycles:
+        click.echo("No import cycle found")
+        return
+    click.echo(f"Found {len(cycles)} import cycles:")
+    for cycle in cycles:
+        click.echo(f"  {len(cycle)} modules: {', '.join(cycle)}")
+
+
+def print_reachability(graph: DependencyGraph, count: int) -> None:
+    r"""Print the modules with the largest transitive fan-out, the number of modules
+    they import directly or indirectly, and with the largest transitive fan-in,
+    the number of modules importing them directly or indirectly
+    """
+    index = graph.reachability()
+    for title, counts in (
+        ("Largest transitive fan-out (modules imported):", index.fan_out()),
+        ("Largest transitive fan-in (modules importing them):", index.fan_in()),
+    ):
+        click.echo(title)
+        for node, node_count in sorted(
+            counts.items(), key=lambda item: item[1], reverse=True
+        )[:count]:
+            click.echo(f"  {node_count:6d}  {node}")
+
+
+def measure_import_times(
+    graph: DependencyGraph,
+    modules: List[str],
+    found_packages: List[Tuple[Path, bool]],
+    count: int = 5,
+) -> None:
+    r"""Import the given modules of the found packages in a subprocess
+    with python -X importtime, store the import times in the graph's nodes
+    and print the import chains leading to the most expensive modules
+    """
+    click.echo("Measuring import times...")
+    paths = sorted({str(package_path.parent) for package_path, _ in found_packages})
+    parser = ImportTimeParser()
+    try:
+        with spinner():
+            timings = parser.measure(modules, paths)
+    except RuntimeError as error:
+        click.echo(f"The import times could not be measured: {error}")
+        return
+    parser.annotate(graph, timings)
+    total_time = sum(
+        timing.cumulative_time for timing in timings.values() if timing.parent is None
+    )
+    click.echo(f"Total import time: {total_time / 1000:.1f} ms")
+    click.echo("Most expensive import chains:")
+    for chain in parser.expensive_chains(timings, count):
+        click.echo(
+            "  "
+            + " -> ".join(
+                f"{timing.module} ({timing.cumulative_time / 1000:.1f} ms)"
+                for timing in chain
+            )
+            + f", self: {chain[-1].self_time / 1000:.1f} ms"
+        )
+
+
+def import_weights(
+    graph: DependencyGraph, found_packages: List[Tuple[Path, bool]]
+) -> Tuple[Dict[str, float], str]:
+    r"""Return the cost of importing each node of the given graph and its unit:
+    the import time in milliseconds if it was measured, otherwise the size
+    of the node's source in kilobytes
+    """
+    if any("self_time" in attributes for attributes in graph.nodes.values()):
+        weights = {
+            node: attributes.get("self_time", 0) / 1000
+            for node, attributes in graph.nodes.items()
+        }
+        return weights, "ms"
+    paths = sorted({package_path.parent for package_path, _ in found_packages})
+    sizes = ModuleSizeParser(paths).measure(graph)
+    return {node: size / 1000 for node, size in sizes.items()}, "kB"
+
+
+def print_startup_report(
+    graph: DependencyGraph,
+    entry: str,
+    found_packages: List[Tuple[Path, bool]],
+    count: int = 5,
+    max_importers: int = 2,
+) -> None:
+    r"""Print the cost of the imports executed when the given module is imported,
+    the heaviest chain of these imports and the heaviest third-party packages
+    imported through at most max_importers imports
+    """
+    eager_graph = graph.eager_subgraph()
+    if entry not in eager_graph:
+        click.echo(f"The startup report's entry '{entry}' is not in the graph")
+        return
+    weights, unit = import_weights(graph, found_packages)
+    chain, chain_weight = eager_graph.heaviest_import_chain(entry, weights)
+    imported = descendants(eager_graph, entry) | {entry}
+    total_weight = sum(weights.get(node, 0) for node in imported)
+    click.echo(
+        f"Startup of {entry}: {len(imported)} modules imported,"
+        f" {total_weight:.1f} {unit}"
+    )
+    click.echo(f"Heaviest import chain, {chain_weight:.1f} {unit}:")
+    for node in chain:
+        click.echo(f"  {weights.get(node, 0):8.1f} {unit}  {node}")
+    candidates = [
+        (node, importers)
+        for node, importers in eager_graph.deferrable_imports(
+            entry, max_importers
+        ).items()
+        if ModuleSizeParser.is_third_party(node)
+    ]
+    if not any(
+        attributes.get("external", False) for attributes in graph.nodes.values()
+    ):
+        click.echo(
+            "External packages are not in the graph, use --include-external"
+            " to find the candidates for lazy imports"
+        )
+        return
+    if not candidates:
+        click.echo("No third-party package is imported through few imports")
+        return
+    click.echo("Candidates for lazy imports, third-party packages imported by:")
+    for node, importers in sorted(
+        candidates, key=lambda candidate: weights.get(candidate[0], 0), reverse=True
+    )[:count]:
+        click.echo(
+            f"  {weights.get(node, 0):8.1f} {unit}  {node}, imported by"
+            f" {', '.join(importers)}"
+        )
+
+
+def print_dead_imports(
+    graph: DependencyGraph,
+    found_packages: List[Tuple[Path, bool]],
+    entry: Optional[str] = None,
+) -> None:
+    r"""Print the dead edges, whose imported names are never used, the duplicate
+    imports and the modules that would no longer be imported when the modules
+    are imported, and when the given entry is, once the dead edges are removed
+    """
+    dead_imports = graph.dead_imports()
+    duplicate_imports = graph.duplicate_imports()
+    if not (dead_imports or duplicate_imports):
+        click.echo("No dead import found")
+        return
+    click.echo(f"Found {len(dead_imports)} imports of unused names:")
+    for source, sink in dead_imports:
+        click.echo(f"  {source} -> {sink} ({graph.edges[source, sink]['context']})")
+    click.echo(f"Found {len(duplicate_imports)} modules imported again:")
+    for source, sink, duplicates in duplicate_imports:
+        click.echo(f"  {source} -> {sink}, imported again {duplicates} times")
+    eager_graph = graph.eager_subgraph()
+    live_graph = eager_graph.live_subgraph()
+    # Nodes imported at module level only through dead edges
+    removed = [
+        node
+        for node in eager_graph
+        if eager_graph.in_degree(node) > 0
+        and (node not in live_graph or live_graph.in_degree(node) == 0)
+    ]
+    if not removed and entry is None:
+        click.echo("Removing them does not change the eager import graph")
+        return
+    weights, unit = import_weights(graph, found_packages)
+    if removed:
+        click.echo(
+            f"Without them, {len(removed)} modules would no longer be imported"
+            f" at module level by the parsed modules,"
+            f" {sum(weights.get(node, 0) for node in removed):.1f} {unit}:"
+        )
+        for node in removed:
+            click.echo(f"  {weights.get(node, 0):8.1f} {unit}  {node}")
+    if entry is not None and entry in eager_graph:
+        before = descendants(eager_graph, entry) | {entry}
+        after = descendants(live_graph, entry) | {entry}
+        click.echo(
+            f"Startup of {entry}: {len(after)} modules imported instead of"
+            f" {len(before)},"
+            f" {sum(weights.get(node, 0) for node in before - after):.1f} {unit}"
+            " saved"
+        )
+
+
+def read_workspace(workspace: str) -> List[str]:
+    r"""Read the packages listed in a workspace file, ignoring empty lines and comments.
+    Relative paths are relative to the workspace file's directory
+    """
+    workspace_directory = Path(workspace).parent
+    targets = list()
+    with open(workspace) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            path = workspace_directory / line
+            if path.exists() or glob.has_magic(line):
+                targets.append(str(path))
+            else:
+                # The name of an installed package
+                targets.append(line)
+    return targets
+
+
+def find_package(path_or_name: str) -> Optional[Tuple[Path, bool]]:
+    r"""Find the package or module with the given path or name
+
+    Returns:
+        The path to the package or module and whether it is a module,
+        or None if nothing was found
     """
     try:
         spec = find_spec(path_or_name)
-    except ModuleNotFoundError:
+    except (ModuleNotFoundError, ValueError):
         spec = None
     # Try to find the package path
     package_path = Path(path_or_name)
     if package_path.is_file() and package_path.suffix == ".py":
         click.echo(f"Found module at '{package_path.absolute()}'")
-        is_module = True
+        return package_path, True
     elif package_path.is_dir() and package_path.joinpath("__init__.py").is_file():
         click.echo(f"Found package at '{package_path.absolute()}'")
-        is_module = False
-    elif spec is not None:
+        return package_path, False
+    elif spec is not None and spec.origin is not None:
         package_path = Path(spec.origin)
         if package_path.name == "__init__.py":
             click.echo(f"Found package '{path_or_name}'")
-            package_path = package_path.parent
-            is_module = False
+            return package_path.parent, False
         else:
             click.echo(f"Found module '{path_or_name}'")
-            is_module = True
-    else:
-        click.echo(f"Could not find a package or a module at '{package_path}'")
-        sys.exit(1)
-    # Get the desired image dimensions
-    image_width, image_height = map(int, image_dimensions.split(","))
+            return package_path, True
+    return None
+
+
+def parse_packages(
+    found_packages: List[Tuple[Path, bool]],
+    excluded_dirs: List[str],
+    include_external: bool,
+    follow_links: bool,
+    depth: int,
+    jobs: int,
+    cache: Optional[ParseCache],
+    fast_scan: bool,
+    eager_only: bool,
+) -> Tuple[DependencyGraph, Dict[str, StructureGraph]]:
+    package_paths = [package_path.resolve() for package_path, _ in found_packages]
+    modules = [
+        package_path
+        for package_path, (_, is_module) in zip(package_paths, found_packages)
+        if is_module
+    ]
+    with spinner():
+        # Traverse each package's directories once for both parsers
+        file_indices = {
+            package_path: FileIndex(
+                package_path, excluded_dirs, depth=depth, followlinks=follow_links
+            )
+            for package_path in package_paths
+        }
+        code_graph = CodeParser(eager_only=eager_only).parse_projects(
+            package_paths,
+            excluded_dirs,
+            include_external=include_external,
+            follow_links=follow_links,
+            jobs=jobs,
+            cache=cache,
+            fast_scan=fast_scan,
+            depth=depth,
+            file_indices=file_indices,
+            modules=modules,
+        )
+        if cache is not None:
+            cache.save()
+        structure_graphs = dict()
+        for package_path in package_paths:
+            structure_graphs[package_path.stem] = StructureParser().parse_project(
+                package_path,
+                excluded_dirs,
+                follow_links=follow_links,
+                depth=depth,
+                file_index=file_indices[package_path],
+            )
+    return code_graph, structure_graphs
+
+
+def parse_package(
+    package_path: Path,
+    is_module: bool,
+    excluded_dirs: List[str],
+    include_external: bool,
+    follow_links: bool,
+    depth: int,
+    jobs: int,
+    cache: Optional[ParseCache],
+    fast_scan: bool,
+    eager_only: bool,
+) -> Tuple[DependencyGraph, StructureGraph]:
     # Instantiate the parsers
-    code_parser = CodeParser()
+    code_parser = CodeParser(eager_only=eager_only)
     structure_parser = StructureParser()
-    # Instantiate the backend
-    backend = get_backend(backend)(
-        output_dir=output_dir,
-        format=format,
-        figure_dimensions=(image_width, image_height),
-    )
-    click.echo("Parsing package...")
     with spinner():
+        # Traverse the package's directories once for both parsers
+        file_index = FileIndex(
+            package_path,
+            excluded_dirs,
+            depth=depth,
+            followlinks=follow_links,
+        )
         code_graph = code_parser.parse_project(
             package_path=package_path,
             is_module=is_module,
             excluded_directories=excluded_dirs,
             include_external=include_external,
-            follow_links=not no_follow_links,
+            follow_links=follow_links,
+            jobs=jobs,
+            cache=cache,
+            fast_scan=fast_scan,
+            depth=depth,
+            file_index=file_index,
         )
+        if cache is not None:
+            cache.save()
         structure_graph = structure_parser.parse_project(
             package_path=package_path,
             excluded_directories=excluded_dirs,
-            follow_links=not no_follow_links,
+            follow_links=follow_links,
             depth=depth,
+            file_index=file_index,
         )
-    # Layout and write to file
-    click.echo("Plotting graphs...")
-    with spinner():
-        backend.plot_dependency_matrix(code_graph)
-        backend.plot_dependency_graph(code_graph)
-        backend.plot_structure_graph(structure_graph)
-    click.echo("Done")
+    return code_graph, structure_graph
 
 
 if __name__ == "__main__":
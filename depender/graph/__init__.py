@@ -1,2 +1,5 @@
+from .cache import LayoutCache  # noqa
+from .compact import CompactGraph  # noqa
 from .dependency import DependencyGraph  # noqa
+from .reachability import ReachabilityIndex  # noqa
 from .structure import StructureGraph  # noqa
@@ -0,0 +1,219 @@
+from typing import List, Tuple
+
+import numpy as np
+
+__all__ = [
+    "strongly_connected_components",
+    "condensation",
+    "transitive_closure",
+    "unpack_bitsets",
+    "heaviest_path",
+]
+
+
+def strongly_connected_components(
+    node_count: int, indptr: np.ndarray, indices: np.ndarray
+) -> Tuple[int, np.ndarray]:
+    r"""Find the strongly connected components of a graph with Tarjan's algorithm.
+
+    The depth-first search is driven by an explicit stack instead of recursion,
+    so that the depth of the graph is not limited by the recursion limit,
+    and takes time proportional to the number of nodes and edges.
+
+    Args:
+        node_count: Number of nodes
+        indptr: CSR index pointer, the successors of node i
+            are indices[indptr[i]:indptr[i + 1]]
+        indices: CSR indices
+
+    Returns:
+        The number of components and the component of each node. The components
+        are numbered in the order in which they are found, which is a reverse
+        topological order: edges between components always go from a component
+        to a component with a smaller number
+    """
+    indptr = np.asarray(indptr).tolist()
+    indices = np.asarray(indices).tolist()
+    # Order in which the nodes are visited, -1 for unvisited nodes
+    order = [-1] * node_count
+    lowlink = [0] * node_count
+    components = [-1] * node_count
+    visited_count = 0
+    component_count = 0
+    # Visited nodes whose component is not found yet
+    stack = list()
+    for root in range(node_count):
+        if order[root] >= 0:
+            continue
+        order[root] = lowlink[root] = visited_count
+        visited_count += 1
+        stack.append(root)
+        # Node and position of the next edge to follow, for each node being visited
+        path = [(root, indptr[root])]
+        while path:
+            node, edge = path[-1]
+            end = indptr[node + 1]
+            while edge < end:
+                successor = indices[edge]
+                edge += 1
+                if order[successor] < 0:
+                    path[-1] = (node, edge)
+                    order[successor] = lowlink[successor] = visited_count
+                    visited_count += 1
+                    stack.append(successor)
+                    path.append((successor, indptr[successor]))
+                    break
+                if components[successor] < 0 and order[successor] < lowlink[node]:
+                    # The successor is on the stack
+                    lowlink[node] = order[successor]
+            else:
+                path.pop()
+                if lowlink[node] == order[node]:
+                    # The node is the root of a component made of the nodes
+                    # above it on the stack
+                    while True:
+                        member = stack.pop()
+                        components[member] = component_count
+                        if member == node:
+                            break
+                    component_count += 1
+                if path:
+                    parent = path[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+    return component_count, np.array(components, dtype=np.int64)
+
+
+def condensation(
+    components: np.ndarray,
+    sources: np.ndarray,
+    sinks: np.ndarray,
+    counts: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    r"""Merge the edges between the nodes of different components
+    into edges between the components
+
+    Args:
+        components: Component of each node
+        sources: Index of the source node of each edge
+        sinks: Index of the sink node of each edge
+        counts: Count of each edge
+
+    Returns:
+        The source component, sink component and summed count of each edge
+        of the condensed graph, sorted by source and sink components
+    """
+    source_components = components[sources]
+    sink_components = components[sinks]
+    between = source_components != sink_components
+    component_count = int(components.max(initial=-1)) + 1
+    keys, inverse = np.unique(
+        source_components[between] * component_count + sink_components[between],
+        return_inverse=True,
+    )
+    summed_counts = np.bincount(inverse, weights=counts[between], minlength=len(keys))
+    return (
+        keys // max(component_count, 1),
+        keys % max(component_count, 1),
+        summed_counts.astype(counts.dtype),
+    )
+
+
+def transitive_closure(
+    component_count: int,
+    sources: np.ndarray,
+    sinks: np.ndarray,
+    cyclic: np.ndarray,
+) -> np.ndarray:
+    r"""Compute the transitive closure of a condensed graph as packed bitsets.
+
+    Bit j of row i is set if component j can be reached from component i through
+    at least one edge. Since the components are in reverse topological order,
+    the successors of a component are computed before it and its row is the union
+    of its successors' rows and bits, a single pass of vectorized ORs over rows
+    of component_count / 64 words.
+
+    Args:
+        component_count: Number of components
+        sources: Source component of each edge of the condensed graph,
+            as returned by condensation
+        sinks: Sink component of each edge of the condensed graph
+        cyclic: Whether each component is a cycle, i.e. reaches itself
+
+    Returns:
+        An array of shape (component_count, ceil(component_count / 64))
+        of 64 bits words, bit j being bit j % 64 of word j // 64
+    """
+    word_count = (component_count + 63) // 64
+    closure = np.zeros((component_count, word_count), dtype=np.uint64)
+    one = np.uint64(1)
+    cycles = np.flatnonzero(cyclic)
+    closure[cycles, cycles >> 6] = one << (cycles & 63).astype(np.uint64)
+    sources = np.asarray(sources, dtype=np.int64)
+    sinks = np.asarray(sinks, dtype=np.int64)
+    np.bitwise_or.at(
+        closure, (sources, sinks >> 6), one << (sinks & 63).astype(np.uint64)
+    )
+    order = np.argsort(sources, kind="stable")
+    sources, sinks = sources[order], sinks[order]
+    indptr = np.searchsorted(sources, np.arange(component_count + 1))
+    for component in np.unique(sources).tolist():
+        start, end = indptr[component], indptr[component + 1]
+        closure[component] |= np.bitwise_or.reduce(closure[sinks[start:end]], axis=0)
+    return closure
+
+
+def heaviest_path(
+    component_count: int,
+    sources: np.ndarray,
+    sinks: np.ndarray,
+    weights: np.ndarray,
+    start: int,
+) -> Tuple[List[int], float]:
+    r"""Find the path of a condensed graph with the largest sum of weights
+    starting at the given component.
+
+    Since the components are in reverse topological order, the heaviest path
+    starting at each of the successors of a component is known before it, so that
+    a single pass over the components up to the start one is enough.
+
+    Args:
+        component_count: Number of components
+        sources: Source component of each edge of the condensed graph,
+            as returned by condensation
+        sinks: Sink component of each edge of the condensed graph
+        weights: Weight of each component
+        start: Component at which the path starts
+
+    Returns:
+        The components of the path, starting with the given one,
+        and the sum of their weights
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    sinks = np.asarray(sinks, dtype=np.int64)
+    # Weight of the heaviest path starting at each component and its next component
+    heaviest = np.array(weights, dtype=np.float64)
+    following = np.full(component_count, -1, dtype=np.int64)
+    order = np.argsort(sources, kind="stable")
+    sources, sinks = sources[order], sinks[order]
+    indptr = np.searchsorted(sources, np.arange(component_count + 1))
+    # Only the components before the start one can be reached from it
+    for component in np.unique(sources[sources <= start]).tolist():
+        first, end = indptr[component], indptr[component + 1]
+        successors = sinks[first:end]
+        successor = successors[np.argmax(heaviest[successors])]
+        heaviest[component] += heaviest[successor]
+        following[component] = successor
+    path = [start]
+    while following[path[-1]] >= 0:
+        path.append(int(following[path[-1]]))
+    return path, float(heaviest[start])
+
+
+def unpack_bitsets(bitsets: np.ndarray, count: int) -> np.ndarray:
+    r"""Unpack rows of 64 bits words into rows of count booleans
+
+    The count and bitorder arguments of np.unpackbits require numpy 1.17
+    """
+    bytes_ = np.ascontiguousarray(bitsets, dtype="<u8").view(np.uint8)
+    return np.unpackbits(bytes_, axis=-1, count=count, bitorder="little").view(bool)
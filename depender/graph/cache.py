@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+
+from networkx import DiGraph
+
+__all__ = ["LayoutCache"]
+
+# Bump this whenever the layout of the cached positions changes
+LAYOUT_FORMAT = 1
+
+
+class LayoutCache:
+    r"""Persistent cache of the node positions computed by the graphs' layouts.
+
+    The positions of each graph are stored under a name, e.g. 'dependency_graph',
+    together with an optional signature of the graph they were computed for,
+    so that a later run can reuse them: the saved positions of a dependency graph
+    are the starting state of its next layout, in which only the new nodes are
+    placed, and the coordinates of a structure graph are reused as long as
+    its signature is unchanged.
+
+    Args:
+        cache_file: Path of the json file in which the positions are stored
+    """
+
+    def __init__(self, cache_file: Union[str, Path]) -> None:
+        self.cache_file = Path(cache_file)
+        self._entries: Dict[str, dict] = self._load()
+        self._modified = False
+
+    def __enter__(self) -> "LayoutCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.save()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def get(self, name: str, signature: str = "") -> Dict[str, List[float]]:
+        r"""Return the saved positions stored under the given name,
+        or an empty dictionary if they are missing or were computed
+        for a graph with another signature
+        """
+        entry = self._entries.get(name)
+        if entry is None or entry["signature"] != signature:
+            return dict()
+        return entry["positions"]
+
+    def set(self, name: str, positions: Dict, signature: str = "") -> None:
+        r"""Store the position of each node under the given name"""
+        entry = {
+            "signature": signature,
+            "positions": {
+                node: [float(value) for value in position]
+                for node, position in positions.items()
+            },
+        }
+        if self._entries.get(name) != entry:
+            self._entries[name] = entry
+            self._modified = True
+
+    def save(self) -> None:
+        r"""Write the positions to disk if they changed since they were loaded"""
+        if not self._modified:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary_file = self.cache_file.with_suffix(".tmp")
+        with temporary_file.open("w") as f:
+            json.dump({"format": LAYOUT_FORMAT, "entries": self._entries}, f)
+        os.replace(str(temporary_file), str(self.cache_file))
+        self._modified = False
+
+    def clear(self) -> None:
+        r"""Remove all the saved positions"""
+        self._entries.clear()
+        self._modified = False
+        if self.cache_file.is_file():
+            self.cache_file.unlink()
+
+    @staticmethod
+    def signature(graph: DiGraph, attributes: Iterable[str] = ()) -> str:
+        r"""Return a digest of the nodes, the given node attributes and the edges
+
+        Args:
+            graph: Graph whose signature is computed
+            attributes: Names of the node attributes the layout depends on
+        """
+        attributes = list(attributes)
+        digest = hashlib.sha1()
+        for node, node_attributes in graph.nodes.items():
+            values = [
+                round(float(node_attributes.get(name, 0)), 6) for name in attributes
+            ]
+            digest.update(json.dumps([node, values]).encode())
+        for source, sink in graph.edges:
+            digest.update(json.dumps([source, sink]).encode())
+        return digest.hexdigest()
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with self.cache_file.open("r") as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return dict()
+        if not isinstance(content, dict) or content.get("format") != LAYOUT_FORMAT:
+            return dict()
+        return content["entries"]
@@ -0,0 +1,221 @@
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from depender.graph.dependency import DependencyGraph, build_matrix
+from depender.graph.layout import force_directed_layout
+
+__all__ = ["CompactGraph"]
+
+
+class CompactGraph:
+    r"""Memory efficient dependency graph for very large projects.
+
+    Node names are interned to consecutive integer ids, in the order in which
+    the nodes are added, and the edges are stored as a compressed sparse row
+    (CSR) adjacency: the successors of node i are indices[indptr[i]:indptr[i + 1]],
+    sorted by id, and the number of times each edge was added is stored in
+    the parallel counts array. Whether a node is external and the package it
+    belongs to are stored in arrays as well instead of per node dictionaries.
+
+    Nodes and edges are added with the same add_node and add_edge methods
+    as DependencyGraph, so that the graph can be filled by CodeParser.
+    New edges are appended to plain arrays and merged into the CSR
+    arrays the next time the adjacency is accessed.
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = list()
+        self.ids: Dict[str, int] = dict()
+        self.package_names: List[str] = list()
+        self._package_ids: Dict[str, int] = dict()
+        # Package id of each node, -1 for nodes without package
+        self._node_packages = array("i")
+        self._external = array("b")
+        # Edges added since the CSR arrays were last built
+        self._sources = array("i")
+        self._sinks = array("i")
+        self._added_counts = array("i")
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._counts = np.zeros(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def number_of_nodes(self) -> int:
+        return len(self.names)
+
+    def number_of_edges(self) -> int:
+        return len(self.adjacency()[1])
+
+    def add_node(self, node: str, **attributes) -> int:
+        r"""Add a node, or update its attributes if it already exists
+
+        Only the 'external' and 'package' attributes are stored,
+        the label of a node is derived from its name.
+
+        Returns:
+            The id of the node
+        """
+        node_id = self.ids.get(node)
+        if node_id is None:
+            node_id = self.ids[node] = len(self.names)
+            self.names.append(node)
+            self._node_packages.append(-1)
+            self._external.append(0)
+        if "external" in attributes:
+            self._external[node_id] = bool(attributes["external"])
+        package = attributes.get("package")
+        if package is not None:
+            package_id = self._package_ids.get(package)
+            if package_id is None:
+                package_id = self._package_ids[package] = len(self.package_names)
+                self.package_names.append(package)
+            self._node_packages[node_id] = package_id
+        return node_id
+
+    def add_edge(self, source: str, sink: str, count: int = 1, **attributes) -> None:
+        r"""Add an edge, adding count to the edge's count if it already exists
+
+        Only the count of an edge is stored, the other attributes, e.g. its context,
+        are ignored. Use CodeParser's eager_only argument to build a compact graph
+        of the eager imports only
+        """
+        self._sources.append(self.add_node(source))
+        self._sinks.append(self.add_node(sink))
+        self._added_counts.append(count)
+
+    def adjacency(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        r"""Return the indptr, indices and counts arrays of the CSR adjacency"""
+        node_count = len(self.names)
+        if len(self._sources) == 0 and len(self._indptr) == node_count + 1:
+            return self._indptr, self._indices, self._counts
+        # Merge the existing edges with the new ones and sum the counts of duplicates
+        sources = np.concatenate(
+            [
+                np.repeat(
+                    np.arange(len(self._indptr) - 1, dtype=np.int64),
+                    np.diff(self._indptr),
+                ),
+                np.frombuffer(self._sources, dtype=np.int32),
+            ]
+        )
+        sinks = np.concatenate(
+            [self._indices, np.frombuffer(self._sinks, dtype=np.int32)]
+        )
+        counts = np.concatenate(
+            [self._counts, np.frombuffer(self._added_counts, dtype=np.int32)]
+        )
+        keys, inverse = np.unique(sources * node_count + sinks, return_inverse=True)
+        self._counts = np.bincount(inverse, weights=counts).astype(np.int32)
+        self._indices = (keys % max(node_count, 1)).astype(np.int32)
+        self._indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(keys // max(node_count, 1), minlength=node_count),
+            out=self._indptr[1:],
+        )
+        self._sources, self._sinks, self._added_counts = (
+            array("i"),
+            array("i"),
+            array("i"),
+        )
+        return self._indptr, self._indices, self._counts
+
+    def is_external(self, node: str) -> bool:
+        return bool(self._external[self.ids[node]])
+
+    def package(self, node: str) -> Optional[str]:
+        package_id = self._node_packages[self.ids[node]]
+        return None if package_id < 0 else self.package_names[package_id]
+
+    def successors(self, node: str) -> List[str]:
+        indptr, indices, _ = self.adjacency()
+        node_id = self.ids[node]
+        start, end = indptr[node_id], indptr[node_id + 1]
+        return [self.names[i] for i in indices[start:end]]
+
+    def edges(self) -> Iterator[Tuple[str, str, int]]:
+        r"""Iterate over the edges as (source, sink, count) tuples"""
+        indptr, indices, counts = self.adjacency()
+        for source_id in range(len(self.names)):
+            source = self.names[source_id]
+            for j in range(indptr[source_id], indptr[source_id + 1]):
+                yield source, self.names[indices[j]], int(counts[j])
+
+    def out_degree(self) -> np.ndarray:
+        r"""Return the number of modules imported by each node"""
+        return np.diff(self.adjacency()[0])
+
+    def in_degree(self) -> np.ndarray:
+        r"""Return the number of modules importing each node"""
+        return np.bincount(self.adjacency()[1], minlength=len(self.names))
+
+    def instability(self) -> np.ndarray:
+        r"""Return the instability, i.e. fan-out / (fan-in + fan-out), of each node.
+        Nodes without any edge have an instability of 0
+        """
+        fan_out = self.out_degree()
+        total = fan_out + self.in_degree()
+        return np.divide(
+            fan_out, total, out=np.zeros(len(total), dtype=float), where=total > 0
+        )
+
+    def dependency_matrix(self, sparse: bool = False):
+        r"""Return the matrix whose element (i, j) is the count of the edge
+        from the i-th node to the j-th node
+
+        Args:
+            sparse: If True, a scipy.sparse CSR matrix sharing the graph's
+                adjacency arrays is returned, otherwise a dense numpy array
+        """
+        indptr, indices, counts = self.adjacency()
+        node_count = len(self.names)
+        if sparse:
+            from scipy.sparse import csr_matrix
+
+            return csr_matrix((counts, indices, indptr), shape=(node_count, node_count))
+        rows = np.repeat(np.arange(node_count), np.diff(indptr))
+        return build_matrix(rows, indices, counts, node_count, sparse=False)
+
+    def force_directed_layout(self, seed: int = 0) -> np.ndarray:
+        r"""Return the position of each node computed with a force-directed layout
+
+        Args:
+            seed: Seed of the random initial positions
+        """
+        indptr, indices, _ = self.adjacency()
+        sources = np.repeat(np.arange(len(self.names)), np.diff(indptr))
+        return force_directed_layout(len(self.names), sources, indices, seed=seed)
+
+    def to_networkx(self) -> DependencyGraph:
+        r"""Convert the graph to a DependencyGraph with the same nodes and edges"""
+        graph = DependencyGraph()
+        for node_id, node in enumerate(self.names):
+            attributes = dict(label=node)
+            if self._external[node_id]:
+                attributes.update(label=node + " external", external=True)
+            package_id = self._node_packages[node_id]
+            if package_id >= 0:
+                attributes["package"] = self.package_names[package_id]
+            graph.add_node(node, **attributes)
+        for source, sink, count in self.edges():
+            graph.add_edge(source, sink, count=count)
+        return graph
+
+    @classmethod
+    def from_networkx(cls, graph: DependencyGraph) -> "CompactGraph":
+        r"""Create a compact graph from a DependencyGraph"""
+        compact_graph = cls()
+        for node, attributes in graph.nodes.items():
+            compact_graph.add_node(node, **attributes)
+        for source, sink, count in graph.edges.data("count", default=1):
+            compact_graph.add_edge(source, sink, count)
+        return compact_graph
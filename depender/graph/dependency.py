@@ -1,27 +1,637 @@
 import warnings
+from collections import Counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+import numpy as np
 from networkx import DiGraph, NetworkXException, planar_layout
 
-__all__ = ["DependencyGraph"]
+from depender.graph.algorithms import (
+    condensation,
+    heaviest_path,
+    strongly_connected_components,
+    transitive_closure,
+)
+from depender.graph.layout import force_directed_layout
+from depender.graph.reachability import ReachabilityIndex
+
+__all__ = ["DependencyGraph", "ImportedNode"]
+
+# Imported node together with the attributes it should have in the graph
+ImportedNode = Tuple[str, Dict[str, Any]]
+# Attributes of the edges describing the imports of a module
+IMPORT_EDGE_ATTRIBUTES = ("context", "dead", "duplicates")
 
 
 class DependencyGraph(DiGraph):
+    r"""Directed graph of the imports between modules.
+
+    Each edge's count attribute holds the number of times the source imports
+    the sink. The graph keeps a version number, incremented whenever nodes or
+    edges are added or removed, so that layout does nothing when it is called
+    again on an unchanged graph. Graphs that are not planar are laid out
+    with depender.graph.layout.force_directed_layout.
+
+    Positions saved from a previous layout can be given to layout, in which case
+    the nodes keep their saved positions and only the new nodes are laid out.
+    """
+
+    def __init__(self, incoming_graph_data=None, **attr) -> None:
+        self._version = 0
+        # Version of the graph for which each kind of layout was computed
+        self._layout_versions: Dict[str, int] = dict()
+        # Nodes in the order of their matrix index, once the matrix was laid out
+        self._indexed_nodes: Optional[List[str]] = None
+        # Strongly connected components and the version they were found for
+        self._component_version = -1
+        self._component_cache: Tuple[int, np.ndarray] = (0, np.zeros(0, dtype=int))
+        super().__init__(incoming_graph_data, **attr)
+
     def layout(self, **kwargs):
         matrix = kwargs.pop("matrix", False)
         graph = kwargs.pop("graph", False)
-        if matrix:
+        seed = kwargs.pop("seed", 0)
+        saved_positions = kwargs.pop("positions", None) or dict()
+        if matrix and self._layout_versions.get("matrix") != self._version:
             for i, node in enumerate(self):
                 self.nodes[node]["index"] = i
-            for (source, sink, _) in self.edges.data():
-                if "count" not in self.edges[(source, sink)]:
-                    self.edges[(source, sink)]["count"] = 0
-                self.edges[(source, sink)]["count"] += 1
-        if graph:
-            try:
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore")
-                    positions = planar_layout(self)
-                for node, pos in positions.items():
-                    self.nodes[node]["position"] = pos
-            except NetworkXException:
-                pass
+            self._indexed_nodes = list(self)
+            self._layout_versions["matrix"] = self._version
+        if graph and self._layout_versions.get("graph") != self._version:
+            known_positions = {
+                node: saved_positions[node] for node in self if node in saved_positions
+            }
+            if known_positions and len(known_positions) == len(self):
+                # No new node, the layout is skipped
+                positions = known_positions
+            elif known_positions:
+                positions = self.force_directed_layout(
+                    seed=seed, initial_positions=known_positions
+                )
+            else:
+                try:
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        positions = planar_layout(self)
+                except NetworkXException:
+                    # The graph is not planar
+                    positions = self.force_directed_layout(seed=seed)
+            for node, pos in positions.items():
+                self.nodes[node]["position"] = np.asarray(pos, dtype=float)
+            self._layout_versions["graph"] = self._version
+
+    def force_directed_layout(
+        self,
+        seed: int = 0,
+        initial_positions: Optional[Dict[str, Sequence[float]]] = None,
+    ) -> Dict[str, np.ndarray]:
+        r"""Compute the position of each node with a force-directed layout
+
+        Args:
+            seed: Seed of the random initial positions
+            initial_positions: Known positions of some of the nodes,
+                these nodes keep their positions and the others are laid out
+
+        Returns:
+            The position of each node
+        """
+        ids = {node: i for i, node in enumerate(self)}
+        sources = np.fromiter(
+            (ids[source] for source, _ in self.edges), np.int64, self.number_of_edges()
+        )
+        sinks = np.fromiter(
+            (ids[sink] for _, sink in self.edges), np.int64, self.number_of_edges()
+        )
+        known_positions = None
+        if initial_positions is not None:
+            known_positions = np.full((len(ids), 2), np.nan)
+            for node, position in initial_positions.items():
+                if node in ids:
+                    known_positions[ids[node]] = position
+        positions = force_directed_layout(
+            len(ids), sources, sinks, seed=seed, initial_positions=known_positions
+        )
+        return dict(zip(self, positions))
+
+    def add_node(self, node_for_adding, **attr):
+        self._version += 1
+        super().add_node(node_for_adding, **attr)
+
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        self._version += 1
+        super().add_nodes_from(nodes_for_adding, **attr)
+
+    def remove_node(self, n):
+        self._version += 1
+        super().remove_node(n)
+
+    def remove_nodes_from(self, nodes):
+        self._version += 1
+        super().remove_nodes_from(nodes)
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        self._version += 1
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        self._version += 1
+        super().add_edges_from(ebunch_to_add, **attr)
+
+    def remove_edge(self, u, v):
+        self._version += 1
+        super().remove_edge(u, v)
+
+    def remove_edges_from(self, ebunch):
+        self._version += 1
+        super().remove_edges_from(ebunch)
+
+    def clear(self):
+        self._version += 1
+        super().clear()
+
+    def clear_edges(self):
+        self._version += 1
+        super().clear_edges()
+
+    def dependency_matrix(self, sparse: bool = False, order: str = "insertion"):
+        r"""Return the matrix whose element (i, j) is the count of the edge
+        from the i-th node to the j-th node, in the given order of the nodes.
+
+        The edges are gathered into arrays in a single pass and the matrix
+        is built from them at once, edges without a count counting as 1.
+
+        Args:
+            sparse: If True, a scipy.sparse CSR matrix is returned, whose memory
+                grows with the number of edges, otherwise a dense numpy array
+            order: Order of the rows and columns, see node_order
+
+        Returns:
+            The dependency matrix
+        """
+        rows, columns, counts = self._edge_arrays()
+        if order == "dsm":
+            positions = np.empty(self.number_of_nodes(), dtype=np.int32)
+            positions[self._dsm_permutation()] = np.arange(self.number_of_nodes())
+            rows, columns = positions[rows], positions[columns]
+        elif order != "insertion":
+            raise ValueError("matrix order '{}' is not supported".format(order))
+        return build_matrix(rows, columns, counts, self.number_of_nodes(), sparse)
+
+    def node_order(self, order: str = "insertion") -> List[str]:
+        r"""Return the nodes in the given order
+
+        Args:
+            order: Either 'insertion', the order in which the nodes were added,
+                or 'dsm', the order of a design structure matrix: the strongly
+                connected components are in topological order, the imported
+                modules before the modules importing them, so that the imports
+                are below the diagonal of the dependency matrix and the import
+                cycles are blocks on its diagonal
+
+        Returns:
+            The nodes of the graph
+        """
+        nodes = list(self)
+        if order == "dsm":
+            return [nodes[i] for i in self._dsm_permutation().tolist()]
+        elif order != "insertion":
+            raise ValueError("matrix order '{}' is not supported".format(order))
+        return nodes
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        r"""Return the strongly connected components of the graph, found in linear
+        time with the iterative Tarjan's algorithm of depender.graph.algorithms
+
+        Returns:
+            The nodes of each component, in the order of the graph. The components
+            are in reverse topological order: the modules of a component
+            only import modules of the same or of previous components
+        """
+        component_count, components = self._components()
+        members: List[List[str]] = [list() for _ in range(component_count)]
+        for node, component in zip(self, components.tolist()):
+            members[component].append(node)
+        return members
+
+    def cycles(self) -> List[List[str]]:
+        r"""Return the import cycles of the graph, i.e. the strongly connected
+        components with several nodes and the nodes importing themselves,
+        the largest cycles first
+        """
+        cycles = [
+            component
+            for component in self.strongly_connected_components()
+            if len(component) > 1 or self.has_edge(component[0], component[0])
+        ]
+        return sorted(cycles, key=len, reverse=True)
+
+    def condensation(self) -> "DependencyGraph":
+        r"""Return the graph of the strongly connected components
+
+        Returns:
+            A graph without cycles whose nodes are the numbers of the components,
+            in reverse topological order, with a 'members' attribute holding their
+            nodes. The count of an edge is the sum of the counts of the edges
+            between the members of its components
+        """
+        members = self.strongly_connected_components()
+        _, components = self._components()
+        rows, columns, counts = self._edge_arrays()
+        condensed_graph = DependencyGraph()
+        for component, component_members in enumerate(members):
+            label = component_members[0]
+            if len(component_members) > 1:
+                label += " (+{})".format(len(component_members) - 1)
+            condensed_graph.add_node(component, label=label, members=component_members)
+        condensed_graph.add_edges_from(
+            (source, sink, {"count": count})
+            for source, sink, count in zip(
+                *(
+                    array.tolist()
+                    for array in condensation(components, rows, columns, counts)
+                )
+            )
+        )
+        return condensed_graph
+
+    def reachability(self) -> ReachabilityIndex:
+        r"""Return an index of the transitive imports of the graph, which answers
+        which modules a module imports directly or indirectly, which modules
+        would be affected by a change to a module and the transitive fan-out
+        and fan-in of all the modules at once.
+
+        The index is built over the graph of the strongly connected components,
+        with one packed bitset per component, and reflects the graph at the time
+        it was built.
+
+        Returns:
+            The reachability index of the graph
+        """
+        component_count, components = self._components()
+        rows, columns, counts = self._edge_arrays()
+        sources, sinks, _ = condensation(components, rows, columns, counts)
+        cyclic = np.bincount(components, minlength=component_count) > 1
+        cyclic[components[rows[rows == columns]]] = True
+        closure = transitive_closure(component_count, sources, sinks, cyclic)
+        return ReachabilityIndex(list(self), components, closure)
+
+    def heaviest_import_chain(
+        self, entry: str, weights: Dict[str, float]
+    ) -> Tuple[List[str], float]:
+        r"""Return the import chain starting at the given module whose modules
+        have the largest total weight, e.g. the critical path of the startup
+        of a program when called on the eager_subgraph
+
+        The chain is found on the graph of the strongly connected components,
+        in linear time: the modules of an import cycle are all part of the chain
+        if one of them is, and count once.
+
+        Args:
+            entry: Module at which the chain starts
+            weights: Weight of each node, e.g. its size or import time,
+                the missing nodes weigh nothing
+
+        Returns:
+            The modules of the chain, each one importing one of the next ones,
+            and their total weight
+        """
+        node_ids = {node: i for i, node in enumerate(self)}
+        if entry not in node_ids:
+            raise KeyError(f"Node '{entry}' is not in the graph")
+        component_count, components = self._components()
+        rows, columns, counts = self._edge_arrays()
+        sources, sinks, _ = condensation(components, rows, columns, counts)
+        node_weights = np.fromiter(
+            (weights.get(node, 0) for node in self), np.float64, len(node_ids)
+        )
+        component_weights = np.bincount(
+            components, weights=node_weights, minlength=component_count
+        )
+        path, total = heaviest_path(
+            component_count,
+            sources,
+            sinks,
+            component_weights,
+            int(components[node_ids[entry]]),
+        )
+        members = self.strongly_connected_components()
+        chain = [entry]
+        for component in path:
+            chain += [node for node in members[component] if node != entry]
+        return chain, total
+
+    def deferrable_imports(
+        self, entry: str, max_importers: int = 2
+    ) -> Dict[str, List[str]]:
+        r"""Find the external packages imported, directly or indirectly,
+        by the given module through only a few imports, which would no longer be
+        imported with it if these imports were deferred, e.g. moved into
+        the functions using them when called on the eager_subgraph
+
+        Args:
+            entry: Module whose imports are followed
+            max_importers: Largest number of modules importing a returned package,
+                among the modules imported with the given one
+
+        Returns:
+            The modules importing each of these packages, in the order of the graph
+        """
+        if entry not in self:
+            raise KeyError(f"Node '{entry}' is not in the graph")
+        reached = {entry}
+        stack = [entry]
+        while stack:
+            for successor in self._succ[stack.pop()]:
+                if successor not in reached:
+                    reached.add(successor)
+                    stack.append(successor)
+        importers: Dict[str, List[str]] = dict()
+        for node in self:
+            if node not in reached:
+                continue
+            for successor in self._succ[node]:
+                if self.nodes[successor].get("external", False):
+                    importers.setdefault(successor, []).append(node)
+        return {
+            node: node_importers
+            for node, node_importers in importers.items()
+            if len(node_importers) <= max_importers
+        }
+
+    def _edge_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Index of the source and sink nodes, in the order of the graph, and count
+        # of each edge. The edges are sorted by source because the graph
+        # iterates over them node by node
+        ids = {node: i for i, node in enumerate(self)}
+        edge_count = self.number_of_edges()
+        successors = self._succ.values()
+        rows = np.repeat(
+            np.arange(len(ids), dtype=np.int32),
+            np.fromiter(map(len, successors), np.int64, len(ids)),
+        )
+        columns = np.fromiter(
+            (ids[sink] for sinks in successors for sink in sinks), np.int32, edge_count
+        )
+        counts = np.fromiter(
+            (
+                attributes.get("count", 1)
+                for sinks in successors
+                for attributes in sinks.values()
+            ),
+            np.int32,
+            edge_count,
+        )
+        return rows, columns, counts
+
+    def _components(self) -> Tuple[int, np.ndarray]:
+        # Number of components and component of each node, cached per version
+        if self._component_version != self._version:
+            rows, columns, _ = self._edge_arrays()
+            node_count = self.number_of_nodes()
+            indptr = np.zeros(node_count + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=node_count), out=indptr[1:])
+            self._component_cache = strongly_connected_components(
+                node_count, indptr, columns
+            )
+            self._component_version = self._version
+        return self._component_cache
+
+    def _dsm_permutation(self) -> np.ndarray:
+        # Nodes sorted by component, in the order of the graph within a component
+        return np.argsort(self._components()[1], kind="stable")
+
+    def replace_module_imports(
+        self,
+        module: str,
+        imported_nodes: Iterable[ImportedNode],
+        edge_attributes: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> bool:
+        r"""Replace the outgoing edges of the given module.
+
+        The edges and external nodes that are no longer used are removed and
+        the matrix indices and edge counts are updated in place, so that a graph
+        that was already laid out stays consistent without being laid out again.
+
+        Args:
+            module: Name of the importing module, it is added if it is missing
+            imported_nodes: Imported nodes and their attributes, once per import.
+                A node imported several times gets an edge whose count is
+                the number of times it was imported
+            edge_attributes: 'context', 'dead' and 'duplicates' attributes
+                of the edge to each imported node, as returned by
+                depender.parse.code.CodeParser.resolve_import_edges. The ones
+                missing are removed from the edge. If not given,
+                the edges keep these attributes
+
+        Returns:
+            True if the graph changed, False otherwise
+        """
+        counts: Counter = Counter()
+        attributes: Dict[str, Dict[str, Any]] = dict()
+        for imported_node, node_attributes in imported_nodes:
+            counts[imported_node] += 1
+            attributes.setdefault(imported_node, dict()).update(node_attributes)
+        changed = self._add_indexed_node(module)
+        previous_nodes = list(self.successors(module))
+        for imported_node in previous_nodes:
+            if imported_node not in counts:
+                self.remove_edge(module, imported_node)
+                changed = True
+        for imported_node, count in counts.items():
+            changed |= self._add_indexed_node(imported_node)
+            self.nodes[imported_node].update(attributes[imported_node])
+            if not self.has_edge(module, imported_node):
+                self.add_edge(module, imported_node, count=count)
+                changed = True
+            elif self.edges[module, imported_node].get("count") != count:
+                self.edges[module, imported_node]["count"] = count
+                changed = True
+            if edge_attributes is None:
+                continue
+            current_attributes = self.edges[module, imported_node]
+            new_attributes = edge_attributes.get(imported_node, dict())
+            for key in IMPORT_EDGE_ATTRIBUTES:
+                value = new_attributes.get(key)
+                if current_attributes.get(key) == value:
+                    continue
+                if value is None:
+                    del current_attributes[key]
+                else:
+                    current_attributes[key] = value
+                changed = True
+        self._remove_orphaned_external_nodes(previous_nodes)
+        return changed
+
+    def package_subgraph(self, package: str) -> "DependencyGraph":
+        r"""Return the graph of the given package's modules together with
+        the modules and external packages they import directly
+
+        Args:
+            package: Name of the package, as stored in the nodes' 'package' attribute
+
+        Returns:
+            A new graph, whose nodes are in the same order as in this graph,
+            containing only the edges that leave the package's modules
+        """
+        modules = {
+            node
+            for node, node_package in self.nodes(data="package")
+            if node_package == package
+        }
+        return self._edge_subgraph(
+            lambda source, attributes: source in modules, modules
+        )
+
+    def eager_subgraph(self) -> "DependencyGraph":
+        r"""Return the graph of the eager imports, i.e. the imports executed
+        at module level when the modules are imported, which form the import chains
+        paid for at startup. Imports inside functions, under a TYPE_CHECKING guard
+        or in a handler of a failed import are left out
+
+        Returns:
+            A new graph, whose nodes are in the same order as in this graph,
+            containing only the edges whose context is 'module', or that have
+            no context, and without the external nodes that are only
+            imported lazily
+        """
+        return self._edge_subgraph(
+            lambda source, attributes: attributes.get("context", "module") == "module"
+        )
+
+    def dead_imports(self) -> List[Tuple[str, str]]:
+        r"""Return the dead edges, whose imports are all of names that
+        are never used by the importing module
+        """
+        return [
+            (source, sink)
+            for source, sink, dead in self.edges.data("dead", default=False)
+            if dead
+        ]
+
+    def duplicate_imports(self) -> List[Tuple[str, str, int]]:
+        r"""Return the edges with imports of names that are already imported
+        when the importing module is imported, and the number of these imports
+        """
+        return [
+            (source, sink, duplicates)
+            for source, sink, duplicates in self.edges.data("duplicates", default=0)
+            if duplicates
+        ]
+
+    def live_subgraph(self) -> "DependencyGraph":
+        r"""Return the graph without the dead imports, as it would be once
+        they are removed from the modules, see dead_imports
+
+        Returns:
+            A new graph, whose nodes are in the same order as in this graph,
+            without the dead edges and the external nodes that are only
+            imported by them
+        """
+        return self._edge_subgraph(
+            lambda source, attributes: not attributes.get("dead", False)
+        )
+
+    def remove_module(self, module: str) -> bool:
+        r"""Remove the given module, its edges and the external nodes
+        that were only imported by it
+
+        Returns:
+            True if the module was in the graph, False otherwise
+        """
+        if not self.has_node(module):
+            return False
+        imported_nodes = list(self.successors(module))
+        self._remove_indexed_node(module)
+        self._remove_orphaned_external_nodes(imported_nodes)
+        return True
+
+    def _edge_subgraph(
+        self,
+        keep_edge: Callable[[str, Dict[str, Any]], bool],
+        nodes: Optional[Set[str]] = None,
+    ) -> "DependencyGraph":
+        # Graph of the edges for which keep_edge(source, attributes) is True,
+        # with the given nodes, or all the nodes but the external ones,
+        # and the nodes imported through the kept edges, in the order of this graph
+        edges = [
+            (source, sink, attributes)
+            for source, sink, attributes in self.edges.data()
+            if keep_edge(source, attributes)
+        ]
+        imported_nodes = {sink for _, sink, _ in edges}
+        subgraph = DependencyGraph()
+        for node, attributes in self.nodes.items():
+            if nodes is None:
+                keep_node = not attributes.get("external", False)
+            else:
+                keep_node = node in nodes
+            if keep_node or node in imported_nodes:
+                # The layout of this graph does not apply to the subgraph
+                subgraph.add_node(
+                    node,
+                    **{
+                        key: value
+                        for key, value in attributes.items()
+                        if key not in ("index", "position")
+                    },
+                )
+        subgraph.add_edges_from(edges)
+        return subgraph
+
+    def _add_indexed_node(self, node: str) -> bool:
+        if self.has_node(node):
+            return False
+        self.add_node(node, label=node)
+        if self._indexed_nodes is not None:
+            self.nodes[node]["index"] = len(self._indexed_nodes)
+            self._indexed_nodes.append(node)
+        return True
+
+    def _remove_indexed_node(self, node: str) -> None:
+        index = self.nodes[node].get("index")
+        self.remove_node(node)
+        if index is None or self._indexed_nodes is None:
+            return
+        # Close the gap left in the matrix indices with the last indexed node,
+        # so that only the indices of the removed node and that node change
+        last_node = self._indexed_nodes.pop()
+        if last_node != node:
+            self._indexed_nodes[index] = last_node
+            self.nodes[last_node]["index"] = index
+
+    def _remove_orphaned_external_nodes(self, nodes: Iterable[str]) -> None:
+        for node in nodes:
+            if (
+                self.has_node(node)
+                and self.nodes[node].get("external", False)
+                and self.in_degree(node) == 0
+            ):
+                self._remove_indexed_node(node)
+
+
+def build_matrix(
+    rows: np.ndarray,
+    columns: np.ndarray,
+    counts: np.ndarray,
+    node_count: int,
+    sparse: bool,
+):
+    r"""Build a square dense or CSR matrix from the coordinates and counts of its
+    non-zero elements, which must not contain duplicates
+    """
+    if sparse:
+        from scipy.sparse import csr_matrix
+
+        return csr_matrix((counts, (rows, columns)), shape=(node_count, node_count))
+    matrix = np.zeros((node_count, node_count), dtype=counts.dtype)
+    matrix[rows, columns] = counts
+    return matrix
@@ -0,0 +1,177 @@
+from typing import Optional
+
+import numpy as np
+
+__all__ = ["force_directed_layout"]
+
+
+def force_directed_layout(
+    node_count: int,
+    sources: np.ndarray,
+    sinks: np.ndarray,
+    iterations: int = 50,
+    seed: int = 0,
+    gravity: float = 1.0,
+    max_grid_size: int = 128,
+    initial_positions: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    r"""Compute the positions of a graph's nodes with a force-directed algorithm.
+
+    This is the Fruchterman-Reingold algorithm, in which the edges attract
+    their nodes and all nodes repel each other, with the repulsion approximated
+    on a grid: only the pairs of nodes in the same or in adjacent cells are
+    computed exactly, see _repulsion, so that each iteration costs time
+    roughly proportional to the number of nodes and edges instead of its square.
+    All forces are summed with vectorized numpy operations.
+    A weak gravity pulls all nodes towards the center, which keeps nodes
+    that are not connected to the rest of the graph close to it.
+
+    Args:
+        node_count: Number of nodes
+        sources: Index of the source node of each edge
+        sinks: Index of the sink node of each edge, the direction of the edges
+            is ignored
+        iterations: Number of iterations
+        seed: Seed of the random initial positions, the same seed always
+            gives the same positions
+        gravity: Strength of the force pulling the nodes towards the center
+        max_grid_size: Maximum number of cells along each side of the grid
+        initial_positions: If given, array with the known position of each node
+            and NaN for the nodes that are not known yet. The known nodes keep
+            their positions and only the other nodes are laid out
+
+    Returns:
+        Array with the position of each node, scaled to fit in [-1, 1] x [-1, 1]
+        unless some positions were known, in which case they are not rescaled
+    """
+    random_state = np.random.RandomState(seed)
+    positions = random_state.uniform(-1.0, 1.0, size=(node_count, 2))
+    fixed = np.zeros(node_count, dtype=bool)
+    if initial_positions is not None:
+        fixed = ~np.isnan(initial_positions).any(axis=1)
+        positions[fixed] = initial_positions[fixed]
+        if fixed.all():
+            return positions
+    if node_count <= 1 and not fixed.any():
+        return np.zeros((node_count, 2))
+    sources = np.asarray(sources, dtype=np.int64)
+    sinks = np.asarray(sinks, dtype=np.int64)
+    # Ignore self loops, they have no effect on the layout
+    is_loop = sources == sinks
+    sources, sinks = sources[~is_loop], sinks[~is_loop]
+    # Ideal distance between nodes in the initial square of area 4
+    k = 2.0 / np.sqrt(node_count)
+    temperature = 0.1 * 2.0
+    for _ in range(iterations):
+        displacement = _repulsion(positions, k, max_grid_size)
+        # Attraction along the edges
+        delta = positions[sources] - positions[sinks]
+        distance = np.sqrt((delta**2).sum(axis=1))
+        force = delta * (distance / k)[:, np.newaxis]
+        for axis in range(2):
+            displacement[:, axis] -= np.bincount(
+                sources, weights=force[:, axis], minlength=node_count
+            )
+            displacement[:, axis] += np.bincount(
+                sinks, weights=force[:, axis], minlength=node_count
+            )
+        displacement -= gravity * positions
+        displacement[fixed] = 0.0
+        # Limit the displacement to the current temperature
+        length = np.sqrt((displacement**2).sum(axis=1))
+        length[length == 0] = 1.0
+        positions += (
+            displacement * (np.minimum(length, temperature) / length)[:, np.newaxis]
+        )
+        # Cool down linearly
+        temperature -= 0.1 * 2.0 / (iterations + 1)
+    if fixed.any():
+        return positions
+    return _rescale(positions)
+
+
+def _repulsion(positions: np.ndarray, k: float, max_grid_size: int) -> np.ndarray:
+    r"""Sum the repulsive forces, of magnitude k^2 / distance, between all nodes.
+
+    The nodes are binned into a square grid, the forces between nodes in the
+    same or in adjacent cells are computed exactly and the forces exerted by
+    the nodes of the other cells are computed with a particle-mesh method:
+    the number of nodes in each cell is convolved with the force kernel
+    using a fast Fourier transform and each node receives the force at the
+    center of its cell.
+    """
+    lower = positions.min(axis=0)
+    span = max(float((positions.max(axis=0) - lower).max()), k)
+    # Cells of about 2k so that adjacent cells hold few nodes
+    grid_size = int(np.clip(np.ceil(span / (2.0 * k)), 3, max_grid_size))
+    cell_size = span * (1.0 + 1e-9) / grid_size
+    cells = np.minimum(
+        np.floor((positions - lower) / cell_size).astype(np.int64), grid_size - 1
+    )
+    displacement = _near_field_repulsion(positions, cells, grid_size, k)
+    # Far field, the kernel is zero for the cell itself and the adjacent cells
+    counts = np.bincount(
+        cells[:, 0] * grid_size + cells[:, 1], minlength=grid_size**2
+    ).reshape(grid_size, grid_size)
+    offsets = np.fft.fftfreq(2 * grid_size, d=1.0 / (2 * grid_size)) * cell_size
+    dx, dy = np.meshgrid(offsets, offsets, indexing="ij")
+    squared_distance = dx**2 + dy**2
+    near = (np.abs(dx) < 1.5 * cell_size) & (np.abs(dy) < 1.5 * cell_size)
+    squared_distance[near] = np.inf
+    padded_counts = np.fft.rfft2(counts, s=(2 * grid_size, 2 * grid_size))
+    for axis, delta in enumerate((dx, dy)):
+        kernel = np.fft.rfft2(k**2 * delta / squared_distance)
+        field = np.fft.irfft2(padded_counts * kernel, s=(2 * grid_size, 2 * grid_size))
+        displacement[:, axis] += field[cells[:, 0], cells[:, 1]]
+    return displacement
+
+
+def _near_field_repulsion(
+    positions: np.ndarray, cells: np.ndarray, grid_size: int, k: float
+) -> np.ndarray:
+    node_count = len(positions)
+    cell_ids = cells[:, 0] * grid_size + cells[:, 1]
+    # Nodes sorted by cell, with the start and number of nodes of each cell
+    order = np.argsort(cell_ids, kind="stable")
+    cell_counts = np.bincount(cell_ids, minlength=grid_size**2)
+    cell_starts = np.cumsum(cell_counts) - cell_counts
+    displacement = np.zeros((node_count, 2))
+    # The same cell and half of the adjacent cells, so that each pair
+    # of adjacent cells is only visited once
+    for dx, dy in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+        neighbour_x = cells[:, 0] + dx
+        neighbour_y = cells[:, 1] + dy
+        valid = (
+            (neighbour_x >= 0) & (neighbour_x < grid_size) & (neighbour_y < grid_size)
+        )
+        neighbour_ids = np.where(valid, neighbour_x * grid_size + neighbour_y, 0)
+        partner_counts = np.where(valid, cell_counts[neighbour_ids], 0)
+        # Pair each node with every node of the adjacent cell
+        first = np.repeat(np.arange(node_count), partner_counts)
+        offsets = np.arange(len(first)) - np.repeat(
+            np.cumsum(partner_counts) - partner_counts, partner_counts
+        )
+        second = order[np.repeat(cell_starts[neighbour_ids], partner_counts) + offsets]
+        if dx == 0 and dy == 0:
+            # Count the pairs of nodes in the same cell once
+            keep = first < second
+            first, second = first[keep], second[keep]
+        delta = positions[first] - positions[second]
+        squared_distance = np.maximum((delta**2).sum(axis=1), 1e-12)
+        force = delta * (k**2 / squared_distance)[:, np.newaxis]
+        for axis in range(2):
+            displacement[:, axis] += np.bincount(
+                first, weights=force[:, axis], minlength=node_count
+            )
+            displacement[:, axis] -= np.bincount(
+                second, weights=force[:, axis], minlength=node_count
+            )
+    return displacement
+
+
+def _rescale(positions: np.ndarray) -> np.ndarray:
+    positions = positions - positions.mean(axis=0)
+    scale = np.abs(positions).max()
+    if scale > 0:
+        positions /= scale
+    return positions
@@ -0,0 +1,111 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from depender.graph.algorithms import unpack_bitsets
+
+__all__ = ["ReachabilityIndex"]
+
+# Maximum number of booleans unpacked at once when counting reachable nodes
+UNPACK_CHUNK_SIZE = 2**24
+
+
+class ReachabilityIndex:
+    r"""Index answering transitive dependency queries on a dependency graph.
+
+    The index stores the transitive closure of the graph of the strongly connected
+    components as one packed bitset per component, so that it takes
+    component_count ** 2 / 8 bytes. A node reaches another one if there is a path
+    of at least one edge between them: the modules of an import cycle reach
+    themselves, the other modules do not.
+
+    It is usually obtained with DependencyGraph.reachability().
+
+    Args:
+        nodes: Nodes of the graph, in the order of the graph
+        components: Component of each node
+        closure: Transitive closure of the components, as returned by
+            depender.graph.algorithms.transitive_closure
+    """
+
+    def __init__(
+        self, nodes: List[str], components: np.ndarray, closure: np.ndarray
+    ) -> None:
+        self.nodes = list(nodes)
+        self.components = np.asarray(components, dtype=np.int64)
+        self.closure = closure
+        self.component_count = closure.shape[0]
+        self._ids = {node: i for i, node in enumerate(self.nodes)}
+        self._counts = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def reaches(self, source: str, sink: str) -> bool:
+        r"""Return whether source imports sink, directly or indirectly"""
+        component = self._component(source)
+        sink_component = self._component(sink)
+        word = self.closure[component, sink_component >> 6]
+        return bool((int(word) >> (sink_component & 63)) & 1)
+
+    def descendants(self, node: str) -> List[str]:
+        r"""Return the nodes imported by the given node, directly or indirectly,
+        in the order of the graph
+        """
+        reached = unpack_bitsets(
+            self.closure[self._component(node)], self.component_count
+        )
+        return self._select(reached)
+
+    def ancestors(self, node: str) -> List[str]:
+        r"""Return the nodes importing the given node, directly or indirectly,
+        in the order of the graph
+        """
+        component = self._component(node)
+        column = self.closure[:, component >> 6] >> np.uint64(component & 63)
+        return self._select((column & np.uint64(1)).astype(bool))
+
+    def fan_out(self) -> Dict[str, int]:
+        r"""Return the number of nodes imported by each node, directly or indirectly"""
+        return dict(zip(self.nodes, self._transitive_counts()[0].tolist()))
+
+    def fan_in(self) -> Dict[str, int]:
+        r"""Return the number of nodes importing each node, directly or indirectly"""
+        return dict(zip(self.nodes, self._transitive_counts()[1].tolist()))
+
+    def _component(self, node: str) -> int:
+        try:
+            return int(self.components[self._ids[node]])
+        except KeyError:
+            raise KeyError(f"Node '{node}' is not in the graph") from None
+
+    def _select(self, reached_components: np.ndarray) -> List[str]:
+        # Nodes whose component is set in the given boolean array of components
+        return [
+            self.nodes[i]
+            for i in np.flatnonzero(reached_components[self.components]).tolist()
+        ]
+
+    def _transitive_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Fan-out and fan-in of each node, computed for all the components at once
+        # by unpacking the bitsets a chunk of rows at a time. Each reached
+        # component counts for its number of nodes: the bits are summed,
+        # then the components with several nodes are added again
+        if self._counts is None:
+            extra = np.bincount(self.components, minlength=self.component_count) - 1
+            several = np.flatnonzero(extra)
+            fan_out = np.zeros(self.component_count, dtype=np.int64)
+            fan_in = np.zeros(self.component_count, dtype=np.int64)
+            chunk_size = max(UNPACK_CHUNK_SIZE // max(self.component_count, 1), 1)
+            for start in range(0, self.component_count, chunk_size):
+                end = min(start + chunk_size, self.component_count)
+                reached = unpack_bitsets(
+                    self.closure[start:end], self.component_count
+                ).view(np.uint8)
+                fan_out[start:end] = reached.sum(axis=1, dtype=np.int32)
+                fan_out[start:end] += reached[:, several] @ extra[several]
+                fan_in += reached.sum(axis=0, dtype=np.int32)
+                rows = several[(several >= start) & (several < end)]
+                fan_in += extra[rows] @ reached[rows - start]
+            self._counts = (fan_out[self.components], fan_in[self.components])
+        return self._counts
@@ -1,51 +1,61 @@
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+import numpy as np
 from networkx import DiGraph
 
 __all__ = ["StructureGraph"]
 
 
 class StructureGraph(DiGraph):
+    r"""Tree of the directories and files of a project.
+
+    The children of a node are its successors, in the order in which they were
+    added. The nodes only hold their attributes, e.g. their label and type,
+    and their coordinates: the state of the layout algorithm is allocated
+    in arrays while layout runs and is freed afterwards.
+    """
+
     def add_node(self, node_for_adding, **attr):
         properties = {}
-        # Initial properties that are needed for the structure graph
+        # Initial coordinates, replaced by the layout
         if node_for_adding not in self.nodes:
-            properties = {
-                "children": [],
-                "parent": None,
-                "ancestor": None,
-                "leftmost_sibling": None,
-                "left_sibling": None,
-                "thread": None,
-                "x": 0,
-                "y": 0,
-                "width": 0,
-                "height": 0,
-                "index": 0,
-                "shift": 0,
-                "modifier": 0,
-                "change": 0,
-            }
+            properties = {"x": 0, "y": 0}
         properties.update(**attr)
         super().add_node(node_for_adding, **properties)
 
     def add_nodes_from(self, nodes_for_adding, **attr):
-        super().add_nodes_from(nodes_for_adding, **attr)
-        # Initial properties that are needed for the structure graph
         for node_for_adding in nodes_for_adding:
-            self.add_node(node_for_adding, **attr)
+            if isinstance(node_for_adding, tuple):
+                node_for_adding, node_attr = node_for_adding
+                self.add_node(node_for_adding, **{**attr, **node_attr})
+            else:
+                self.add_node(node_for_adding, **attr)
 
     def add_edge(self, source: str, sink: str, **kwargs):
-        self.add_node(source)
-        self.add_node(sink)
+        if source not in self:
+            self.add_node(source)
+        if sink not in self:
+            self.add_node(sink)
         super().add_edge(source, sink, **kwargs)
-        # Add properties to both nodes
-        self.nodes[source]["children"] += [sink]
-        self.nodes[sink]["parent"] = source
-        self.nodes[sink]["ancestor"] = sink
-        self.nodes[sink]["index"] = len(list(self.successors(source)))
-        # Add siblings
-        if len(list(self.successors(source))) > 1:
-            self.nodes[sink]["leftmost_sibling"] = next(iter(self.successors(source)))
-            self.nodes[sink]["left_sibling"] = list(self.successors(source))[-2]
+
+    def add_children(
+        self, parent: str, children: Iterable[Union[str, Tuple[str, Dict[str, Any]]]]
+    ) -> None:
+        r"""Add the given children, in order, after the existing children of a node
+
+        Args:
+            parent: Parent node, added to the graph if it is not in it yet
+            children: Child nodes, or (child node, attributes) tuples
+        """
+        if parent not in self:
+            self.add_node(parent)
+        for child in children:
+            if isinstance(child, tuple):
+                child, attributes = child
+                self.add_node(child, **attributes)
+            elif child not in self:
+                self.add_node(child)
+            super().add_edge(parent, child)
 
     @property
     def root_node(self) -> str:
@@ -56,169 +66,262 @@ class StructureGraph(DiGraph):
     def layout(self, **kwargs):
         base_distance_x = kwargs.pop("base_distance_x", 1.0)
         base_distance_y = kwargs.pop("base_distance_y", 1.0)
+        # Coordinates saved from a previous layout of the same graph
+        coordinates = kwargs.pop("coordinates", None)
+        if coordinates and all(node in coordinates for node in self):
+            for node, (x, y) in coordinates.items():
+                if node in self:
+                    self.nodes[node]["x"], self.nodes[node]["y"] = x, y
+            return
         root_node = self.root_node
         if root_node is not None:
-            self._first_walk(root_node, base_distance=base_distance_x)
-            self._second_walk(
-                root_node, -self.nodes[root_node]["x"], base_distance=base_distance_y
-            )
+            tree_layout = _TreeLayout(self, root_node)
+            tree_layout.first_walk(base_distance=base_distance_x)
+            x, y = tree_layout.second_walk(base_distance=base_distance_y)
+            node_attributes = self._node
+            for node, node_x, node_y in zip(tree_layout.nodes, x.tolist(), y.tolist()):
+                attributes = node_attributes[node]
+                attributes["x"] = node_x
+                attributes["y"] = node_y
 
-    def _first_walk(self, current_node: str, base_distance: float = 1.0):
-        # Get the current node's children and count them
-        children = self.nodes[current_node]["children"]
-        children_count = len(children)
-        if children_count == 0:
-            left_sibling = self.nodes[current_node].get("left_sibling", None)
-            if left_sibling:
-                self.nodes[current_node]["x"] = (
-                    self.nodes[left_sibling]["x"]
-                    + (
-                        self.nodes[left_sibling]["width"]
-                        + self.nodes[current_node]["width"]
-                    )
-                    / 2
-                    + base_distance
-                )
-            else:
-                self.nodes[current_node]["x"] = 0
-        else:
-            # Make the default ancestor the leftmost child of the current node
-            default_ancestor = children[0]
-            for child in children:
-                self._first_walk(child, base_distance)
-                default_ancestor = self._apportion(
-                    child, default_ancestor, base_distance
-                )
 
-            self._execute_shifts(current_node)
-            # Compute the current node's children's center point's x coordinate
-            if len(children) % 2 == 0:
-                midpoint = (
-                    self.nodes[children[0]]["x"] + self.nodes[children[-1]]["x"]
-                ) / 2
-            else:
-                midpoint = self.nodes[children[len(children) // 2]]["x"]
-            # If the current node has no left sibling i.e. is the leftmost one
-            # then assign the midpoint coordinate to it, else shift from its left sibling
-            # and compute the modifier value
-            left_sibling = self.nodes[current_node].get("left_sibling", None)
-            if left_sibling:
-                self.nodes[current_node]["x"] = (
-                    self.nodes[left_sibling]["x"]
-                    + (
-                        self.nodes[left_sibling]["width"]
-                        + self.nodes[current_node]["width"]
-                    )
-                    / 2
-                    + base_distance
-                )
-                self.nodes[current_node]["modifier"] = (
-                    self.nodes[current_node]["x"] - midpoint
+class _TreeLayout:
+    r"""Buchheim's algorithm, laying out a tree in linear time, on the nodes
+    reachable from a root node of a StructureGraph.
+
+    The nodes are numbered in breadth-first order, so that the children of
+    each node have consecutive ids, and the state of the algorithm is kept in
+    numpy arrays indexed by node id, -1 standing for a missing node.
+    Both walks are iterative so that deep trees do not exceed the recursion limit.
+
+    Args:
+        graph: Graph whose nodes can have a width and a height, 0 by default
+        root_node: Root of the laid out tree
+    """
+
+    def __init__(self, graph: StructureGraph, root_node: str) -> None:
+        # The attributes and successors of the nodes are read from the graph's
+        # own dictionaries, the views of networkx being slower and copying
+        # them would increase the peak memory of the layout
+        node_attributes = graph._node
+        successors = graph._succ
+        self.nodes: List[str] = [root_node]
+        child_counts: List[int] = list()
+        for node in self.nodes:
+            children = successors[node]
+            child_counts.append(len(children))
+            self.nodes += children
+        node_count = len(self.nodes)
+        self.child_count = np.array(child_counts, dtype=np.int64)
+        # The children of the nodes follow the root in the order of their parents
+        self.first_child = np.cumsum(self.child_count) - self.child_count + 1
+        self.parent = np.repeat(
+            np.arange(-1, node_count), np.append(1, self.child_count)
+        )
+        # Position of each node among its siblings, starting at 1 and 0 for the root
+        self.index = np.arange(node_count) - self.first_child[self.parent] + 1
+        self.index[0] = 0
+        self.width = np.array(
+            [node_attributes[node].get("width", 0) for node in self.nodes], float
+        )
+        self.height = np.array(
+            [node_attributes[node].get("height", 0) for node in self.nodes], float
+        )
+        self.x = np.zeros(node_count)
+        self.modifier = np.zeros(node_count)
+        self.shift = np.zeros(node_count)
+        self.change = np.zeros(node_count)
+        self.thread = np.full(node_count, -1, dtype=np.int64)
+        self.ancestor = np.arange(node_count)
+        self.ancestor[0] = -1
+        # The first walk reads and writes single elements, which is much faster
+        # through memoryviews of the arrays than by indexing the arrays themselves
+        self._parent = memoryview(self.parent)
+        self._first_child = memoryview(self.first_child)
+        self._child_count = memoryview(self.child_count)
+        self._index = memoryview(self.index)
+        self._width = memoryview(self.width)
+        self._x = memoryview(self.x)
+        self._modifier = memoryview(self.modifier)
+        self._shift = memoryview(self.shift)
+        self._change = memoryview(self.change)
+        self._thread = memoryview(self.thread)
+        self._ancestor = memoryview(self.ancestor)
+
+    def first_walk(self, base_distance: float = 1.0) -> None:
+        r"""First part of Buchheim's algorithm.
+        The tree is traversed in a bottom up manner, each node being placed
+        relative to its left sibling once all of its children are placed.
+
+        Args:
+            base_distance: Base horizontal distance between sibling nodes
+        """
+        next_child = [0] * len(self.nodes)
+        default_ancestor = [-1] * len(self.nodes)
+        first_child = self._first_child
+        child_count = self._child_count
+        stack = [0]
+        while stack:
+            current_node = stack[-1]
+            k = next_child[current_node]
+            if k < child_count[current_node]:
+                if k == 0:
+                    # Make the default ancestor the leftmost child of the current node
+                    default_ancestor[current_node] = first_child[current_node]
+                next_child[current_node] = k + 1
+                stack.append(first_child[current_node] + k)
+                continue
+            stack.pop()
+            self._place(current_node, base_distance)
+            if stack:
+                parent = stack[-1]
+                default_ancestor[parent] = self._apportion(
+                    current_node, default_ancestor[parent], base_distance
                 )
-            else:
-                self.nodes[current_node]["x"] = midpoint
-
-    def _second_walk(
-        self,
-        current_node,
-        modifier: float = 0,
-        depth: int = 0,
-        base_distance: float = 1,
-    ):
+
+    def second_walk(self, base_distance: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
         r"""Second part of Buchheim's algorithm.
-        The tree is traversed in a top down manner.
+        Each node is shifted by the sum of the modifiers of its ancestors,
+        one level of the tree at a time.
 
         Args:
-            current_node: Current node object
-            modifier: Distance by which the x position of the current node will be shifted
-            depth: Depth of the current node in the graph
             base_distance: Vertical distance between levels in the graph
+
+        Returns:
+            The x and y coordinates of the nodes
         """
-        # Shift the current node's x position by an amount equal to modifier
-        # and increment modifier by an amount equal to the current node's modifier property
-        self.nodes[current_node]["x"] += modifier
-        modifier += self.nodes[current_node]["modifier"]
-        # The current node's y position is equal to the current depth times 1 + the height
-        self.nodes[current_node]["y"] = -depth * (
-            self.nodes[current_node]["height"] + base_distance
-        )
-        for child in self.nodes[current_node]["children"]:
-            self._second_walk(child, modifier, depth + 1, base_distance)
+        x = self.x.copy()
+        depth = np.zeros(len(self.nodes), dtype=np.int64)
+        # Sum of the modifiers of the ancestors of each node
+        modifier_sum = np.zeros(len(self.nodes))
+        modifier_sum[0] = -self.x[0]
+        start, end = 0, 1
+        while start < end:
+            level = np.arange(start, end)
+            x[level] += modifier_sum[level]
+            # The children of a level are the nodes that follow it
+            next_end = end + int(self.child_count[start:end].sum())
+            next_level = np.arange(end, next_end)
+            parents = self.parent[next_level]
+            modifier_sum[next_level] = modifier_sum[parents] + self.modifier[parents]
+            depth[next_level] = depth[parents] + 1
+            start, end = end, next_end
+        y = -depth * (self.height + base_distance)
+        return x, y
+
+    def _left_sibling(self, node: int) -> int:
+        if node == 0 or node == self._first_child[self._parent[node]]:
+            return -1
+        return node - 1
+
+    def _place(self, current_node: int, base_distance: float) -> None:
+        x, width = self._x, self._width
+        children_count = self._child_count[current_node]
+        left_sibling = self._left_sibling(current_node)
+        if children_count == 0:
+            if left_sibling >= 0:
+                x[current_node] = (
+                    x[left_sibling]
+                    + (width[left_sibling] + width[current_node]) / 2
+                    + base_distance
+                )
+            else:
+                x[current_node] = 0
+            return
+        self._execute_shifts(current_node)
+        # Compute the current node's children's center point's x coordinate
+        first_child = self._first_child[current_node]
+        if children_count % 2 == 0:
+            midpoint = (x[first_child] + x[first_child + children_count - 1]) / 2
+        else:
+            midpoint = x[first_child + children_count // 2]
+        # If the current node has no left sibling i.e. is the leftmost one
+        # then assign the midpoint coordinate to it, else shift from its left sibling
+        # and compute the modifier value
+        if left_sibling >= 0:
+            x[current_node] = (
+                x[left_sibling]
+                + (width[left_sibling] + width[current_node]) / 2
+                + base_distance
+            )
+            self._modifier[current_node] = x[current_node] - midpoint
+        else:
+            x[current_node] = midpoint
 
     def _apportion(
-        self, current_node: str, default_ancestor: str, base_distance: float
-    ):
-        r"""
+        self, current_node: int, default_ancestor: int, base_distance: float
+    ) -> int:
+        r"""Move the subtree rooted at the current node to the right of the subtrees
+        of its left siblings, walking down their contours
 
         Args:
-            current_node:
-            default_ancestor:
+            current_node: Current node
+            default_ancestor: Default ancestor of the current node's contour
             base_distance: Base horizontal distance between sibling nodes
 
         Returns:
             Either the given default ancestor node or the current node
         """
-        left_sibling = self.nodes[current_node]["left_sibling"]
-        leftmost_sibling = self.nodes[current_node]["leftmost_sibling"]
-        if left_sibling is not None and leftmost_sibling is not None:
-            v_inner_right = v_outer_right = current_node
-            v_inner_left = left_sibling
-            v_outer_left = leftmost_sibling
-            sir = self.nodes[v_inner_right]["modifier"]
-            sor = self.nodes[v_outer_right]["modifier"]
-            sil = self.nodes[v_inner_left]["modifier"]
-            sol = self.nodes[v_outer_left]["modifier"]
-            # Traverse the contours
+        left_sibling = self._left_sibling(current_node)
+        if left_sibling < 0:
+            return default_ancestor
+        x, width, modifier = self._x, self._width, self._modifier
+        v_inner_right = v_outer_right = current_node
+        v_inner_left = left_sibling
+        v_outer_left = self._first_child[self._parent[current_node]]
+        sir = modifier[v_inner_right]
+        sor = modifier[v_outer_right]
+        sil = modifier[v_inner_left]
+        sol = modifier[v_outer_left]
+        # Traverse the contours
+        next_inner_left = self._next_right(v_inner_left)
+        next_inner_right = self._next_left(v_inner_right)
+        next_outer_left = self._next_left(v_outer_left)
+        next_outer_right = self._next_right(v_outer_right)
+        while (
+            next_inner_left >= 0
+            and next_inner_right >= 0
+            and next_outer_right >= 0
+            and next_outer_left >= 0
+        ):
+            v_inner_left = next_inner_left
+            v_inner_right = next_inner_right
+            v_outer_left = next_outer_left
+            v_outer_right = next_outer_right
+            self._ancestor[v_outer_right] = current_node
+            shift = (
+                (x[v_inner_left] + sil)
+                - (x[v_inner_right] + sir)
+                + (width[v_inner_left] + width[v_inner_right]) / 2
+                + base_distance
+            )
+            if shift > 0:
+                ancestor = self._find_ancestor(
+                    v_inner_left, current_node, default_ancestor
+                )
+                self._move_subtree(ancestor, current_node, shift)
+                sir = sir + shift
+                sor = sor + shift
+            sil += modifier[v_inner_left]
+            sir += modifier[v_inner_right]
+            sol += modifier[v_outer_left]
+            sor += modifier[v_outer_right]
+            # Get the next elements in the contours
             next_inner_left = self._next_right(v_inner_left)
             next_inner_right = self._next_left(v_inner_right)
             next_outer_left = self._next_left(v_outer_left)
             next_outer_right = self._next_right(v_outer_right)
-            while (
-                next_inner_left
-                and next_inner_right
-                and next_outer_right
-                and next_outer_left
-            ):
-                v_inner_left = next_inner_left
-                v_inner_right = next_inner_right
-                v_outer_left = next_outer_left
-                v_outer_right = next_outer_right
-                self.nodes[v_outer_right]["ancestor"] = current_node
-                # shift = (v_inner_left.x + sil) - (v_inner_right.x + sir)
-                shift = (
-                    (self.nodes[v_inner_left]["x"] + sil)
-                    - (self.nodes[v_inner_right]["x"] + sir)
-                    + (
-                        self.nodes[v_inner_left]["width"]
-                        + self.nodes[v_inner_right]["width"]
-                    )
-                    / 2
-                    + base_distance
-                )
-                if shift > 0:
-                    a = self._ancestor(v_inner_left, current_node, default_ancestor)
-                    self._move_subtree(a, current_node, shift)
-                    sir = sir + shift
-                    sor = sor + shift
-                sil += self.nodes[v_inner_left]["modifier"]
-                sir += self.nodes[v_inner_right]["modifier"]
-                sol += self.nodes[v_outer_left]["modifier"]
-                sor += self.nodes[v_outer_right]["modifier"]
-                # Get the next elements in the contours
-                next_inner_left = self._next_right(v_inner_left)
-                next_inner_right = self._next_left(v_inner_right)
-                next_outer_left = self._next_left(v_outer_left)
-                next_outer_right = self._next_right(v_outer_right)
-            if self._next_right(v_inner_left) and not self._next_right(v_outer_right):
-                self.nodes[v_outer_right]["thread"] = self._next_right(v_inner_left)
-                self.nodes[v_outer_right]["modifier"] += sil - sor
-            if self._next_left(v_inner_right) and not self._next_left(v_outer_left):
-                self.nodes[v_outer_left]["thread"] = self._next_left(v_inner_right)
-                self.nodes[v_outer_left]["modifier"] += sir - sol
-            default_ancestor = current_node
-        return default_ancestor
+        if next_inner_left >= 0 and self._next_right(v_outer_right) < 0:
+            self._thread[v_outer_right] = next_inner_left
+            modifier[v_outer_right] += sil - sor
+        if next_inner_right >= 0 and self._next_left(v_outer_left) < 0:
+            self._thread[v_outer_left] = next_inner_right
+            modifier[v_outer_left] += sir - sol
+        return current_node
 
-    def _move_subtree(self, left_ancestor, right_ancestor, shift: float) -> None:
+    def _move_subtree(
+        self, left_ancestor: int, right_ancestor: int, shift: float
+    ) -> None:
         r"""Shift the right subtree rooted at the right ancestor
 
         Args:
@@ -227,55 +330,38 @@ class StructureGraph(DiGraph):
             shift: Amount by which the right subtree will be shifted
         """
         num_subtrees_between_ancestors = (
-            self.nodes[right_ancestor]["index"] - self.nodes[left_ancestor]["index"]
+            self._index[right_ancestor] - self._index[left_ancestor]
         )
-        self.nodes[right_ancestor]["change"] -= shift / num_subtrees_between_ancestors
-        self.nodes[right_ancestor]["shift"] += shift
-        self.nodes[left_ancestor]["change"] += shift / num_subtrees_between_ancestors
-        self.nodes[right_ancestor]["x"] += shift
-        self.nodes[right_ancestor]["modifier"] += shift
-
-    def _execute_shifts(self, node):
-        shift = change = 0  # type: float
-        for child in list(reversed(self.nodes[node]["children"])):
-            self.nodes[child]["x"] += shift
-            self.nodes[child]["modifier"] += shift
-            change += self.nodes[child]["change"]
-            shift += self.nodes[child]["shift"] + change
-
-    def _next_left(self, node):
-        r"""Traverse the left contour of the subtree rooted at node
-
-        Args:
-            node from which the next node in the left contour will be taken
-
-        Returns:
-            Next node in the left contour
-        """
-        children = self.nodes[node]["children"]
-        thread = self.nodes[node]["thread"]
-        if children:
-            return children[0]
-        else:
-            return thread
+        self._change[right_ancestor] -= shift / num_subtrees_between_ancestors
+        self._shift[right_ancestor] += shift
+        self._change[left_ancestor] += shift / num_subtrees_between_ancestors
+        self._x[right_ancestor] += shift
+        self._modifier[right_ancestor] += shift
 
-    def _next_right(self, node):
-        r"""Traverse the right contour of the subtree rooted at node
+    def _execute_shifts(self, node: int) -> None:
+        shift = change = 0.0
+        first_child = self._first_child[node]
+        for child in range(
+            first_child + self._child_count[node] - 1, first_child - 1, -1
+        ):
+            self._x[child] += shift
+            self._modifier[child] += shift
+            change += self._change[child]
+            shift += self._shift[child] + change
 
-        Args:
-            node from which the next node in the right contour will be taken
+    def _next_left(self, node: int) -> int:
+        r"""Return the next node in the left contour of the subtree rooted at node"""
+        if self._child_count[node]:
+            return self._first_child[node]
+        return self._thread[node]
 
-        Returns:
-            Next node in the right contour
-        """
-        children = self.nodes[node]["children"]
-        thread = self.nodes[node]["thread"]
-        if children:
-            return children[-1]
-        else:
-            return thread
+    def _next_right(self, node: int) -> int:
+        r"""Return the next node in the right contour of the subtree rooted at node"""
+        if self._child_count[node]:
+            return self._first_child[node] + self._child_count[node] - 1
+        return self._thread[node]
 
-    def _ancestor(self, node_1, node_2, default_ancestor):
+    def _find_ancestor(self, node_1: int, node_2: int, default_ancestor: int) -> int:
         r"""Get the left greatest uncommon ancestor between node_1 and node_2 if found,
         otherwise return the default ancestor
 
@@ -287,9 +373,11 @@ class StructureGraph(DiGraph):
         Returns:
             Greatest uncommon ancestor or default ancestor
         """
-        node_1_ancestor = self.nodes[node_1]["ancestor"]
-        node_2_parent = self.nodes[node_2]["parent"]
-        if node_1_ancestor and node_2_parent:
-            if node_1_ancestor in self.nodes[node_2_parent]["children"]:
-                return node_1_ancestor
+        node_1_ancestor = self._ancestor[node_1]
+        # The ancestor is returned if it is a sibling of node_2
+        if (
+            node_1_ancestor >= 0
+            and self._parent[node_1_ancestor] == self._parent[node_2]
+        ):
+            return node_1_ancestor
         return default_ancestor
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from depender import __version__
+
+__all__ = ["ParseCache"]
+
+# Bump this whenever the layout of the cached rows changes
+CACHE_FORMAT = 4
+
+
+class ParseCache:
+    r"""Persistent cache of the data, e.g. import records, extracted from python files.
+
+    Entries are keyed on the file's path, and on a string describing the options
+    used to extract the data from it, and are considered valid as long as
+    the file's modification time and size are unchanged. When those differ,
+    the content hash is compared before the entry is discarded, so that touched
+    but otherwise unchanged files are not parsed again.
+
+    The cache is stored in a single file per depender and python version
+    and is kept below max_size bytes by evicting the least recently used entries.
+
+    Args:
+        cache_dir: Directory in which the cache is stored
+        max_size: Maximum size in bytes of the stored entries
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = ".depender_cache",
+        max_size: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.cache_file = self.cache_dir / "imports-{}-py{}{}-v{}.json".format(
+            __version__, sys.version_info[0], sys.version_info[1], CACHE_FORMAT
+        )
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = self._load()
+        # Fingerprints of the files that were not found in the cache
+        # computed before they are parsed
+        self._pending: Dict[str, Tuple[int, int, str]] = dict()
+        self._modified = False
+
+    def __enter__(self) -> "ParseCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.save()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, filepath: Path, options: str = "") -> Optional[List]:
+        r"""Return the cached rows of the given file or None if they
+        are missing or outdated
+        """
+        key = self._key(filepath, options)
+        stat = os.stat(str(filepath))
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                return self._hit(key, entry)
+            digest = self._digest(filepath)
+            if entry["hash"] == digest:
+                entry["mtime"], entry["size"] = stat.st_mtime_ns, stat.st_size
+                self._modified = True
+                return self._hit(key, entry)
+        else:
+            digest = self._digest(filepath)
+        self.misses += 1
+        self._pending[key] = (stat.st_mtime_ns, stat.st_size, digest)
+        return None
+
+    def set(self, filepath: Path, rows: List, options: str = "") -> None:
+        r"""Store the given json serializable rows for the given file"""
+        key = self._key(filepath, options)
+        if key in self._pending:
+            mtime, size, digest = self._pending.pop(key)
+        else:
+            stat = os.stat(str(filepath))
+            mtime, size = stat.st_mtime_ns, stat.st_size
+            digest = self._digest(filepath)
+        self._entries[key] = {
+            "mtime": mtime,
+            "size": size,
+            "hash": digest,
+            "rows": rows,
+        }
+        self._entries.move_to_end(key)
+        self._modified = True
+
+    def save(self) -> None:
+        r"""Write the cache to disk after evicting the least recently used entries"""
+        if not self._modified:
+            return
+        sizes = [len(json.dumps(entry)) for entry in self._entries.values()]
+        total_size = sum(sizes)
+        for key, size in zip(list(self._entries), sizes):
+            if total_size <= self.max_size:
+                break
+            del self._entries[key]
+            total_size -= size
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temporary_file = self.cache_file.with_suffix(".tmp")
+        with temporary_file.open("w") as f:
+            json.dump(list(self._entries.items()), f)
+        os.replace(str(temporary_file), str(self.cache_file))
+        self._modified = False
+
+    def clear(self) -> None:
+        r"""Remove all entries, including the ones of other depender and python versions.
+
+        Only the cache files are removed, the directory itself is removed
+        if nothing else is left in it
+        """
+        self._entries.clear()
+        self._pending.clear()
+        self._modified = False
+        if not self.cache_dir.is_dir():
+            return
+        for pattern in ("imports-*.json", "imports-*.tmp"):
+            for cache_file in self.cache_dir.glob(pattern):
+                cache_file.unlink()
+        try:
+            self.cache_dir.rmdir()
+        except OSError:
+            # The directory holds other files
+            pass
+
+    def _load(self) -> OrderedDict:
+        try:
+            with self.cache_file.open("r") as f:
+                return OrderedDict(json.load(f))
+        except (OSError, ValueError):
+            return OrderedDict()
+
+    def _hit(self, key: str, entry: dict) -> List:
+        # The cache is not marked as modified, so that a run without changes
+        # does not write it again: the recency of the entries is only saved
+        # along with the next change
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry["rows"]
+
+    @staticmethod
+    def _key(filepath: Path, options: str) -> str:
+        return "{}:{}".format(options, os.path.abspath(str(filepath)))
+
+    @staticmethod
+    def _digest(filepath: Path) -> str:
+        with open(str(filepath), "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
@@ -1,15 +1,418 @@
 import ast
-import importlib
-import importlib.util
+import os
+import re
+import sys
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import List, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-from depender.graph.dependency import DependencyGraph
+from depender.graph.compact import CompactGraph
+from depender.graph.dependency import DependencyGraph, ImportedNode
+from depender.parse.cache import ParseCache
+from depender.parse.resolver import ImportResolver
+from depender.parse.utilities import FileIndex
+
+__all__ = ["CodeParser", "ImportRecord", "IMPORT_CONTEXTS", "extract_imports"]
+
+AnyDependencyGraph = Union[DependencyGraph, CompactGraph]
+
+
+class ImportRecord(NamedTuple):
+    r"""Raw, unresolved import found in a module's source code
+
+    Attributes:
+        kind: One of "import", "from" or "importlib"
+        module: Module part of a 'from ... import ...' statement or
+            the name passed to importlib.import_module
+        names: Imported names
+        level: Number of leading dots of a relative import
+        package: Package argument given to importlib.import_module
+        context: Context in which the import is executed, one of IMPORT_CONTEXTS
+        unused: Imported names that are never used in the module
+        duplicates: Imported names that are already imported by an import
+            executed when the module is imported
+    """
+
+    kind: str
+    module: Optional[str]
+    names: Tuple[str, ...]
+    level: int = 0
+    package: str = ""
+    context: str = "module"
+    unused: Tuple[str, ...] = ()
+    duplicates: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_row(cls, row: List) -> "ImportRecord":
+        r"""Create a record from its json representation"""
+        kind, module, names, level, package, context, unused, duplicates = row
+        return cls(
+            kind,
+            module,
+            tuple(names),
+            level,
+            package,
+            context,
+            tuple(unused),
+            tuple(duplicates),
+        )
+
+
+# Fields of the statements, exception handlers and match cases
+# that hold nested statements
+STATEMENT_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+# Contexts in which an import is executed, from the most to the least eager:
+# - module: when the module is imported, including class bodies
+# - fallback: in a handler catching ImportError, when another import failed
+# - function: when the function or method enclosing it is called
+# - type_checking: under an 'if TYPE_CHECKING:' guard, never at runtime
+# An import nested in several contexts gets the least eager one
+IMPORT_CONTEXTS = ("module", "fallback", "function", "type_checking")
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+# Nodes whose body can have another context than the node itself
+CONTEXT_NODES = frozenset(FUNCTION_NODES + (ast.If, ast.ExceptHandler))
+# Exceptions whose handlers catch a failed import
+IMPORT_ERRORS = ("ImportError", "ModuleNotFoundError", "Exception", "BaseException")
+# Node holding a string constant and the field holding its value,
+# before python 3.8 strings are parsed as ast.Str instead of ast.Constant
+if sys.version_info >= (3, 8):
+    STRING_NODE, STRING_FIELD = ast.Constant, "value"
+else:
+    STRING_NODE, STRING_FIELD = ast.Str, "s"
+
+
+def extract_imports(
+    filepath: Path, parse_importlib: bool = True, fast: bool = False
+) -> List[ImportRecord]:
+    r"""Parse the given file and return the imports it contains.
+
+    This function is kept at module level and has no side effects
+    so that it can be executed in worker processes.
+
+    Args:
+        filepath: Path to the python file
+        parse_importlib: If True, calls to importlib.import_module are also extracted
+        fast: If True, only the statements are visited instead of every node of
+            the syntax tree. The same imports are found but not in the same order
+
+    Returns:
+        List of import records, empty if the file is not valid python source code.
+        The imported names that are never used or that are imported again are
+        found in the same traversal, except for the unused names in fast mode
+        which does not visit the expressions that use them
+    """
+    with open(filepath, "rb") as f:
+        source = f.read()
+    try:
+        module_tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    if fast:
+        # Expressions only need to be visited if the source code
+        # can contain a call to import_module
+        parse_importlib = parse_importlib and b"import_module" in source
+        return _scan_statements(module_tree, parse_importlib)
+    return _walk_tree(module_tree, parse_importlib)
+
+
+def _walk_tree(module_tree: ast.AST, parse_importlib: bool) -> List[ImportRecord]:
+    records = list()
+    statements = list()
+    # Names read by the module and string constants, which can hold
+    # annotations or the names of __all__
+    used_names = set()
+    strings = list()
+    # Same traversal as _walk_with_context, inlined as it visits every node
+    queue: deque = deque([((module_tree,), "module")])
+    while queue:
+        nodes, context = queue.popleft()
+        for node in nodes:
+            node_type = type(node)
+            if node_type is ast.Name:
+                if type(node.ctx) is not ast.Store:
+                    used_names.add(node.id)
+                continue
+            elif node_type is STRING_NODE:
+                value = getattr(node, STRING_FIELD)
+                if type(value) is str:
+                    strings.append(value)
+                continue
+            elif node_type is ast.Import or node_type is ast.ImportFrom:
+                statements.append((len(records), node))
+                records.append(_extract_import_statement(node, context))
+            elif node_type is ast.Call and parse_importlib:
+                record = _extract_importlib_call(node, context)
+                if record is not None:
+                    records.append(record)
+            if node_type in CONTEXT_NODES:
+                queue.extend(_child_groups(node, context))
+            else:
+                queue.append((ast.iter_child_nodes(node), context))
+    return _mark_dead_imports(records, statements, used_names, strings)
+
+
+def _walk_with_context(node: ast.AST, context: str) -> Iterator[Tuple[ast.AST, str]]:
+    # Same breadth first traversal as ast.walk, yielding the context of each node.
+    # The queue holds the children of each visited node, which share their context
+    # unless the node is one of the CONTEXT_NODES
+    queue: deque = deque([((node,), context)])
+    while queue:
+        nodes, context = queue.popleft()
+        for node in nodes:
+            yield node, context
+            if type(node) in CONTEXT_NODES:
+                queue.extend(_child_groups(node, context))
+            else:
+                queue.append((ast.iter_child_nodes(node), context))
+
+
+def _child_groups(node: ast.AST, context: str) -> List[Tuple[List[ast.AST], str]]:
+    # Children of each field of a node, in the order of ast.iter_child_nodes,
+    # with their context
+    groups = list()
+    for field, value in ast.iter_fields(node):
+        if isinstance(value, list):
+            children = [child for child in value if isinstance(child, ast.AST)]
+        elif isinstance(value, ast.AST):
+            children = [value]
+        else:
+            continue
+        groups.append((children, _field_context(node, field, context)))
+    return groups
+
+
+def _scan_statements(module_tree: ast.AST, parse_importlib: bool) -> List[ImportRecord]:
+    records = list()
+    statements = list()
+    stack = [(module_tree, "module")]
+    while stack:
+        node, context = stack.pop()
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            statements.append((len(records), node))
+            records.append(_extract_import_statement(node, context))
+            continue
+        children = list()
+        for field, value in ast.iter_fields(node):
+            if field in STATEMENT_FIELDS and isinstance(value, list):
+                field_context = _field_context(node, field, context)
+                children.extend((child, field_context) for child in value)
+            elif parse_importlib:
+                # Look for calls in the statement's expressions
+                for expression in value if isinstance(value, list) else [value]:
+                    if not isinstance(expression, ast.AST):
+                        continue
+                    for call, call_context in _expression_calls(expression, context):
+                        record = _extract_importlib_call(call, call_context)
+                        if record is not None:
+                            records.append(record)
+        # Visit the nested statements in source order
+        stack.extend(reversed(children))
+    return _mark_dead_imports(records, statements)
+
+
+def _mark_dead_imports(
+    records: List[ImportRecord],
+    statements: List[Tuple[int, Union[ast.Import, ast.ImportFrom]]],
+    used_names: Optional[Set[str]] = None,
+    strings: Iterable[str] = (),
+) -> List[ImportRecord]:
+    # Fill in the unused and duplicates fields of the records of the given import
+    # statements. A name bound by an import is unused if it is neither read
+    # nor found in a string constant, unless used_names is None.
+    # An import is a duplicate of the first import of the same name, as the same
+    # binding, executed when the module is imported
+    bindings = list()
+    for index, node in sorted(
+        statements, key=lambda statement: (statement[1].lineno, statement[1].col_offset)
+    ):
+        if isinstance(node, ast.ImportFrom):
+            if node.module == "__future__":
+                continue
+            source = (node.level, node.module)
+        else:
+            source = None
+        for alias in node.names:
+            if alias.name == "*":
+                continue
+            if alias.asname is not None:
+                bound_name = alias.asname
+            elif source is None:
+                # import a.b binds a
+                bound_name = alias.name.partition(".")[0]
+            else:
+                bound_name = alias.name
+            bindings.append((index, alias.name, bound_name, (source, alias.name)))
+    unused_names: Set[str] = set()
+    if used_names is not None:
+        candidates = {
+            bound_name
+            for _, _, bound_name, _ in bindings
+            if bound_name not in used_names
+        }
+        if candidates:
+            # Words found in the strings, tokenized once for all the candidates
+            words = {word for string in strings for word in re.findall(r"\w+", string)}
+            unused_names = candidates - words
+    eager_imports: Dict[Tuple, int] = dict()
+    for index, _, bound_name, key in bindings:
+        if records[index].context == "module":
+            eager_imports.setdefault((bound_name, key), index)
+    unused: Dict[int, List[str]] = dict()
+    duplicates: Dict[int, List[str]] = dict()
+    for index, name, bound_name, key in bindings:
+        if bound_name in unused_names:
+            unused.setdefault(index, []).append(name)
+        if eager_imports.get((bound_name, key), index) != index:
+            duplicates.setdefault(index, []).append(name)
+    for index in unused.keys() | duplicates.keys():
+        records[index] = records[index]._replace(
+            unused=tuple(unused.get(index, ())),
+            duplicates=tuple(duplicates.get(index, ())),
+        )
+    return records
+
+
+def _expression_calls(expression: ast.AST, context: str) -> List[Tuple[ast.Call, str]]:
+    # Calls found in an expression with their context, which is the context
+    # of the expression unless they are in the body of a lambda
+    calls = list()
+    for node in ast.walk(expression):
+        if isinstance(node, ast.Call):
+            calls.append((node, context))
+        elif isinstance(node, ast.Lambda):
+            return [
+                (node, node_context)
+                for node, node_context in _walk_with_context(expression, context)
+                if isinstance(node, ast.Call)
+            ]
+    return calls
+
+
+def _field_context(node: ast.AST, field: str, context: str) -> str:
+    # Context of the nodes held by the given field of a node
+    if field != "body":
+        return context
+    if isinstance(node, FUNCTION_NODES):
+        field_context = "function"
+    elif isinstance(node, ast.If) and _is_type_checking(node.test):
+        field_context = "type_checking"
+    elif isinstance(node, ast.ExceptHandler) and _catches_import_error(node.type):
+        field_context = "fallback"
+    else:
+        return context
+    return max(context, field_context, key=IMPORT_CONTEXTS.index)
+
+
+def _is_type_checking(test: ast.expr) -> bool:
+    # Matches both 'if TYPE_CHECKING:' and 'if typing.TYPE_CHECKING:'
+    if isinstance(test, ast.Name):
+        return test.id == "TYPE_CHECKING"
+    return isinstance(test, ast.Attribute) and test.attr == "TYPE_CHECKING"
+
+
+def _catches_import_error(exception_type: Optional[ast.expr]) -> bool:
+    if exception_type is None:
+        # Bare except
+        return True
+    if isinstance(exception_type, ast.Tuple):
+        return any(_catches_import_error(element) for element in exception_type.elts)
+    if isinstance(exception_type, ast.Attribute):
+        return exception_type.attr in IMPORT_ERRORS
+    return isinstance(exception_type, ast.Name) and exception_type.id in IMPORT_ERRORS
+
+
+def _extract_import_statement(
+    node: Union[ast.Import, ast.ImportFrom], context: str
+) -> ImportRecord:
+    if isinstance(node, ast.Import):
+        return ImportRecord(
+            kind="import",
+            module=None,
+            names=_alias_names(node.names),
+            context=context,
+        )
+    return ImportRecord(
+        kind="from",
+        module=node.module,
+        names=_alias_names(node.names),
+        level=node.level or 0,
+        context=context,
+    )
+
+
+def _alias_names(aliases: List[ast.alias]) -> Tuple[str, ...]:
+    return tuple(alias.name for alias in aliases)
+
+
+def _extract_importlib_call(node: ast.Call, context: str) -> Optional[ImportRecord]:
+    if isinstance(node.func, ast.Name):
+        is_import_module = node.func.id == "import_module"
+    elif isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name):
+        is_import_module = (
+            node.func.value.id == "importlib" and node.func.attr == "import_module"
+        )
+    else:
+        is_import_module = False
+    if not is_import_module or not node.args:
+        return None
+    try:
+        imported_name = str(ast.literal_eval(node.args[0]))
+    except ValueError:
+        return None
+    # The package is either the second positional argument or the 'package' keyword
+    package_node = node.args[1] if len(node.args) > 1 else None
+    for keyword in node.keywords:
+        if keyword.arg == "package":
+            package_node = keyword.value
+    package = ""
+    if package_node is not None:
+        try:
+            package = str(ast.literal_eval(package_node))
+        except ValueError:
+            pass
+    return ImportRecord(
+        kind="importlib",
+        module=imported_name,
+        names=(),
+        package=package,
+        context=context,
+    )
 
 
 class CodeParser:
-    def __init__(self) -> None:
-        self.graph = DependencyGraph()
+    r"""Parse the imports of python packages and build their dependency graph
+
+    Args:
+        graph: Graph to which the modules and their imports are added,
+            e.g. a CompactGraph for very large projects.
+            If not given, a new DependencyGraph is created
+        eager_only: If True, only the imports executed when the modules
+            are imported, whose context is 'module', are added to the graph
+    """
+
+    def __init__(
+        self, graph: Optional[AnyDependencyGraph] = None, eager_only: bool = False
+    ) -> None:
+        self.graph = DependencyGraph() if graph is None else graph
+        self.eager_only = eager_only
+        # Names of the parsed packages, whose imports are never external
+        self.packages: Set[str] = set()
+        self.resolver = ImportResolver(self.packages)
 
     def parse_project(
         self,
@@ -19,191 +422,333 @@ class CodeParser:
         include_external: bool = True,
         parse_importlib: bool = True,
         follow_links: bool = True,
-    ) -> DependencyGraph:
-        if isinstance(package_path, str):
-            package_path = Path(package_path).resolve()
-        # Convert the excluded dirs to Path instances
-        excluded_directories = list(
-            map(lambda x: package_path.joinpath(x).resolve(), excluded_directories)
-        )
+        jobs: int = 1,
+        cache: Optional[ParseCache] = None,
+        fast_scan: bool = False,
+        depth: int = -1,
+        file_index: Optional[FileIndex] = None,
+    ) -> AnyDependencyGraph:
+        r"""Parse all modules of the given package and build its dependency graph
 
-        package_name = package_path.stem
+        Args:
+            package_path: Path to the package's root directory or to a single module
+            is_module: Whether package_path points to a single module
+            excluded_directories: Directories, relative to the package, to skip
+            include_external: If True, external packages are added to the graph
+            parse_importlib: If True, calls to importlib.import_module are parsed
+            follow_links: If True, symbolic links to directories are followed
+            jobs: Number of worker processes used to parse the modules.
+                A value of 1 parses them in the current process and
+                a value smaller than 1 uses all available cores
+            cache: If given, only the files that changed since they were
+                stored in the cache are parsed
+            fast_scan: If True, only the statements of each module are visited
+                when looking for imports instead of all the nodes of its syntax tree
+            depth: Depth of the directory recursion, a negative value means no limit
+            file_index: Index of the package's files shared with other parsers.
+                If given, the package is not traversed again and excluded_directories,
+                follow_links and depth are ignored
 
-        if is_module:
-            file_list = [(package_path, package_name)]
-        else:
-            # Traverse the whole directory, up to the given depth, to find all python modules and files
-            file_list = self.find_all_package_modules(
-                package_path, excluded_directories, self.graph
-            )
-        # Finally traverse only the files that were found
-        for filepath, module_dot_path in file_list:
-            self.parse_file(
-                filepath,
-                module_dot_path,
-                package_name,
-                include_external,
-                parse_importlib,
-            )
-        return self.graph
+        Returns:
+            The dependency graph of the package
+        """
+        package_path = Path(package_path).resolve()
+        return self.parse_projects(
+            [package_path],
+            excluded_directories,
+            include_external=include_external,
+            parse_importlib=parse_importlib,
+            follow_links=follow_links,
+            jobs=jobs,
+            cache=cache,
+            fast_scan=fast_scan,
+            depth=depth,
+            file_indices=None if file_index is None else {package_path: file_index},
+            modules=[package_path] if is_module else [],
+        )
 
-    def find_all_package_modules(
+    def parse_projects(
         self,
-        package_path: Path,
-        excluded_directories: List[Path],
-        graph: DependencyGraph,
-    ):
+        package_paths: List[Union[str, Path]],
+        excluded_directories: List[Union[str, Path]],
+        include_external: bool = True,
+        parse_importlib: bool = True,
+        follow_links: bool = True,
+        jobs: int = 1,
+        cache: Optional[ParseCache] = None,
+        fast_scan: bool = False,
+        depth: int = -1,
+        file_indices: Optional[Dict[Path, FileIndex]] = None,
+        modules: Optional[List[Path]] = None,
+    ) -> AnyDependencyGraph:
+        r"""Parse all modules of the given packages and build a single dependency graph
+
+        The modules of all packages are discovered before any import is resolved,
+        so that an import of another package's module becomes an edge between
+        the two modules instead of an edge to an external package.
+        Each module node has a 'package' attribute holding the name of its package.
+
+        Args:
+            package_paths: Paths to the packages' root directories or to single modules
+            excluded_directories: Directories, relative to each package, to skip
+            file_indices: Indices of the packages' files, keyed on the packages' resolved
+                paths, shared with other parsers
+            modules: Resolved paths, among package_paths, that point to single modules.
+                If not given, the paths that point to files are treated as modules
+
+            See parse_project for the other arguments
+
+        Returns:
+            The dependency graph of all the packages
+        """
+        file_indices = file_indices or dict()
         file_list = list()
-        for file in package_path.rglob("*.py"):
-            # Skip  __init__.py files
-            if "__init__.py" in file.name:
-                continue
-            relative_path = file.relative_to(package_path.parent).with_suffix("")
-            module_dot_path = ".".join(relative_path.parts)
-            file_list.append((file, module_dot_path))
-            graph.add_node(module_dot_path, label=module_dot_path)
+        for package_path in map(lambda x: Path(x).resolve(), package_paths):
+            package_name = package_path.stem
+            if modules is None:
+                is_module = package_path.is_file()
+            else:
+                is_module = package_path in modules
+            if is_module:
+                package_modules = [(package_path, package_name)]
+                self.add_module(package_name, package_name)
+            else:
+                file_index = file_indices.get(package_path)
+                if file_index is None:
+                    # Traverse the whole directory, up to the given depth,
+                    # to find all python modules and files
+                    file_index = FileIndex(
+                        package_path,
+                        excluded_directories,
+                        depth=depth,
+                        followlinks=follow_links,
+                    )
+                package_modules = self.find_all_package_modules(file_index)
+            for filepath, module_dot_path in package_modules:
+                file_list.append((filepath, module_dot_path))
+            self.packages.add(package_name)
+        # Finally traverse only the files that were found,
+        # with a single pool of workers for all the packages
+        filepaths = [filepath for filepath, _ in file_list]
+        for (_, module_dot_path), records in zip(
+            file_list,
+            self.extract_all_imports(
+                filepaths, parse_importlib, jobs, cache, fast_scan
+            ),
+        ):
+            self.add_import_records(records, module_dot_path, include_external)
+        return self.graph
+
+    def find_all_package_modules(self, file_index: FileIndex) -> List[Tuple[Path, str]]:
+        file_list = file_index.python_modules()
+        package_name = file_index.directory.name
+        for _, module_dot_path in file_list:
+            self.add_module(module_dot_path, package_name)
         return file_list
 
+    @classmethod
+    def extract_all_imports(
+        cls,
+        filepaths: List[Path],
+        parse_importlib: bool,
+        jobs: int = 1,
+        cache: Optional[ParseCache] = None,
+        fast: bool = False,
+    ) -> Iterable[List[ImportRecord]]:
+        r"""Extract the import records of all the given files.
+
+        The records are yielded in the same order as the given files,
+        whether they were extracted serially, by a pool of worker processes
+        or retrieved from the cache.
+        """
+        if cache is None:
+            yield from cls._extract_all_imports(filepaths, parse_importlib, jobs, fast)
+            return
+        options = ",".join(
+            option
+            for option, enabled in (("importlib", parse_importlib), ("fast", fast))
+            if enabled
+        )
+        all_records: List[Optional[List[ImportRecord]]] = list()
+        missing_filepaths = list()
+        for filepath in filepaths:
+            rows = cache.get(filepath, options)
+            if rows is None:
+                missing_filepaths.append(filepath)
+                all_records.append(None)
+            else:
+                all_records.append([ImportRecord.from_row(row) for row in rows])
+        missing_records = list(
+            cls._extract_all_imports(missing_filepaths, parse_importlib, jobs, fast)
+        )
+        for filepath, records in zip(missing_filepaths, missing_records):
+            cache.set(filepath, [list(record) for record in records], options)
+        missing_records_iter = iter(missing_records)
+        for records in all_records:
+            if records is None:
+                records = next(missing_records_iter)
+            yield records
+
+    @staticmethod
+    def _extract_all_imports(
+        filepaths: List[Path], parse_importlib: bool, jobs: int = 1, fast: bool = False
+    ) -> Iterable[List[ImportRecord]]:
+        if jobs < 1:
+            jobs = os.cpu_count() or 1
+        jobs = min(jobs, len(filepaths))
+        if jobs <= 1:
+            for filepath in filepaths:
+                yield extract_imports(filepath, parse_importlib, fast)
+            return
+        # Send the files to the workers in batches to amortize the communication cost
+        chunksize = max(1, len(filepaths) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from executor.map(
+                extract_imports,
+                filepaths,
+                repeat(parse_importlib),
+                repeat(fast),
+                chunksize=chunksize,
+            )
+
     def parse_file(
         self,
         filepath: Path,
         module_dot_path: str,
-        package_name: str,
         include_external: bool,
         parse_importlib: bool,
+        fast_scan: bool = False,
     ) -> None:
-        with filepath.open("r") as f:
-            module_tree = ast.parse(f.read())
-            for node in ast.walk(module_tree):
-                if isinstance(node, ast.Import):
-                    self.parse_first_form_import(
-                        import_node=node,
-                        importing_module=module_dot_path,
-                        package_name=package_name,
-                        include_external=include_external,
-                    )
+        records = extract_imports(filepath, parse_importlib, fast_scan)
+        self.add_import_records(records, module_dot_path, include_external)
 
-                elif isinstance(node, ast.ImportFrom):
-                    # In case the import is of the form: from . import foo
-                    # Then the module attribute is set to None and so we treat the import
-                    # as an import of the first form
-                    if node.module is None:
-                        self.parse_first_form_import(
-                            import_node=node,
-                            importing_module=module_dot_path,
-                            package_name=package_name,
-                            include_external=include_external,
-                        )
-                    else:
-                        self.parse_second_form_import(
-                            import_node=node,
-                            importing_module=module_dot_path,
-                            package_name=package_name,
-                            include_external=include_external,
-                        )
-
-                elif isinstance(node, ast.Call) and parse_importlib:
-                    if (
-                        isinstance(node.func, ast.Name)
-                        and node.func.id == "import_module"
-                    ):
-                        try:
-                            import_node = str(ast.literal_eval(node.args[0]))
-                            package = ""
-                            if node.keywords and node.keywords[0].arg:
-                                package = node.keywords[0].arg
-                            self.parse_importlib_import(
-                                import_node=import_node,
-                                package=package,
-                                importing_module=module_dot_path,
-                                include_external=include_external,
-                            )
-                        except ValueError:
-                            pass
-                    elif isinstance(node.func, ast.Attribute) and isinstance(
-                        node.func.value, ast.Name
-                    ):
-                        if (
-                            node.func.value.id == "importlib"
-                            and node.func.attr == "import_module"
-                        ):
-                            try:
-                                import_node = str(ast.literal_eval(node.args[0]))
-                                package = ""
-                                if node.keywords and node.keywords[0].arg:
-                                    package = node.keywords[0].arg
-                                self.parse_importlib_import(
-                                    import_node=import_node,
-                                    package=package,
-                                    importing_module=module_dot_path,
-                                    include_external=include_external,
-                                )
-                            except ValueError:
-                                pass
-
-    def parse_first_form_import(
-        self,
-        import_node: Union[ast.Import, ast.ImportFrom],
-        package_name: str,
-        importing_module: str,
-        include_external: bool,
-    ) -> None:
-        for alias in import_node.names:
-            imported_module = importlib.util.resolve_name(alias.name, package_name)
+    def add_module(self, module_dot_path: str, package_name: str) -> None:
+        r"""Add a module of one of the parsed packages to the graph and to the resolver"""
+        self.graph.add_node(
+            module_dot_path, label=module_dot_path, package=package_name
+        )
+        self.resolver.add_module(module_dot_path)
 
-            # Check if the imported module is in the list of this package's modules
-            if self.graph.has_node(imported_module):
-                self.graph.add_node(imported_module, label=imported_module)
-                self.graph.add_edge(importing_module, imported_module)
+    def remove_module(self, module_dot_path: str) -> bool:
+        r"""Remove a module of one of the parsed packages from the graph
+        and from the resolver, see DependencyGraph.remove_module
 
-            # Else the module is external to this project and we check the include_external flag
-            elif include_external is True:
-                package = imported_module.split(".")[0]
-                self.graph.add_node(package, label=package + " external")
-                self.graph.add_edge(importing_module, package)
+        Returns:
+            True if the module was in the graph, False otherwise
+        """
+        self.resolver.remove_module(module_dot_path)
+        return self.graph.remove_module(module_dot_path)
 
-    def parse_second_form_import(
+    def add_import_records(
         self,
-        import_node: ast.ImportFrom,
-        package_name: str,
-        importing_module: str,
+        records: Sequence[ImportRecord],
+        module_dot_path: str,
         include_external: bool,
     ) -> None:
-        imported_from_module = importlib.util.resolve_name(
-            import_node.module, package_name
-        )  # type: ignore
-
-        # Check if the first part of the from ... import ... is a module
-        if self.graph.has_node(imported_from_module):
-            self.graph.add_node(imported_from_module, label=imported_from_module)
-            self.graph.add_edge(importing_module, imported_from_module)
-        else:
-            for imported_module in import_node.names:
-                module_dot_path = ".".join([imported_from_module, imported_module.name])
-                if self.graph.has_node(module_dot_path):
-                    self.graph.add_node(module_dot_path, label=module_dot_path)
-                    self.graph.add_edge(importing_module, module_dot_path)
-            if include_external:
-                package = imported_from_module.split(".")[0]
-                self.graph.add_node(package, label=package)
-                self.graph.add_edge(importing_module, package)
-
-    def parse_importlib_import(
+        r"""Resolve the given import records and add the corresponding edges to the graph.
+        Each edge's count is the number of imports of the node found in the module
+        and its other attributes are the ones returned by resolve_import_edges
+        """
+        imported_nodes, edge_attributes = self.resolve_import_edges(
+            records, module_dot_path, include_external
+        )
+        counts: Counter = Counter()
+        for imported_node, attributes in imported_nodes:
+            self.graph.add_node(imported_node, **attributes)
+            counts[imported_node] += 1
+        for imported_node, count in counts.items():
+            self.graph.add_edge(
+                module_dot_path,
+                imported_node,
+                count=count,
+                **edge_attributes[imported_node]
+            )
+
+    def resolve_import_records(
         self,
-        import_node: str,
-        package: str,
-        importing_module: str,
+        records: Iterable[ImportRecord],
+        module_dot_path: str,
         include_external: bool,
-    ) -> None:
-        imported_module = importlib.util.resolve_name(import_node, package)
-
-        # Check if the imported module is in the list of this package's modules
-        if self.graph.has_node(imported_module):
-            self.graph.add_node(imported_module, label=imported_module)
-            self.graph.add_edge(importing_module, imported_module)
-
-        # Else the module is external to this project and we check the include_external flag
-        elif include_external is True:
-            package = imported_module.split(".")[0]
-            self.graph.add_node(package, label=package + " external")
-            self.graph.add_edge(importing_module, package)
+    ) -> List[ImportedNode]:
+        r"""Resolve the import records found in the given module
+        against the modules of the parsed packages
+
+        Returns:
+            The imported nodes, with their attributes, once per import
+        """
+        return list(
+            self.resolver.resolve_all(
+                self._filter_records(records), module_dot_path, include_external
+            )
+        )
+
+    def resolve_import_edges(
+        self,
+        records: Sequence[ImportRecord],
+        module_dot_path: str,
+        include_external: bool,
+    ) -> Tuple[List[ImportedNode], Dict[str, Dict[str, Any]]]:
+        r"""Resolve the import records found in the given module
+        and find the attributes of the edge to each imported node
+
+        Returns:
+            The imported nodes, with their attributes, once per import,
+            and the attributes of the edge to each imported node:
+            - context: The most eager context in which the node is imported
+            - dead: True if the node is only imported for names that are never
+              used, so that the edge can be removed, missing otherwise
+            - duplicates: Number of imports of the node for names that are
+              already imported when the module is imported, missing if there is none
+        """
+        imported_nodes: List[ImportedNode] = list()
+        edge_attributes: Dict[str, Dict[str, Any]] = dict()
+        live_nodes: Set[str] = set()
+        unused_nodes: Set[str] = set()
+        duplicates: Counter = Counter()
+        for record in self._filter_records(records):
+            record_nodes = self.resolver.resolve(
+                record, module_dot_path, include_external
+            )
+            imported_nodes += record_nodes
+            for imported_node, _ in record_nodes:
+                attributes = edge_attributes.setdefault(
+                    imported_node, {"context": record.context}
+                )
+                attributes["context"] = min(
+                    attributes["context"], record.context, key=IMPORT_CONTEXTS.index
+                )
+            if not (record.unused or record.duplicates):
+                live_nodes.update(node for node, _ in record_nodes)
+                continue
+            # Resolve the names one by one to tell their nodes apart
+            for name in record.names:
+                name_nodes = [
+                    node
+                    for node, _ in self.resolver.resolve(
+                        record._replace(names=(name,), unused=(), duplicates=()),
+                        module_dot_path,
+                        include_external,
+                    )
+                ]
+                if name in record.unused:
+                    unused_nodes.update(name_nodes)
+                    continue
+                live_nodes.update(name_nodes)
+                if name in record.duplicates:
+                    duplicates.update(name_nodes)
+        for node in unused_nodes - live_nodes:
+            edge_attributes[node]["dead"] = True
+        for node, count in duplicates.items():
+            edge_attributes[node]["duplicates"] = count
+        return imported_nodes, edge_attributes
+
+    def _filter_records(
+        self, records: Iterable[ImportRecord]
+    ) -> Iterable[ImportRecord]:
+        if not self.eager_only:
+            return records
+        return [record for record in records if record.context == "module"]
+
+    def is_parsed(self, module_dot_path: str) -> bool:
+        r"""Check whether the given module belongs to one of the parsed packages"""
+        return self.resolver.is_parsed(module_dot_path)
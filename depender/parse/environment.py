@@ -0,0 +1,208 @@
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from depender.graph.dependency import DependencyGraph
+from depender.parse.cache import ParseCache
+from depender.parse.code import IMPORT_CONTEXTS, CodeParser, ImportRecord
+
+try:
+    from importlib import metadata
+except ImportError:  # Python < 3.8
+    import importlib_metadata as metadata  # type: ignore
+
+__all__ = ["EnvironmentParser"]
+
+
+class EnvironmentParser:
+    r"""Build the dependency graph of the distributions installed in an environment.
+
+    The graph has a single node per distribution and an edge from a distribution
+    to each distribution whose top-level modules it imports, with a count
+    holding the number of such imports. The top-level modules of each distribution
+    are found through the files listed in its metadata, the same way as
+    importlib.metadata.packages_distributions, so that the installed sources
+    never have to be searched for.
+
+    The source files are parsed in batches and their import records are
+    aggregated into distribution edges as soon as a batch is parsed,
+    so that the memory used does not grow with the size of the environment.
+
+    Args:
+        batch_size: Number of source files parsed in each batch
+    """
+
+    def __init__(self, batch_size: int = 2000) -> None:
+        self.graph = DependencyGraph()
+        self.batch_size = batch_size
+        # Top-level modules, or top-level and sub-modules for namespace packages
+        # shared by several distributions, mapped to the distribution providing them
+        self.module_owners: Dict[str, str] = dict()
+
+    def parse_environment(
+        self,
+        paths: Optional[List[str]] = None,
+        include_external: bool = True,
+        parse_importlib: bool = True,
+        jobs: int = 1,
+        cache: Optional[ParseCache] = None,
+        fast_scan: bool = False,
+        eager_only: bool = False,
+    ) -> DependencyGraph:
+        r"""Parse the sources of all distributions installed in the given paths
+
+        Args:
+            paths: Directories, such as site-packages, in which distributions are
+                looked for. If not given, the current interpreter's sys.path is used
+            include_external: If True, imported top-level modules that are
+                not provided by any distribution, e.g. the standard library,
+                are added to the graph
+            parse_importlib: If True, calls to importlib.import_module are parsed
+            jobs: Number of worker processes used to parse the modules.
+                A value of 1 parses them in the current process and
+                a value smaller than 1 uses all available cores
+            cache: If given, only the files that changed since they were
+                stored in the cache are parsed
+            fast_scan: If True, only the statements of each module are visited
+                when looking for imports instead of all the nodes of its syntax tree
+            eager_only: If True, only the imports executed when the modules
+                are imported, whose context is 'module', are added to the graph
+
+        Returns:
+            The dependency graph of the distributions
+        """
+        file_list = self.find_distribution_sources(paths)
+        counts: Counter = Counter()
+        # Most eager context of the imports between two distributions
+        contexts: Dict[Tuple[str, str], str] = dict()
+        for start in range(0, len(file_list), self.batch_size):
+            end = start + self.batch_size
+            batch = file_list[start:end]
+            for (_, distribution), records in zip(
+                batch,
+                CodeParser.extract_all_imports(
+                    [filepath for filepath, _ in batch],
+                    parse_importlib,
+                    jobs,
+                    cache,
+                    fast_scan,
+                ),
+            ):
+                for record in records:
+                    if eager_only and record.context != "module":
+                        continue
+                    for imported_modules in self.imported_modules([record]):
+                        owner = self._find_imported_owner(
+                            imported_modules, include_external
+                        )
+                        if owner is not None and owner != distribution:
+                            counts[distribution, owner] += 1
+                            contexts[distribution, owner] = min(
+                                contexts.get((distribution, owner), record.context),
+                                record.context,
+                                key=IMPORT_CONTEXTS.index,
+                            )
+        for (distribution, owner), count in counts.items():
+            self.graph.add_edge(
+                distribution,
+                owner,
+                count=count,
+                context=contexts[distribution, owner],
+            )
+        return self.graph
+
+    def find_distribution_sources(
+        self, paths: Optional[List[str]] = None
+    ) -> List[Tuple[Path, str]]:
+        r"""Add a node for each installed distribution and find their source files
+
+        Distributions installed several times in the given paths are only
+        considered once, the first one found taking precedence as on sys.path,
+        and the nodes are added in the order of the distributions' names.
+
+        Returns:
+            The path of each python source file and the name of its distribution
+        """
+        file_list = list()
+        providers: Dict[str, Set[str]] = dict()
+        sub_modules: Dict[Tuple[str, str], str] = dict()
+        distributions = dict()
+        for distribution in metadata.distributions(path=paths or sys.path):
+            name = distribution.metadata["Name"]
+            if name and name not in distributions:
+                distributions[name] = distribution
+        # Sort the distributions so that the graph does not depend
+        # on the order in which the directories are listed
+        for name, distribution in sorted(
+            distributions.items(), key=lambda item: item[0].lower()
+        ):
+            self.graph.add_node(name, label=name)
+            for file in distribution.files or []:
+                parts = file.parts
+                if (
+                    file.suffix != ".py"
+                    or ".." in parts
+                    or parts[0].endswith((".dist-info", ".egg-info"))
+                    or "__pycache__" in parts
+                ):
+                    continue
+                module_parts = parts[:-1] + (parts[-1][:-3],)
+                providers.setdefault(module_parts[0], set()).add(name)
+                if len(module_parts) > 1:
+                    sub_modules[module_parts[0], module_parts[1]] = name
+                filepath = Path(str(distribution.locate_file(file)))
+                # The metadata can list files that were removed since
+                if filepath.is_file():
+                    file_list.append((filepath, name))
+        for top_level, names in providers.items():
+            if len(names) == 1:
+                self.module_owners[top_level] = next(iter(names))
+        for (top_level, sub_module), name in sub_modules.items():
+            if len(providers[top_level]) > 1:
+                self.module_owners[top_level + "." + sub_module] = name
+        return file_list
+
+    def find_owner(self, module_dot_path: str) -> Optional[str]:
+        r"""Return the name of the distribution providing the given module, if any"""
+        parts = module_dot_path.split(".", 2)
+        owner = self.module_owners.get(parts[0])
+        if owner is None and len(parts) > 1:
+            owner = self.module_owners.get(parts[0] + "." + parts[1])
+        return owner
+
+    def _find_imported_owner(
+        self, imported_modules: Tuple[str, ...], include_external: bool
+    ) -> Optional[str]:
+        # Distribution providing the imported module, or its top-level package
+        # if it is external, added to the graph if needed
+        for candidate in imported_modules:
+            owner = self.find_owner(candidate)
+            if owner is not None:
+                return owner
+        if not include_external:
+            return None
+        owner = imported_modules[0].split(".")[0]
+        if owner not in self.graph:
+            self.graph.add_node(owner, label=owner + " external", external=True)
+        return owner
+
+    @staticmethod
+    def imported_modules(records: Iterable[ImportRecord]) -> Iterable[Tuple[str, ...]]:
+        r"""Yield the absolute names of the modules possibly imported by each import.
+        The names of a 'from ... import ...' statement are also given because
+        they can be sub-modules of a namespace package shared by several distributions.
+        Relative imports never leave their distribution and are skipped
+        """
+        for record in records:
+            if record.kind == "import":
+                for name in record.names:
+                    yield (name,)
+            elif record.kind == "from":
+                if record.level == 0 and record.module:
+                    yield (record.module,) + tuple(
+                        record.module + "." + name for name in record.names
+                    )
+            elif record.kind == "importlib":
+                if record.module and not record.module.startswith("."):
+                    yield (record.module,)
@@ -0,0 +1,211 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+from depender.graph.dependency import DependencyGraph
+
+__all__ = ["ImportTimeParser", "ImportTiming"]
+
+
+class ImportTiming(NamedTuple):
+    r"""Time taken to import a module, as reported by python -X importtime
+
+    Attributes:
+        module: Dotted name of the imported module
+        self_time: Time spent executing the module itself, in microseconds
+        cumulative_time: Time spent importing the module and the modules
+            it imported for the first time, in microseconds
+        parent: Module whose import triggered the import of this module,
+            None for the modules imported directly
+    """
+
+    module: str
+    self_time: int
+    cumulative_time: int
+    parent: Optional[str] = None
+
+
+class ImportTimeParser:
+    r"""Measure the import time of modules by importing them in a subprocess
+    started with python -X importtime, and attach the timings to dependency graphs.
+
+    Only the modules imported for the first time are reported by the interpreter,
+    so each module is timed once, as part of the first import chain reaching it.
+
+    Args:
+        python: Interpreter used to import the modules, by default the current one
+        repeat: Number of subprocesses started, the smallest timing of each module
+            is kept, so that the first run also compiles the modules' bytecode
+            without it being measured
+    """
+
+    def __init__(self, python: Optional[str] = None, repeat: int = 3) -> None:
+        self.python = python or sys.executable
+        self.repeat = max(repeat, 1)
+
+    def measure(
+        self, modules: Iterable[str], paths: Iterable[Union[str, Path]] = ()
+    ) -> Dict[str, ImportTiming]:
+        r"""Import the given modules in a subprocess and return their timings
+        and the timings of all the modules they import
+
+        Args:
+            modules: Dotted names of the modules to import, in this order
+            paths: Directories prepended to the subprocess's PYTHONPATH,
+                e.g. the parent directory of a package that is not installed
+
+        Returns:
+            The timing of each module imported by the given modules,
+            in the order in which their import completed
+
+        Raises:
+            RuntimeError: If the modules could not be imported or if the interpreter
+                does not report import times, which requires python 3.7 or later
+        """
+        modules = list(modules)
+        env = dict(os.environ)
+        python_path = [str(path) for path in paths]
+        if env.get("PYTHONPATH"):
+            python_path.append(env["PYTHONPATH"])
+        env["PYTHONPATH"] = os.pathsep.join(python_path)
+        command = [
+            self.python,
+            "-X",
+            "importtime",
+            "-c",
+            "; ".join(f"import {module}" for module in modules),
+        ]
+        timings: Dict[str, ImportTiming] = dict()
+        for _ in range(self.repeat):
+            process = subprocess.run(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                env=env,
+                universal_newlines=True,
+            )
+            run_timings = self.parse_output(process.stderr)
+            if process.returncode != 0:
+                errors = [
+                    line
+                    for line in process.stderr.splitlines()
+                    if not line.startswith("import time:")
+                ]
+                raise RuntimeError(
+                    "Could not import {}:\n{}".format(
+                        ", ".join(modules), "\n".join(errors[-10:])
+                    )
+                )
+            if "import time:" not in process.stderr:
+                # Older interpreters silently ignore the option
+                raise RuntimeError(
+                    f"{self.python} did not report any import time,"
+                    " python -X importtime requires python 3.7 or later"
+                )
+            for module, timing in run_timings.items():
+                if module not in timings or (
+                    timing.cumulative_time < timings[module].cumulative_time
+                ):
+                    timings[module] = timing
+        # Leave out the modules imported by the interpreter at startup,
+        # which are not imported through the requested modules
+        roots = {
+            module.rsplit(".", level)[0]
+            for module in modules
+            for level in range(module.count(".") + 1)
+        }
+        return {
+            module: timing
+            for module, timing in timings.items()
+            if self._root(timings, module) in roots
+        }
+
+    @staticmethod
+    def _root(timings: Dict[str, ImportTiming], module: str) -> str:
+        # Module imported directly whose import triggered the given module's one
+        while timings[module].parent is not None:
+            module = timings[module].parent
+        return module
+
+    @staticmethod
+    def parse_output(output: str) -> Dict[str, ImportTiming]:
+        r"""Parse the lines written to stderr by python -X importtime
+
+        Each line holds the self and cumulative times of a module followed by its name,
+        indented by two spaces per level of nesting. A module is reported once all
+        the modules it imports are, so that the modules reported before it
+        one level deeper were imported by it.
+
+        Returns:
+            The timing of each module, in the order of the output
+        """
+        timings: Dict[str, ImportTiming] = dict()
+        # Modules reported at each level whose parent is not reported yet
+        pending: Dict[int, List[str]] = dict()
+        for line in output.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            fields = line.partition(":")[2].split("|")
+            if len(fields) != 3 or not fields[0].strip().isdigit():
+                # Header line
+                continue
+            name = fields[2][1:]
+            module = name.lstrip(" ")
+            level = (len(name) - len(module)) // 2
+            for child in pending.pop(level + 1, []):
+                timings[child] = timings[child]._replace(parent=module)
+            timings[module] = ImportTiming(
+                module, int(fields[0]), int(fields[1]), parent=None
+            )
+            pending.setdefault(level, []).append(module)
+        return timings
+
+    @staticmethod
+    def annotate(graph: DependencyGraph, timings: Dict[str, ImportTiming]) -> None:
+        r"""Store the import times, in microseconds, in the 'self_time'
+        and 'cumulative_time' attributes of the graph's nodes.
+
+        The nodes of the parsed modules get the timings of these modules.
+        The external nodes, which stand for whole top-level packages, get
+        the cumulative time of the top-level package and the sum of the self times
+        of all its modules. Nodes whose module was not imported are left unchanged
+        """
+        self_times: Dict[str, int] = dict()
+        for module, timing in timings.items():
+            top_level = module.split(".", 1)[0]
+            self_times[top_level] = self_times.get(top_level, 0) + timing.self_time
+        for node, attributes in graph.nodes.items():
+            timing = timings.get(node)
+            if timing is None:
+                continue
+            if attributes.get("external", False):
+                attributes["self_time"] = self_times[node]
+            else:
+                attributes["self_time"] = timing.self_time
+            attributes["cumulative_time"] = timing.cumulative_time
+
+    @staticmethod
+    def expensive_chains(
+        timings: Dict[str, ImportTiming], count: int = 5
+    ) -> List[List[ImportTiming]]:
+        r"""Return the import chains leading to the modules with the largest self time
+
+        Args:
+            timings: Timings returned by measure
+            count: Number of chains
+
+        Returns:
+            For each of the count most expensive modules, the timings of the modules
+            from the one imported directly down to it, each module importing the next
+        """
+        chains = list()
+        for timing in sorted(
+            timings.values(), key=lambda timing: timing.self_time, reverse=True
+        )[:count]:
+            chain = [timing]
+            while chain[-1].parent is not None:
+                chain.append(timings[chain[-1].parent])
+            chains.append(chain[::-1])
+        return chains
@@ -0,0 +1,273 @@
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+from depender.graph.dependency import ImportedNode
+
+if TYPE_CHECKING:
+    from depender.parse.code import ImportRecord
+
+__all__ = ["ImportResolver", "ModuleIndex"]
+
+# Fields of an import record that its resolution depends on
+ImportKey = Tuple[str, Optional[str], Tuple[str, ...], int, str]
+
+
+class ModuleIndex:
+    r"""Trie of the dotted names of the parsed modules.
+
+    Each level of the trie is a dictionary mapping the next part of a dotted name
+    to the level below it, the end of a module's name being marked by a None key.
+    """
+
+    def __init__(self) -> None:
+        self._root: Dict[Optional[str], dict] = dict()
+
+    def __contains__(self, module_dot_path: str) -> bool:
+        level: Optional[dict] = self._root
+        for part in module_dot_path.split("."):
+            level = level.get(part)
+            if level is None:
+                return False
+        return None in level
+
+    def add(self, module_dot_path: str) -> None:
+        level = self._root
+        for part in module_dot_path.split("."):
+            level = level.setdefault(part, dict())
+        level[None] = dict()
+
+    def remove(self, module_dot_path: str) -> None:
+        parts = module_dot_path.split(".")
+        levels = [self._root]
+        for part in parts:
+            level = levels[-1].get(part)
+            if level is None:
+                return
+            levels.append(level)
+        levels[-1].pop(None, None)
+        # Prune the levels left without any module below them
+        for depth in range(len(parts), 0, -1):
+            if levels[depth]:
+                break
+            del levels[depth - 1][parts[depth - 1]]
+
+    def submodules(self, package_dot_path: str, names: Tuple[str, ...]) -> List[str]:
+        r"""Return the modules of the given package among the given names"""
+        level: Optional[dict] = self._root
+        for part in package_dot_path.split("."):
+            level = level.get(part)
+            if level is None:
+                return []
+        return [
+            package_dot_path + "." + name
+            for name in names
+            if None in level.get(name, ())
+        ]
+
+
+class ImportResolver:
+    r"""Resolve import records to the parsed modules they import
+    or to the external packages they belong to.
+
+    Relative imports are resolved against the package of the importing module
+    using the level of the import, and are never external. The resolved nodes
+    are memoized per importing package and import, so that an import repeated
+    in several modules of the same package is only resolved once. Adding or
+    removing a module only forgets the imports whose resolution looked it up.
+
+    Args:
+        packages: Names of the parsed packages, whose modules are never external
+    """
+
+    def __init__(self, packages: Optional[Set[str]] = None) -> None:
+        self.modules = ModuleIndex()
+        self.packages: Set[str] = set() if packages is None else packages
+        # Resolved nodes of each import, see import_key,
+        # per importing package and include_external flag
+        self._resolved: Dict[
+            Tuple[str, bool], Dict[ImportKey, Tuple[ImportedNode, ...]]
+        ] = dict()
+        # Memoized imports whose resolution depends on each module, see import_targets
+        self._dependents: Dict[str, Set[Tuple[Tuple[str, bool], ImportKey]]] = dict()
+        # Number of parsed packages when the memo was started
+        self._package_count = len(self.packages)
+
+    def add_module(self, module_dot_path: str) -> None:
+        r"""Add a parsed module to the index"""
+        self.modules.add(module_dot_path)
+        self._forget(module_dot_path)
+
+    def remove_module(self, module_dot_path: str) -> None:
+        r"""Remove a parsed module from the index"""
+        self.modules.remove(module_dot_path)
+        self._forget(module_dot_path)
+
+    def _clear_memo(self) -> None:
+        self._resolved.clear()
+        self._dependents.clear()
+        self._package_count = len(self.packages)
+
+    def _forget(self, module_dot_path: str) -> None:
+        # A module can only change the resolution of the imports that target it
+        # or, for the imported names of a from import, its parent package
+        for target in (module_dot_path, module_dot_path.rpartition(".")[0]):
+            for memo_key, key in self._dependents.pop(target, ()):
+                self._resolved.get(memo_key, dict()).pop(key, None)
+
+    def is_parsed(self, module_dot_path: str) -> bool:
+        r"""Check whether the given module belongs to one of the parsed packages"""
+        return module_dot_path.split(".", 1)[0] in self.packages
+
+    def resolve(
+        self, record: "ImportRecord", module_dot_path: str, include_external: bool
+    ) -> Tuple[ImportedNode, ...]:
+        r"""Resolve an import record found in the given module
+
+        Returns:
+            The imported nodes, with their attributes, once per import
+        """
+        return self.resolve_all([record], module_dot_path, include_external)
+
+    def resolve_all(
+        self,
+        records: Iterable["ImportRecord"],
+        module_dot_path: str,
+        include_external: bool,
+    ) -> Tuple[ImportedNode, ...]:
+        r"""Resolve all the import records found in the given module
+
+        Returns:
+            The imported nodes, with their attributes, once per import
+        """
+        if len(self.packages) != self._package_count:
+            # A new parsed package changes which imports are external
+            self._clear_memo()
+        package = module_dot_path.rpartition(".")[0]
+        memo_key = (package, include_external)
+        resolved = self._resolved.setdefault(memo_key, dict())
+        imported_nodes: List[ImportedNode] = list()
+        for record in records:
+            key = import_key(record)
+            record_nodes = resolved.get(key)
+            if record_nodes is None:
+                record_nodes = self._resolve(record, package, include_external)
+                resolved[key] = record_nodes
+                for target in import_targets(record, package):
+                    self._dependents.setdefault(target, set()).add((memo_key, key))
+            imported_nodes += record_nodes
+        return tuple(imported_nodes)
+
+    def _resolve(
+        self, record: "ImportRecord", package: str, include_external: bool
+    ) -> Tuple[ImportedNode, ...]:
+        if record.kind == "import":
+            imported_nodes: List[ImportedNode] = list()
+            for name in record.names:
+                imported_nodes += self._resolve_module(name, include_external)
+            return tuple(imported_nodes)
+        elif record.kind == "from":
+            base = anchor(package, record.level)
+            if base is None:
+                return ()
+            if record.module is None:
+                # In case the import is of the form: from . import foo
+                # then the imported names are modules of the anchor package
+                return tuple(
+                    (module, {"label": module})
+                    for module in self.modules.submodules(base, record.names)
+                )
+            imported_from_module = base + "." + record.module if base else record.module
+            return tuple(
+                self._resolve_from_module(
+                    imported_from_module,
+                    record.names,
+                    include_external and record.level == 0,
+                )
+            )
+        elif record.kind == "importlib" and record.module:
+            name = record.module.lstrip(".")
+            level = len(record.module) - len(name)
+            if level == 0:
+                return tuple(self._resolve_module(name, include_external))
+            # The package argument is the anchor of the relative name
+            base = anchor(record.package, level)
+            if not base or not name:
+                return ()
+            return tuple(self._resolve_module(base + "." + name, False))
+        return ()
+
+    def _resolve_module(
+        self, imported_module: str, include_external: bool
+    ) -> List[ImportedNode]:
+        # Check if the imported module is in the list of the parsed modules
+        if imported_module in self.modules:
+            return [(imported_module, {"label": imported_module})]
+        # Else the module is external to this project and we check the include_external flag
+        elif include_external and not self.is_parsed(imported_module):
+            package = imported_module.split(".", 1)[0]
+            return [(package, {"label": package + " external", "external": True})]
+        return []
+
+    def _resolve_from_module(
+        self, imported_from_module: str, names: Tuple[str, ...], include_external: bool
+    ) -> List[ImportedNode]:
+        # Check if the first part of the from ... import ... is a module
+        if imported_from_module in self.modules:
+            return [(imported_from_module, {"label": imported_from_module})]
+        imported_nodes: List[ImportedNode] = [
+            (module, {"label": module})
+            for module in self.modules.submodules(imported_from_module, names)
+        ]
+        if include_external and not self.is_parsed(imported_from_module):
+            package = imported_from_module.split(".", 1)[0]
+            imported_nodes.append((package, {"label": package, "external": True}))
+        return imported_nodes
+
+
+def import_key(record: "ImportRecord") -> ImportKey:
+    r"""Return the fields of an import record that its resolution depends on,
+    the package only mattering for the relative names given to importlib
+    """
+    package = record.package if record.kind == "importlib" else ""
+    return record.kind, record.module, record.names, record.level, package
+
+
+def import_targets(record: "ImportRecord", package: str) -> Tuple[str, ...]:
+    r"""Return the dotted names that the resolution of an import record,
+    found in a module of the given package, looks up in the parsed modules.
+    The imported names of a from import are looked up below its target
+    """
+    if record.kind == "import":
+        return record.names
+    elif record.kind == "from":
+        base = anchor(package, record.level)
+        if base is None:
+            return ()
+        if record.module is None:
+            return (base,)
+        return (base + "." + record.module if base else record.module,)
+    elif record.kind == "importlib" and record.module:
+        name = record.module.lstrip(".")
+        level = len(record.module) - len(name)
+        if level == 0:
+            return (name,)
+        base = anchor(record.package, level)
+        if not base or not name:
+            return ()
+        return (base + "." + name,)
+    return ()
+
+
+def anchor(package: str, level: int) -> Optional[str]:
+    r"""Return the package that a relative import with the given level,
+    found in a module of the given package, is relative to
+
+    Returns:
+        The dotted name of the anchor package, an empty string for absolute imports
+        or None if the import goes beyond the top-level package
+    """
+    if level == 0:
+        return ""
+    parts = package.split(".") if package else []
+    if level - 1 >= len(parts):
+        return None
+    return ".".join(parts[: len(parts) - (level - 1)])
@@ -0,0 +1,111 @@
+import os
+import sys
+import sysconfig
+from functools import lru_cache
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from depender.graph.dependency import DependencyGraph
+
+__all__ = ["ModuleSizeParser"]
+
+
+class ModuleSizeParser:
+    r"""Estimate the cost of importing the nodes of a dependency graph,
+    without importing them, from the size of their source files.
+
+    The size of a parsed module is the size of its file. The size of an external
+    node, which stands for a whole top-level package, is the total size of the
+    python files of the installed package, as if all its modules were imported.
+    Built-in and frozen modules have no source and weigh nothing.
+
+    Args:
+        paths: Directories containing the parsed packages,
+            e.g. the parent directory of a package that is not installed
+    """
+
+    def __init__(self, paths: Iterable[Union[str, Path]] = ()) -> None:
+        self.paths = [Path(path) for path in paths]
+
+    def measure(self, graph: DependencyGraph) -> Dict[str, int]:
+        r"""Return the size, in bytes, of the nodes of the given graph
+        whose source was found
+        """
+        sizes = dict()
+        for node, attributes in graph.nodes.items():
+            if attributes.get("external", False):
+                size = self.installed_size(node)
+            else:
+                size = self._module_size(node)
+            if size is not None:
+                sizes[node] = size
+        return sizes
+
+    def _module_size(self, module: str) -> Optional[int]:
+        relative_path = module.replace(".", os.sep)
+        for path in self.paths:
+            for filepath in (
+                path / (relative_path + ".py"),
+                path / relative_path / "__init__.py",
+            ):
+                if filepath.is_file():
+                    return filepath.stat().st_size
+        return None
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def installed_size(package: str) -> Optional[int]:
+        r"""Return the total size of the python files of an installed package,
+        or None if it is not installed
+        """
+        spec = ModuleSizeParser._find_spec(package)
+        if spec is None:
+            return None
+        if spec.submodule_search_locations:
+            size = 0
+            for location in spec.submodule_search_locations:
+                for root, _, files in os.walk(location):
+                    size += sum(
+                        os.path.getsize(os.path.join(root, file))
+                        for file in files
+                        if file.endswith(".py")
+                    )
+            return size
+        if spec.origin is None or not os.path.isfile(spec.origin):
+            # Built-in or frozen module
+            return 0
+        return os.path.getsize(spec.origin)
+
+    @staticmethod
+    def is_third_party(package: str) -> bool:
+        r"""Check whether the given top-level package is installed
+        outside of the standard library
+        """
+        if package in sys.builtin_module_names:
+            return False
+        spec = ModuleSizeParser._find_spec(package)
+        if spec is None:
+            return False
+        if spec.origin is None:
+            # Namespace package
+            return True
+        if not os.path.isfile(spec.origin):
+            # Frozen module
+            return False
+        origin = os.path.realpath(spec.origin)
+        paths = sysconfig.get_paths()
+        stdlib = os.path.realpath(paths["stdlib"])
+        site_packages = {
+            os.path.realpath(paths[name]) for name in ("purelib", "platlib")
+        }
+        return not origin.startswith(stdlib + os.sep) or any(
+            origin.startswith(directory + os.sep) for directory in site_packages
+        )
+
+    @staticmethod
+    def _find_spec(package: str):
+        try:
+            return find_spec(package)
+        except (ImportError, ValueError):
+            return None
@@ -1,8 +1,9 @@
+import os
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Union
 
 from depender.graph import StructureGraph
-from depender.parse.utilities import traverse_directory
+from depender.parse.utilities import FileIndex
 
 
 class StructureParser:
@@ -15,38 +16,31 @@ class StructureParser:
         excluded_directories: List[Union[str, Path]],
         follow_links: bool = True,
         depth: int = 5,
+        file_index: Optional[FileIndex] = None,
     ) -> StructureGraph:
-        if isinstance(package_path, str):
-            package_path = Path(package_path)
-        # Convert the excluded dirs to Path instances
-        excluded_directories = list(
-            map(lambda x: package_path.joinpath(x).resolve(), excluded_directories)
-        )
-        for root, dirs, files in traverse_directory(
-            package_path, excluded_directories, depth=depth, followlinks=follow_links
-        ):
-
-            if not self.graph.has_node(str(root)):
-                self.graph.add_node(str(root), label=root.name, type="root")
-
-            for i, element in enumerate(dirs + files):
-                if "__pycache__" == element.name:
+        if file_index is None:
+            file_index = FileIndex(
+                package_path,
+                excluded_directories,
+                depth=depth,
+                followlinks=follow_links,
+            )
+        for root, dirs, files in file_index:
+            if not self.graph.has_node(root):
+                self.graph.add_node(root, label=os.path.basename(root), type="root")
+
+            prefix = root + os.sep
+            children = list()
+            for element in dirs:
+                if "__pycache__" == element:
                     continue
-                if ".pyc" == element.suffix:
+                children.append(
+                    (prefix + element, {"label": element, "type": "directory"})
+                )
+            for element in files:
+                if element.endswith(".pyc"):
                     continue
-
-                # Add the actual node to the graph
-                full_path = root / element
-
-                if full_path.is_file():
-                    self.graph.add_node(
-                        str(full_path), label=full_path.name, type="file"
-                    )
-                else:
-                    self.graph.add_node(
-                        str(full_path), label=full_path.name, type="directory"
-                    )
-
-                # Connect the current root to the current file/directory
-                self.graph.add_edge(str(root), str(full_path))
+                children.append((prefix + element, {"label": element, "type": "file"}))
+            # Connect the current root to its directories and files at once
+            self.graph.add_children(root, children)
         return self.graph
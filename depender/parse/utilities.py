@@ -1,49 +1,157 @@
 import os
+from collections import deque
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Collection, Iterator, List, Tuple, Union
 
+__all__ = ["FileIndex", "scan_directory", "traverse_directory"]
 
-def traverse_directory(
-    directory: Path,
-    excluded_directories: List[Path],
+
+class FileIndex:
+    r"""In-memory index of the directories and files of a package.
+
+    The package is traversed once, when the index is created, so that
+    several parsers can share the result of a single directory walk.
+    Each entry holds a visited directory's path together with the names
+    of its sub-directories and files as plain strings.
+
+    Args:
+        directory: Root directory of the package
+        excluded_directories: Directories to skip, relative to the root directory
+        depth: Maximum depth of the traversal, a negative value means no limit
+        followlinks: If True, directories pointed to by symlinks are visited
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        excluded_directories: List[Union[str, Path]],
+        depth: int = -1,
+        followlinks: bool = True,
+    ) -> None:
+        self.directory = Path(directory).resolve()
+        self.excluded_directories = [
+            self.directory.joinpath(excluded).resolve()
+            for excluded in excluded_directories
+        ]
+        self.depth = depth
+        self.followlinks = followlinks
+        self.entries: List[Tuple[str, List[str], List[str]]] = [
+            (root, [entry.name for entry in dirs], [entry.name for entry in files])
+            for root, dirs, files in scan_directory(
+                str(self.directory),
+                [str(excluded) for excluded in self.excluded_directories],
+                depth=depth,
+                followlinks=followlinks,
+            )
+        ]
+
+    def __iter__(self) -> Iterator[Tuple[str, List[str], List[str]]]:
+        return iter(self.entries)
+
+    def python_modules(self) -> List[Tuple[Path, str]]:
+        r"""Return the path and dotted name of all modules, except for __init__.py files"""
+        modules = list()
+        # Length of the path of the package's parent directory including the separator
+        prefix_length = len(str(self.directory.parent).rstrip(os.sep)) + 1
+        for root, _, files in self.entries:
+            package_dot_path = root[prefix_length:].replace(os.sep, ".")
+            for file in files:
+                if not file.endswith(".py") or file == "__init__.py":
+                    continue
+                module_dot_path = package_dot_path + "." + file[:-3]
+                modules.append((Path(root, file), module_dot_path))
+        return modules
+
+
+def scan_directory(
+    directory: str,
+    excluded_directories: Collection[str],
     depth: int,
     followlinks: bool,
     breadth_first: bool = False,
-) -> Iterable[Tuple[Path, List[Path], List[Path]]]:
-    root_depth = len(directory.parents)
-    dirlist = list()
-
-    for root, dirs, files in os.walk(directory.resolve(), followlinks=followlinks):
-        root = Path(root).resolve()
-        # Check to see if there are user specified directories that should be skipped
-        if check_if_skip_directory(root, excluded_directories):
-            continue
-        # Don't go deeper than "depth" if it has a non-negative value
-        current_depth = len(root.parents) - root_depth
-        if current_depth > depth >= 0:
-            continue
-        # Convert the dir and filenames to Path instances
-        dirs = list(map(lambda dir: Path(dir), dirs))
-        files = list(map(lambda file: Path(file), files))
-        # Remove directories that start with a '.'
-        dirs = skip_hidden_directories(dirs)
-        dirlist.append((root, dirs, files))
-        # If breadth first is True, sort the paths by directory level
-        if breadth_first:
-            dirlist = sorted(dirlist, key=lambda x: len(x[0].parents))
-    for root, dirs, files in dirlist:
-        yield root, dirs, files
+) -> Iterator[Tuple[str, List[os.DirEntry], List[os.DirEntry]]]:
+    r"""Lazily traverse the given directory and yield a (root, dirs, files) tuple
+    for each visited directory, in the same way as os.walk.
+
+    The sub-directories and files are returned as the os.DirEntry objects
+    produced by os.scandir, whose type is known without an additional stat call
+    on most platforms, and paths are handled as plain strings.
+
+    Hidden directories, whose name starts with a '.', are left out of their
+    parent's dirs. Excluded and __pycache__ directories, as well as directories
+    deeper than the given depth and, unless followlinks is True, symlinks
+    to directories, are still listed in their parent's dirs but
+    their subtrees are pruned and never visited.
 
+    Args:
+        directory: Directory to traverse
+        excluded_directories: Resolved paths of the directories whose subtree is skipped
+        depth: Maximum depth of the traversal, a negative value means no limit
+        followlinks: If True, directories pointed to by symlinks are visited
+        breadth_first: If True, the directories are visited level by level,
+            otherwise they are visited depth first in the same order as os.walk
 
-def check_if_skip_directory(directory: Path, excluded_directories: List[Path]) -> bool:
-    if directory in excluded_directories or "__pycache__" in directory.name:
-        return True
-    else:
-        return False
+    Yields:
+        The visited directory's path, the entries of its sub-directories and of its files
+    """
+    excluded = set(excluded_directories)
+    if directory in excluded or "__pycache__" in os.path.basename(directory):
+        return
+    queue = deque([(directory, 0)])
+    while queue:
+        root, current_depth = queue.popleft() if breadth_first else queue.pop()
+        dirs, files, subdirectories = list(), list(), list()
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        files.append(entry)
+                        continue
+                    # Skip directories that start with a '.'
+                    if entry.name.startswith("."):
+                        continue
+                    dirs.append(entry)
+                    # Don't go deeper than "depth" if it has a non-negative value
+                    if current_depth + 1 > depth >= 0:
+                        continue
+                    if not followlinks and entry.is_symlink():
+                        continue
+                    # Check to see if there are user specified directories that should be skipped
+                    if entry.path in excluded or "__pycache__" in entry.name:
+                        continue
+                    subdirectories.append((entry.path, current_depth + 1))
+        except OSError:
+            # Like os.walk, ignore directories that cannot be listed
+            continue
+        yield root, dirs, files
+        if breadth_first:
+            queue.extend(subdirectories)
+        else:
+            # Push the subdirectories in reverse order so that the first one is visited next
+            queue.extend(reversed(subdirectories))
 
 
-def skip_hidden_directories(directories: List[Path]) -> List[Path]:
-    for directory in directories[:]:
-        if str(directory)[0] == ".":
-            directories.remove(directory)
-    return directories
+def traverse_directory(
+    directory: Path,
+    excluded_directories: List[Path],
+    depth: int,
+    followlinks: bool,
+    breadth_first: bool = False,
+) -> Iterator[Tuple[Path, List[Path], List[Path]]]:
+    r"""Same as scan_directory but with the paths and names given as Path instances"""
+    for root, dirs, files in scan_directory(
+        str(directory.resolve()),
+        [str(excluded) for excluded in excluded_directories],
+        depth=depth,
+        followlinks=followlinks,
+        breadth_first=breadth_first,
+    ):
+        yield (
+            Path(root),
+            [Path(entry.name) for entry in dirs],
+            [Path(entry.name) for entry in files],
+        )
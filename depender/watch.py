@@ -0,0 +1,200 @@
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from depender.graph import DependencyGraph, StructureGraph
+from depender.parse.cache import ParseCache
+from depender.parse.code import CodeParser, ImportRecord
+from depender.parse.structure import StructureParser
+from depender.parse.utilities import FileIndex
+
+__all__ = ["ProjectWatcher"]
+
+
+class ProjectWatcher:
+    r"""Keep the dependency and structure graphs of a package up to date.
+
+    The package's files are polled using only os.scandir and os.stat,
+    so that no platform specific notification mechanism is needed,
+    and only the modules that were added or modified since the previous poll
+    are parsed again. The import records of all modules are kept in memory
+    so that the graph can be resolved again without parsing anything
+    when modules are added. When modules are deleted, they are removed
+    from the graph and only the modules that imported them are resolved again.
+
+    Args:
+        package_path: Path to the package's root directory or to a single module
+        is_module: Whether package_path points to a single module
+        excluded_directories: Directories, relative to the package, to skip
+        include_external: If True, external packages are added to the graph
+        parse_importlib: If True, calls to importlib.import_module are parsed
+        follow_links: If True, symbolic links to directories are followed
+        depth: Depth of the directory recursion, a negative value means no limit
+        jobs: Number of worker processes used to parse the modules
+        cache: If given, the import records are also stored in this cache
+        fast_scan: If True, only the statements of each module are searched for imports
+        eager_only: If True, only the imports executed when the modules are imported
+            are added to the dependency graph
+    """
+
+    def __init__(
+        self,
+        package_path: Union[str, Path],
+        is_module: bool,
+        excluded_directories: List[Union[str, Path]],
+        include_external: bool = True,
+        parse_importlib: bool = True,
+        follow_links: bool = True,
+        depth: int = -1,
+        jobs: int = 1,
+        cache: Optional[ParseCache] = None,
+        fast_scan: bool = False,
+        eager_only: bool = False,
+    ) -> None:
+        self.package_path = Path(package_path).resolve()
+        self.package_name = self.package_path.stem
+        self.is_module = is_module
+        self.excluded_directories = excluded_directories
+        self.include_external = include_external
+        self.parse_importlib = parse_importlib
+        self.follow_links = follow_links
+        self.depth = depth
+        self.jobs = jobs
+        self.cache = cache
+        self.fast_scan = fast_scan
+        self.eager_only = eager_only
+        self.code_parser = CodeParser(eager_only=eager_only)
+        self.structure_graph = StructureGraph()
+        self._file_entries: Optional[List] = None
+        # Path, modification time and size of each module at the previous poll
+        self._modules: Dict[str, Tuple[Path, int, int]] = dict()
+        self._records: Dict[str, List[ImportRecord]] = dict()
+
+    @property
+    def dependency_graph(self) -> DependencyGraph:
+        return self.code_parser.graph
+
+    def refresh(self) -> Tuple[bool, bool]:
+        r"""Poll the package's files once and update the graphs accordingly
+
+        Returns:
+            Whether the dependency graph and whether the structure graph changed
+        """
+        file_index = FileIndex(
+            self.package_path,
+            self.excluded_directories,
+            depth=self.depth,
+            followlinks=self.follow_links,
+        )
+        dependency_changed = self._update_dependency_graph(file_index)
+        structure_changed = self._update_structure_graph(file_index)
+        if self.cache is not None:
+            self.cache.save()
+        return dependency_changed, structure_changed
+
+    def watch(
+        self, on_change: Callable[[bool, bool], None], interval: float = 1.0
+    ) -> None:
+        r"""Poll the package's files until interrupted and call on_change,
+        with the same arguments that refresh returns, whenever a graph changed
+
+        Args:
+            on_change: Function called after a graph changed
+            interval: Number of seconds between two polls
+        """
+        while True:
+            time.sleep(interval)
+            dependency_changed, structure_changed = self.refresh()
+            if dependency_changed or structure_changed:
+                on_change(dependency_changed, structure_changed)
+
+    def _update_structure_graph(self, file_index: FileIndex) -> bool:
+        if file_index.entries == self._file_entries:
+            return False
+        self._file_entries = file_index.entries
+        structure_graph = StructureParser().parse_project(
+            self.package_path, [], file_index=file_index
+        )
+        changed = list(structure_graph.nodes) != list(self.structure_graph.nodes) or (
+            list(structure_graph.edges) != list(self.structure_graph.edges)
+        )
+        self.structure_graph = structure_graph
+        return changed
+
+    def _update_dependency_graph(self, file_index: FileIndex) -> bool:
+        if self.is_module:
+            file_list = [(self.package_path, self.package_name)]
+        else:
+            file_list = file_index.python_modules()
+        modules = dict()
+        for filepath, module_dot_path in file_list:
+            try:
+                stat = os.stat(str(filepath))
+            except OSError:
+                # The file was deleted after the directory was scanned
+                continue
+            modules[module_dot_path] = (filepath, stat.st_mtime_ns, stat.st_size)
+        added = [module for module in modules if module not in self._modules]
+        deleted = [module for module in self._modules if module not in modules]
+        modified = [
+            module
+            for module in modules
+            if module in self._modules and modules[module] != self._modules[module]
+        ]
+        if not (added or deleted or modified):
+            return False
+        # Parse only the new and modified modules
+        parsed_modules = added + modified
+        for module, records in zip(
+            parsed_modules,
+            CodeParser.extract_all_imports(
+                [modules[module][0] for module in parsed_modules],
+                self.parse_importlib,
+                self.jobs,
+                self.cache,
+                self.fast_scan,
+            ),
+        ):
+            self._records[module] = records
+        for module in deleted:
+            del self._records[module]
+        self._modules = modules
+
+        graph = self.dependency_graph
+        if not added:
+            changed = False
+            # Only the imports of a deleted module are resolved differently
+            # once it is removed, so only its importers are resolved again
+            importers = set(modified)
+            for module in deleted:
+                if graph.has_node(module):
+                    importers.update(graph.predecessors(module))
+            for module in deleted:
+                changed |= self.code_parser.remove_module(module)
+            for module in modules:
+                if module not in importers:
+                    continue
+                (
+                    imported_nodes,
+                    edge_attributes,
+                ) = self.code_parser.resolve_import_edges(
+                    self._records[module], module, self.include_external
+                )
+                changed |= graph.replace_module_imports(
+                    module, imported_nodes, edge_attributes
+                )
+            return changed
+        # Adding a module can change how the imports
+        # of any other module are resolved, so resolve them all again
+        signature = (frozenset(graph.nodes), frozenset(graph.edges))
+        self.code_parser = CodeParser(eager_only=self.eager_only)
+        self.code_parser.packages.add(self.package_name)
+        graph = self.dependency_graph
+        for module in modules:
+            self.code_parser.add_module(module, self.package_name)
+        for module in modules:
+            self.code_parser.add_import_records(
+                self._records[module], module, self.include_external
+            )
+        return signature != (frozenset(graph.nodes), frozenset(graph.edges))
@@ -1,3 +1,4 @@
+import re
 from pathlib import Path
 
 from setuptools import find_packages, setup
@@ -9,9 +10,13 @@ HERE = Path(__file__).parent
 
 README = (HERE / "README.rst").read_text()
 
+VERSION = re.search(
+    r'__version__ = "(.+)"', (HERE / "depender" / "__init__.py").read_text()
+).group(1)
+
 setup(
     name="depender",
-    version="0.1.2",
+    version=VERSION,
     description="A package that finds the external and internal dependencies in your Python project"
     "and draws a directed graph and/or matrix to represent them",
     long_description=README,
@@ -30,6 +35,6 @@ setup(
     author_email="anes.benmerzoug@gmail.com",
     install_requires=install_requires,
     include_package_data=True,
-    packages=find_packages(exclude=["tests", "docs"]),
+    packages=find_packages(exclude=["tests", "docs", "benchmarks"]),
     entry_points={"console_scripts": ["depender=depender.cli:main"]},
 )
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def package_path(tmp_path: Path) -> Path:
+    r"""Create a small package on disk with the following structure:
+
+    sample/
+    +-- __init__.py
+    +-- core.py            imports os and sample.utils
+    +-- utils.py           imports sys and sample.sub.helpers
+    +-- sub/
+        +-- __init__.py
+        +-- helpers.py     imports json and, through importlib, sample.core
+    """
+    package = tmp_path / "sample"
+    sub_package = package / "sub"
+    sub_package.mkdir(parents=True)
+    package.joinpath("__init__.py").write_text("")
+    package.joinpath("core.py").write_text(
+        "import os\nfrom sample import utils\n\n\ndef main():\n    return utils\n"
+    )
+    package.joinpath("utils.py").write_text(
+        "import sys\nfrom sample.sub.helpers import helper\n"
+    )
+    sub_package.joinpath("__init__.py").write_text("")
+    sub_package.joinpath("helpers.py").write_text(
+        "import importlib\nimport json\n\n\n"
+        "def helper():\n    return importlib.import_module('sample.core')\n"
+    )
+    return package
+
+
+def write_distribution(site_packages: Path, name: str, files: dict) -> None:
+    r"""Install a fake distribution with the given files in site_packages"""
+    dist_info = site_packages / "{}-1.0.dist-info".format(name)
+    dist_info.mkdir()
+    dist_info.joinpath("METADATA").write_text(
+        "Metadata-Version: 2.1\nName: {}\nVersion: 1.0\n".format(name)
+    )
+    records = ["{}/METADATA,,".format(dist_info.name), "../../bin/script,,"]
+    for filename, content in files.items():
+        filepath = site_packages / filename
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(content)
+        records.append("{},,".format(filename))
+    dist_info.joinpath("RECORD").write_text("\n".join(records) + "\n")
+
+
+@pytest.fixture
+def site_packages_path(tmp_path: Path) -> Path:
+    r"""Create a fake site-packages directory with the following distributions:
+
+    alpha           provides alpha, imports beta twice and os
+    beta-dist       provides beta and ns.first, imports gamma through ns.second
+    gamma           provides ns.second, imports nothing
+    """
+    site_packages = tmp_path / "site-packages"
+    site_packages.mkdir()
+    write_distribution(
+        site_packages,
+        "alpha",
+        {
+            "alpha/__init__.py": "import os\nimport beta\n",
+            "alpha/core.py": "from beta import tools\nfrom . import other\n",
+        },
+    )
+    write_distribution(
+        site_packages,
+        "beta-dist",
+        {
+            "beta/__init__.py": "",
+            "beta/tools.py": "from ns import second\n",
+            "ns/first/__init__.py": "",
+        },
+    )
+    write_distribution(
+        site_packages, "gamma", {"ns/second/__init__.py": "def broken(:\n"}
+    )
+    return site_packages
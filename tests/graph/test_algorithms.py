@@ -0,0 +1,94 @@
+import networkx as nx
+import numpy as np
+
+from depender.graph.algorithms import (
+    condensation,
+    heaviest_path,
+    strongly_connected_components,
+    transitive_closure,
+    unpack_bitsets,
+)
+
+
+def to_csr(graph: nx.DiGraph):
+    node_count = graph.number_of_nodes()
+    edges = np.array(sorted(graph.edges()), dtype=np.int64).reshape(-1, 2)
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edges[:, 0], minlength=node_count), out=indptr[1:])
+    return edges, indptr
+
+
+def test_strongly_connected_components() -> None:
+    for seed in range(5):
+        graph = nx.gnm_random_graph(200, 400, seed=seed, directed=True)
+        edges, indptr = to_csr(graph)
+        component_count, components = strongly_connected_components(
+            200, indptr, edges[:, 1]
+        )
+        expected = list(nx.strongly_connected_components(graph))
+        assert component_count == len(expected)
+        for members in expected:
+            assert len(set(components[list(members)].tolist())) == 1
+        # The components are in reverse topological order
+        assert (components[edges[:, 0]] >= components[edges[:, 1]]).all()
+
+
+def test_strongly_connected_components_of_deep_graph() -> None:
+    # A cycle through 100000 nodes, deeper than the recursion limit
+    node_count = 100000
+    indptr = np.arange(node_count + 1)
+    indices = (np.arange(node_count) + 1) % node_count
+    component_count, components = strongly_connected_components(
+        node_count, indptr, indices
+    )
+    assert component_count == 1
+    assert (components == 0).all()
+
+
+def test_condensation() -> None:
+    components = np.array([1, 1, 0, 0])
+    sources = np.array([0, 1, 1, 0, 2])
+    sinks = np.array([1, 0, 2, 3, 3])
+    counts = np.array([1, 1, 2, 3, 4])
+    condensed_sources, condensed_sinks, condensed_counts = condensation(
+        components, sources, sinks, counts
+    )
+    assert condensed_sources.tolist() == [1]
+    assert condensed_sinks.tolist() == [0]
+    assert condensed_counts.tolist() == [5]
+
+
+def test_transitive_closure() -> None:
+    # 3 -> 2 -> 1 -> 0 and 3 -> 0, component 1 is a cycle
+    sources = np.array([3, 2, 1, 3])
+    sinks = np.array([2, 1, 0, 0])
+    cyclic = np.array([False, True, False, False])
+    closure = transitive_closure(4, sources, sinks, cyclic)
+    assert closure.shape == (4, 1)
+    assert unpack_bitsets(closure, 4).tolist() == [
+        [False, False, False, False],
+        [True, True, False, False],
+        [True, True, False, False],
+        [True, True, True, False],
+    ]
+
+
+def test_transitive_closure_of_many_components() -> None:
+    # A chain of 200 components spans several 64 bits words
+    component_count = 200
+    sources = np.arange(1, component_count)
+    closure = transitive_closure(
+        component_count, sources, sources - 1, np.zeros(component_count, dtype=bool)
+    )
+    reached = unpack_bitsets(closure, component_count)
+    assert (reached == np.tri(component_count, k=-1, dtype=bool)).all()
+
+
+def test_heaviest_path() -> None:
+    # 4 -> 3 -> 0, 4 -> 2 -> 1 -> 0 and 3 -> 1
+    sources = np.array([4, 3, 4, 2, 1, 3])
+    sinks = np.array([3, 0, 2, 1, 0, 1])
+    weights = np.array([1.0, 5.0, 1.0, 4.0, 0.5])
+    assert heaviest_path(5, sources, sinks, weights, 4) == ([4, 3, 1, 0], 10.5)
+    assert heaviest_path(5, sources, sinks, weights, 2) == ([2, 1, 0], 7.0)
+    assert heaviest_path(5, sources, sinks, weights, 0) == ([0], 1.0)
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import numpy as np
+
+from depender.graph.compact import CompactGraph
+from depender.parse.code import CodeParser
+
+
+def test_compact_graph() -> None:
+    graph = CompactGraph()
+    graph.add_node("a", package="pkg")
+    graph.add_edge("a", "b")
+    graph.add_edge("a", "b")
+    graph.add_edge("b", "os")
+    graph.add_node("os", external=True)
+    assert list(graph.edges()) == [("a", "b", 2), ("b", "os", 1)]
+    # Edges added after the adjacency was built are merged into it
+    graph.add_edge("c", "a")
+    graph.add_edge("a", "b")
+    indptr, indices, counts = graph.adjacency()
+    assert indptr.tolist() == [0, 1, 2, 2, 3]
+    assert indices.tolist() == [1, 2, 0]
+    assert counts.tolist() == [3, 1, 1]
+    assert graph.successors("a") == ["b"]
+    assert graph.in_degree().tolist() == [1, 1, 1, 0]
+    assert graph.out_degree().tolist() == [1, 1, 0, 1]
+    assert np.allclose(graph.instability(), [0.5, 0.5, 0.0, 1.0])
+    assert graph.dependency_matrix().tolist() == [
+        [0, 3, 0, 0],
+        [0, 0, 1, 0],
+        [0, 0, 0, 0],
+        [1, 0, 0, 0],
+    ]
+    assert (
+        graph.dependency_matrix(sparse=True).toarray() == graph.dependency_matrix()
+    ).all()
+    assert graph.package("a") == "pkg" and graph.package("b") is None
+    assert graph.is_external("os")
+
+
+def test_compact_graph_conversion(package_path: Path) -> None:
+    graph = CodeParser().parse_project(
+        package_path, is_module=False, excluded_directories=[]
+    )
+    compact_graph = CodeParser(graph=CompactGraph()).parse_project(
+        package_path, is_module=False, excluded_directories=[]
+    )
+    converted_graph = compact_graph.to_networkx()
+    assert list(converted_graph.nodes) == list(graph.nodes)
+    assert set(converted_graph.edges) == set(graph.edges)
+    assert converted_graph.nodes["os"]["external"] is True
+    assert converted_graph.nodes["sample.core"]["package"] == "sample"
+    round_trip = CompactGraph.from_networkx(converted_graph)
+    assert list(round_trip.edges()) == list(compact_graph.edges())
@@ -0,0 +1,112 @@
+from depender.graph.dependency import DependencyGraph
+
+
+def test_replace_module_imports() -> None:
+    graph = DependencyGraph()
+    external = {"label": "numpy external", "external": True}
+    graph.replace_module_imports("a", [("b", {}), ("numpy", external)])
+    graph.replace_module_imports("b", [("numpy", external)])
+    graph.layout(matrix=True)
+    assert [graph.nodes[node]["index"] for node in graph] == [0, 1, 2]
+    # Re-importing the same modules does not change the graph
+    assert not graph.replace_module_imports("a", [("b", {}), ("numpy", external)])
+    # Import b twice and drop numpy which is still imported by b
+    assert graph.replace_module_imports("a", [("b", {}), ("b", {})])
+    assert graph.edges["a", "b"]["count"] == 2
+    assert "numpy" in graph
+    # numpy is no longer imported by anyone
+    assert graph.replace_module_imports("b", [("c", {})])
+    assert set(graph.nodes) == {"a", "b", "c"}
+    assert sorted(graph.nodes[node]["index"] for node in graph) == [0, 1, 2]
+    assert graph.nodes["c"]["index"] == 2
+
+
+def test_remove_module() -> None:
+    graph = DependencyGraph()
+    graph.replace_module_imports("a", [("b", {}), ("os", {"external": True})])
+    graph.replace_module_imports("b", [("sys", {"external": True})])
+    graph.layout(matrix=True)
+    assert graph.remove_module("a")
+    assert not graph.remove_module("a")
+    assert set(graph.nodes) == {"b", "sys"}
+    assert sorted(graph.nodes[node]["index"] for node in graph) == [0, 1]
+
+
+def test_dependency_matrix() -> None:
+    graph = DependencyGraph()
+    graph.add_edge("a", "b")
+    graph.add_edge("b", "c", count=3)
+    graph.add_node("d")
+    expected = [[0, 1, 0, 0], [0, 0, 3, 0], [0, 0, 0, 0], [0, 0, 0, 0]]
+    assert graph.dependency_matrix().tolist() == expected
+    sparse_matrix = graph.dependency_matrix(sparse=True)
+    assert sparse_matrix.nnz == 2
+    assert sparse_matrix.toarray().tolist() == expected
+
+
+def test_layout_is_cached() -> None:
+    graph = DependencyGraph()
+    graph.add_edge("a", "b", count=2)
+    graph.layout(matrix=True)
+    assert graph.edges["a", "b"]["count"] == 2
+    graph.nodes["a"]["index"] = 5
+    # The graph did not change so the layout is not computed again
+    graph.layout(matrix=True)
+    assert graph.nodes["a"]["index"] == 5
+    assert graph.edges["a", "b"]["count"] == 2
+    graph.add_edge("b", "c")
+    graph.layout(matrix=True)
+    assert [graph.nodes[node]["index"] for node in graph] == [0, 1, 2]
+
+
+def test_cycles_and_dsm_order() -> None:
+    graph = DependencyGraph()
+    graph.add_edge("app", "b")
+    graph.add_edge("b", "c")
+    graph.add_edge("c", "b", count=2)
+    graph.add_edge("c", "utils")
+    graph.add_edge("utils", "utils")
+    assert graph.strongly_connected_components() == [["utils"], ["b", "c"], ["app"]]
+    assert graph.cycles() == [["b", "c"], ["utils"]]
+    # Imported modules come first and the cycle is a block on the diagonal
+    assert graph.node_order("dsm") == ["utils", "b", "c", "app"]
+    assert graph.dependency_matrix(order="dsm").tolist() == [
+        [1, 0, 0, 0],
+        [0, 0, 1, 0],
+        [1, 2, 0, 0],
+        [0, 1, 0, 0],
+    ]
+    condensed_graph = graph.condensation()
+    assert condensed_graph.nodes[1]["members"] == ["b", "c"]
+    assert sorted(condensed_graph.edges.data("count")) == [(1, 0, 1), (2, 1, 1)]
+    # The components are found again once the graph changes
+    graph.add_edge("utils", "app")
+    assert graph.cycles() == [["app", "b", "c", "utils"]]
+
+
+def test_heaviest_import_chain_and_deferrable_imports() -> None:
+    graph = DependencyGraph()
+    graph.add_node("numpy", external=True)
+    graph.add_node("json", external=True)
+    graph.add_edge("cli", "b")
+    graph.add_edge("cli", "json")
+    graph.add_edge("b", "c")
+    graph.add_edge("c", "b")
+    graph.add_edge("c", "numpy")
+    graph.add_edge("cli", "utils")
+    graph.add_edge("b", "utils")
+    graph.add_edge("utils", "json")
+    graph.add_edge("other", "numpy")
+    weights = {"cli": 1, "b": 2, "c": 3, "utils": 4, "numpy": 10}
+    # The cycle between b and c is part of the chain
+    assert graph.heaviest_import_chain("cli", weights) == (
+        ["cli", "b", "c", "numpy"],
+        16,
+    )
+    assert graph.heaviest_import_chain("utils", weights) == (["utils", "json"], 4)
+    # numpy is imported by other, which is not imported with cli
+    assert graph.deferrable_imports("cli") == {
+        "numpy": ["c"],
+        "json": ["cli", "utils"],
+    }
+    assert graph.deferrable_imports("cli", max_importers=1) == {"numpy": ["c"]}
@@ -0,0 +1,51 @@
+import networkx as nx
+import numpy as np
+
+from depender.graph.dependency import DependencyGraph
+from depender.graph.layout import force_directed_layout
+
+
+def test_force_directed_layout() -> None:
+    graph = nx.convert_node_labels_to_integers(nx.grid_2d_graph(10, 10))
+    edges = np.array(graph.edges())
+    positions = force_directed_layout(len(graph), edges[:, 0], edges[:, 1], seed=1)
+    assert positions.shape == (100, 2)
+    assert np.abs(positions).max() <= 1.0 + 1e-9
+    # Layouts are deterministic
+    same_positions = force_directed_layout(len(graph), edges[:, 0], edges[:, 1], seed=1)
+    assert np.array_equal(positions, same_positions)
+    # Connected nodes are closer to each other than nodes picked at random
+    edge_lengths = np.linalg.norm(
+        positions[edges[:, 0]] - positions[edges[:, 1]], axis=1
+    )
+    pairs = np.random.RandomState(0).randint(0, 100, size=(500, 2))
+    pair_lengths = np.linalg.norm(
+        positions[pairs[:, 0]] - positions[pairs[:, 1]], axis=1
+    )
+    assert edge_lengths.mean() < 0.5 * pair_lengths.mean()
+    # No two nodes end up on top of each other
+    distances = np.linalg.norm(positions[:, None] - positions[None, :], axis=-1)
+    assert distances[np.triu_indices(100, k=1)].min() > 1e-3
+
+
+def test_layout_of_non_planar_graph() -> None:
+    graph = DependencyGraph(nx.complete_graph(6, create_using=nx.DiGraph))
+    graph.layout(graph=True)
+    positions = np.array([graph.nodes[node]["position"] for node in graph])
+    assert positions.shape == (6, 2)
+    assert len(np.unique(positions.round(6), axis=0)) == 6
+
+
+def test_warm_started_layout() -> None:
+    graph = DependencyGraph(nx.complete_graph(6, create_using=nx.DiGraph))
+    graph.layout(graph=True)
+    saved_positions = {node: graph.nodes[node]["position"] for node in graph}
+    # The saved positions are kept and only the new node is laid out
+    new_graph = DependencyGraph(graph)
+    new_graph.add_edge(0, 6)
+    new_graph.layout(graph=True, positions=saved_positions)
+    for node, position in saved_positions.items():
+        assert np.array_equal(new_graph.nodes[node]["position"], position)
+    new_position = new_graph.nodes[6]["position"]
+    assert np.isfinite(new_position).all()
+    assert min(np.linalg.norm(new_position - p) for p in saved_positions.values()) > 0
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from depender.graph import DependencyGraph, LayoutCache, StructureGraph
+
+
+def test_layout_cache(tmp_path: Path) -> None:
+    cache_file = tmp_path / "layout.json"
+    graph = DependencyGraph()
+    graph.add_edge("a", "b")
+    graph.add_edge("b", "c")
+    graph.layout(graph=True)
+    with LayoutCache(cache_file) as layout_cache:
+        layout_cache.set(
+            "dependency_graph", {node: graph.nodes[node]["position"] for node in graph}
+        )
+    layout_cache = LayoutCache(cache_file)
+    positions = layout_cache.get("dependency_graph")
+    assert sorted(positions) == ["a", "b", "c"]
+    # The graph is unchanged so its nodes keep their saved positions
+    graph.nodes["a"]["position"] = None
+    same_graph = DependencyGraph(graph)
+    same_graph.layout(graph=True, positions=positions)
+    assert list(same_graph.nodes["a"]["position"]) == positions["a"]
+    layout_cache.clear()
+    assert not cache_file.exists()
+    assert LayoutCache(cache_file).get("dependency_graph") == dict()
+
+
+def test_layout_cache_signature(tmp_path: Path) -> None:
+    graph = StructureGraph()
+    graph.add_edge("root", "a")
+    graph.add_edge("root", "b")
+    signature = LayoutCache.signature(graph, ("width", "height"))
+    layout_cache = LayoutCache(tmp_path / "layout.json")
+    layout_cache.set("structure_graph", {"root": (1, 2)}, signature=signature)
+    assert layout_cache.get("structure_graph", signature) == {"root": [1.0, 2.0]}
+    graph.nodes["a"]["width"] = 2.0
+    new_signature = LayoutCache.signature(graph, ("width", "height"))
+    assert new_signature != signature
+    assert layout_cache.get("structure_graph", new_signature) == dict()
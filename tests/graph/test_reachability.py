@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from depender.graph import DependencyGraph
+from depender.parse.code import CodeParser
+
+
+def random_dependency_graph(seed: int) -> DependencyGraph:
+    random_graph = nx.gnm_random_graph(150, 300, seed=seed, directed=True)
+    graph = DependencyGraph()
+    graph.add_nodes_from(f"module{node}" for node in random_graph)
+    graph.add_edges_from(
+        (f"module{source}", f"module{sink}", {"count": 1})
+        for source, sink in random_graph.edges
+    )
+    graph.add_edge("module0", "module0", count=1)
+    return graph
+
+
+def reaches_itself(graph: DependencyGraph, node: str) -> bool:
+    return graph.has_edge(node, node) or any(
+        node in nx.descendants(graph, successor) for successor in graph[node]
+    )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_reachability_queries(seed: int) -> None:
+    graph = random_dependency_graph(seed)
+    index = graph.reachability()
+    fan_out = index.fan_out()
+    fan_in = index.fan_in()
+    for node in graph:
+        expected_descendants = nx.descendants(graph, node)
+        expected_ancestors = nx.ancestors(graph, node)
+        if reaches_itself(graph, node):
+            expected_descendants.add(node)
+            expected_ancestors.add(node)
+        assert set(index.descendants(node)) == expected_descendants
+        assert set(index.ancestors(node)) == expected_ancestors
+        assert fan_out[node] == len(expected_descendants)
+        assert fan_in[node] == len(expected_ancestors)
+    assert index.reaches("module0", "module0")
+
+
+def test_reachability_of_parsed_package(package_path: Path) -> None:
+    graph = CodeParser().parse_project(
+        package_path, is_module=False, excluded_directories=[]
+    )
+    index = graph.reachability()
+    assert len(index) == graph.number_of_nodes()
+    # sample.core, sample.utils and sample.sub.helpers import each other
+    assert set(index.descendants("sample.core")) == {
+        "sample.core",
+        "sample.utils",
+        "sample.sub.helpers",
+        "os",
+        "sys",
+        "importlib",
+        "json",
+    }
+    assert index.ancestors("os") == [
+        "sample.core",
+        "sample.utils",
+        "sample.sub.helpers",
+    ]
+    assert index.reaches("sample.utils", "sample.core")
+    assert not index.reaches("os", "sample.core")
+    with pytest.raises(KeyError):
+        index.descendants("missing")
@@ -43,3 +43,59 @@ def test_structure_layout_with_label(graph_with_labels: StructureGraph) -> None:
     assert graph_with_labels.nodes["6"]["y"] == -2.0
     assert graph_with_labels.nodes["7"]["y"] == -2.0
     assert graph_with_labels.nodes["8"]["y"] == -2.0
+
+
+def test_structure_layout_with_saved_coordinates(graph: StructureGraph) -> None:
+    graph.layout()
+    coordinates = {
+        node: (graph.nodes[node]["x"], graph.nodes[node]["y"]) for node in graph
+    }
+    graph.nodes["2"]["x"] = 100.0
+    # Saved coordinates of all the nodes are used instead of the layout
+    graph.layout(coordinates=coordinates)
+    assert graph.nodes["2"]["x"] == -1.5
+
+
+def test_structure_layout_with_missing_coordinates(graph: StructureGraph) -> None:
+    # The layout is computed if some nodes are missing from the saved coordinates
+    graph.layout(coordinates={"1": (5.0, 5.0)})
+    assert graph.nodes["1"]["x"] == 0.0
+    assert graph.nodes["8"]["y"] == -2.0
+
+
+def test_add_children(graph: StructureGraph) -> None:
+    bulk_graph = StructureGraph()
+    bulk_graph.add_children("1", ["2", "3", ("4", {}), "5"])
+    bulk_graph.add_children("2", ["6"])
+    bulk_graph.add_children("4", ["7"])
+    bulk_graph.add_children("4", ["8"])
+    assert list(bulk_graph.edges) == list(graph.edges)
+    assert list(bulk_graph.successors("1")) == ["2", "3", "4", "5"]
+    assert dict(bulk_graph.nodes) == dict(graph.nodes)
+    bulk_graph.layout()
+    graph.layout()
+    assert dict(bulk_graph.nodes) == dict(graph.nodes)
+
+
+def test_structure_graph_node_attributes(graph_with_labels: StructureGraph) -> None:
+    graph_with_labels.add_node("1", label="root", type="root")
+    graph_with_labels.layout()
+    # Only the given attributes and the coordinates are kept
+    assert graph_with_labels.nodes["1"] == {
+        "x": 0.0,
+        "y": 0.0,
+        "width": 3,
+        "label": "root",
+        "type": "root",
+    }
+
+
+def test_structure_layout_of_deep_tree() -> None:
+    # Deeper than the default recursion limit
+    graph = StructureGraph()
+    for i in range(5000):
+        graph.add_children(str(i), [str(i + 1), "leaf{}".format(i)])
+    graph.layout()
+    assert graph.nodes["5000"]["y"] == -5000.0
+    assert graph.nodes["0"]["x"] == 0.0
+    assert graph.nodes["leaf0"]["x"] > graph.nodes["1"]["x"]
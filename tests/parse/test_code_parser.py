@@ -0,0 +1,310 @@
+from pathlib import Path
+
+from depender.parse.cache import ParseCache
+from depender.parse.code import CodeParser, extract_imports
+
+
+def test_parse_project(package_path: Path) -> None:
+    graph = CodeParser().parse_project(
+        package_path, is_module=False, excluded_directories=[]
+    )
+    assert set(graph.edges) == {
+        ("sample.core", "os"),
+        ("sample.core", "sample.utils"),
+        ("sample.utils", "sys"),
+        ("sample.utils", "sample.sub.helpers"),
+        ("sample.sub.helpers", "importlib"),
+        ("sample.sub.helpers", "json"),
+        ("sample.sub.helpers", "sample.core"),
+    }
+
+
+def test_parse_project_in_parallel(package_path: Path) -> None:
+    serial_graph = CodeParser().parse_project(
+        package_path, is_module=False, excluded_directories=[], jobs=1
+    )
+    parallel_graph = CodeParser().parse_project(
+        package_path, is_module=False, excluded_directories=[], jobs=2
+    )
+    assert list(parallel_graph.nodes.data()) == list(serial_graph.nodes.data())
+    assert list(parallel_graph.edges.data()) == list(serial_graph.edges.data())
+
+
+def test_parse_project_with_cache(package_path: Path, tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    with ParseCache(cache_dir) as cache:
+        cold_graph = CodeParser().parse_project(
+            package_path, is_module=False, excluded_directories=[], cache=cache
+        )
+        assert cache.misses == 3 and cache.hits == 0
+    # Modify a single module
+    package_path.joinpath("utils.py").write_text("import re\n")
+    with ParseCache(cache_dir) as cache:
+        warm_graph = CodeParser().parse_project(
+            package_path, is_module=False, excluded_directories=[], cache=cache
+        )
+        assert cache.misses == 1 and cache.hits == 2
+    assert ("sample.utils", "re") in warm_graph.edges
+    assert ("sample.utils", "sys") not in warm_graph.edges
+    assert set(warm_graph.edges) - {("sample.utils", "re")} <= set(cold_graph.edges)
+
+
+def test_warm_run_does_not_rewrite_cache(package_path: Path, tmp_path: Path) -> None:
+    with ParseCache(tmp_path / "cache") as cache:
+        CodeParser().parse_project(
+            package_path, is_module=False, excluded_directories=[], cache=cache
+        )
+    # The cache file is replaced, with a new inode, whenever it is written
+    stat = cache.cache_file.stat()
+    with ParseCache(tmp_path / "cache") as cache:
+        CodeParser().parse_project(
+            package_path, is_module=False, excluded_directories=[], cache=cache
+        )
+        assert cache.hits == 3
+    new_stat = cache.cache_file.stat()
+    assert (new_stat.st_ino, new_stat.st_mtime_ns) == (stat.st_ino, stat.st_mtime_ns)
+
+
+def test_cache_eviction(package_path: Path, tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path / "cache", max_size=1)
+    CodeParser().parse_project(
+        package_path, is_module=False, excluded_directories=[], cache=cache
+    )
+    cache.save()
+    assert len(cache) == 0
+
+
+def test_fast_scan(tmp_path: Path) -> None:
+    source = tmp_path / "module.py"
+    source.write_text(
+        "import os\n"
+        "try:\n    import ujson as json\nexcept ImportError:\n    import json\n"
+        "finally:\n    from a.b import c\n"
+        "class A:\n    import re\n"
+        "    def f(self, x=importlib.import_module('d')):\n"
+        "        if x:\n            from .e import f\n        else:\n            import g\n"
+        "        return [import_module('h') for _ in range(2)]\n"
+        "while True:\n    import j\nelse:\n    import k\n"
+        "with open(x) as f:\n    import l\n"
+    )
+    walk_records = extract_imports(source, fast=False)
+    fast_records = extract_imports(source, fast=True)
+    assert len(walk_records) == 12
+    # The unused names are only found when the expressions are visited
+    assert sorted(fast_records) == sorted(
+        record._replace(unused=()) for record in walk_records
+    )
+    # Without calls to import_module, expressions are skipped
+    assert extract_imports(source, parse_importlib=False, fast=True) == [
+        record for record in fast_records if record.kind != "importlib"
+    ]
+
+
+def test_parse_project_skips_excluded_hidden_and_deep_modules(
+    package_path: Path,
+) -> None:
+    for directory in ("excluded", ".hidden", "sub/deeper"):
+        package_path.joinpath(directory).mkdir()
+        package_path.joinpath(directory, "module.py").write_text("import os\n")
+    graph = CodeParser().parse_project(
+        package_path, is_module=False, excluded_directories=["excluded"], depth=1
+    )
+    assert set(graph.nodes) >= {"sample.core", "sample.utils", "sample.sub.helpers"}
+    assert not any(
+        node.startswith(("sample.excluded", "sample..hidden", "sample.sub.deeper"))
+        for node in graph.nodes
+    )
+
+
+def test_parse_projects_with_cross_package_imports(
+    package_path: Path, tmp_path: Path
+) -> None:
+    other_package = tmp_path / "other"
+    other_package.mkdir()
+    other_package.joinpath("__init__.py").write_text("")
+    other_package.joinpath("app.py").write_text(
+        "import sample\nfrom sample.core import main\n"
+    )
+    graph = CodeParser().parse_projects(
+        [package_path, other_package], excluded_directories=[]
+    )
+    assert ("other.app", "sample.core") in graph.edges
+    assert "sample" not in graph
+    assert graph.nodes["other.app"]["package"] == "other"
+    assert graph.nodes["sample.core"]["package"] == "sample"
+    subgraph = graph.package_subgraph("other")
+    assert list(subgraph.nodes) == ["sample.core", "other.app"]
+    assert list(subgraph.edges) == [("other.app", "sample.core")]
+
+
+def test_extract_importlib_package(tmp_path: Path) -> None:
+    module = tmp_path / "module.py"
+    module.write_text(
+        "import importlib\n"
+        "importlib.import_module('.core', package='sample')\n"
+        "importlib.import_module('..utils', 'sample.sub')\n"
+    )
+    records = extract_imports(module)
+    assert [(record.module, record.package) for record in records[1:]] == [
+        (".core", "sample"),
+        ("..utils", "sample.sub"),
+    ]
+
+
+def test_import_counts(package_path: Path) -> None:
+    package_path.joinpath("core.py").write_text(
+        "import os\nimport os.path\nfrom os import path\n"
+        "from sample import utils\nimport sample.utils\n"
+    )
+    graph = CodeParser().parse_project(
+        package_path, is_module=False, excluded_directories=[]
+    )
+    assert graph.edges["sample.core", "os"]["count"] == 3
+    assert graph.edges["sample.core", "sample.utils"]["count"] == 2
+    assert graph.edges["sample.utils", "sys"]["count"] == 1
+    # Laying the graph out does not change the counts
+    graph.layout(matrix=True)
+    graph.layout(matrix=True)
+    nodes = list(graph.nodes)
+    matrix = graph.dependency_matrix()
+    assert matrix[nodes.index("sample.core"), nodes.index("os")] == 3
+
+
+def test_import_contexts(tmp_path: Path) -> None:
+    source = tmp_path / "module.py"
+    source.write_text(
+        "import os\n"
+        "from typing import TYPE_CHECKING\n"
+        "if TYPE_CHECKING:\n    import a\nelse:\n    import b\n"
+        "try:\n    import c\nexcept (ValueError, ImportError):\n    import d\n"
+        "except KeyError:\n    import e\n"
+        "class A:\n    import f\n"
+        "    def g(self, x=import_module('h')):\n        import i\n"
+        "        if typing.TYPE_CHECKING:\n            import j\n"
+        "k = lambda: import_module('k')\n"
+        "try:\n    import l\nexcept:\n    def m():\n        import n\n"
+    )
+    expected = {
+        "os": "module",
+        "typing": "module",
+        "a": "type_checking",
+        "b": "module",
+        "c": "module",
+        "d": "fallback",
+        "e": "module",
+        "f": "module",
+        "h": "module",
+        "i": "function",
+        "j": "type_checking",
+        "k": "function",
+        "l": "module",
+        "n": "function",
+    }
+    for fast in (False, True):
+        records = extract_imports(source, fast=fast)
+        contexts = {
+            record.module or record.names[0]: record.context for record in records
+        }
+        assert contexts == expected
+
+
+def test_eager_import_graph(package_path: Path) -> None:
+    package_path.joinpath("core.py").write_text(
+        "import os\nfrom typing import TYPE_CHECKING\n"
+        "if TYPE_CHECKING:\n    import decimal\n"
+        "try:\n    import ujson\nexcept ImportError:\n    ujson = None\n\n\n"
+        "def main():\n    import os\n    from sample import utils\n    return utils\n"
+    )
+    graph = CodeParser().parse_project(
+        package_path, is_module=False, excluded_directories=[]
+    )
+    # os is imported twice but never used
+    assert graph.edges["sample.core", "os"] == {
+        "count": 2,
+        "context": "module",
+        "dead": True,
+    }
+    assert graph.edges["sample.core", "sample.utils"]["context"] == "function"
+    assert graph.edges["sample.core", "decimal"]["context"] == "type_checking"
+    assert graph.edges["sample.sub.helpers", "sample.core"]["context"] == "function"
+    eager_graph = CodeParser(eager_only=True).parse_project(
+        package_path, is_module=False, excluded_directories=[]
+    )
+    assert set(eager_graph.successors("sample.core")) == {"os", "typing", "ujson"}
+    assert eager_graph.edges["sample.core", "os"]["count"] == 1
+    # The eager subgraph of the full graph has the same edges
+    subgraph = graph.eager_subgraph()
+    assert set(subgraph.edges) == set(eager_graph.edges)
+    assert list(subgraph.nodes) == [node for node in graph if node in eager_graph]
+    assert "decimal" not in subgraph
+    assert not subgraph.cycles()
+
+
+def test_dead_imports(tmp_path: Path) -> None:
+    source = tmp_path / "module.py"
+    source.write_text(
+        "from __future__ import annotations\n"
+        "import os\nimport os.path\nimport json, re as regex\n"
+        "from typing import TYPE_CHECKING, List\n"
+        "from . import helpers\nfrom a import *\n"
+        "if TYPE_CHECKING:\n    from numpy import ndarray\n"
+        "import json\n"
+        "__all__ = ['helpers']\n\n\n"
+        "def f(x: 'ndarray') -> List:\n"
+        "    import json\n    from typing import List\n"
+        "    return os.sep, json, List\n"
+    )
+    records = extract_imports(source)
+    dead_imports = {
+        (record.module, record.names): (record.unused, record.duplicates)
+        for record in records
+        if record.unused or record.duplicates
+    }
+    assert dead_imports == {
+        (None, ("json", "re")): (("re",), ()),
+        (None, ("json",)): ((), ("json",)),
+        ("typing", ("List",)): ((), ("List",)),
+    }
+    # Both later imports of json duplicate the first one
+    json_records = [record for record in records if record.names == ("json",)]
+    assert [record.duplicates for record in json_records] == [("json",), ("json",)]
+    # The fast scan finds the same duplicates but no unused names
+    fast_records = extract_imports(source, fast=True)
+    assert sorted(fast_records, key=repr) == sorted(
+        (record._replace(unused=()) for record in records), key=repr
+    )
+
+
+def test_names_used_in_strings_are_not_unused(tmp_path: Path) -> None:
+    source = tmp_path / "module.py"
+    source.write_text(
+        "from a import exported, Annotation, unused\n"
+        "__all__ = ['exported']\n\n\n"
+        "def f(x: 'Annotation') -> None:\n    pass\n"
+    )
+    for fast in (False, True):
+        (record,) = extract_imports(source, fast=fast)
+        assert record.unused == (() if fast else ("unused",))
+
+
+def test_dead_import_edges(package_path: Path) -> None:
+    package_path.joinpath("core.py").write_text(
+        "import os\nimport decimal\nfrom sample import utils\n"
+        "from sample.sub.helpers import helper, other\n\n\n"
+        "def main():\n    from sample import utils\n    return utils, other, os\n"
+    )
+    graph = CodeParser().parse_project(
+        package_path, is_module=False, excluded_directories=[]
+    )
+    assert graph.dead_imports() == [
+        ("sample.core", "decimal"),
+        ("sample.utils", "sys"),
+        ("sample.utils", "sample.sub.helpers"),
+        ("sample.sub.helpers", "json"),
+    ]
+    assert graph.duplicate_imports() == [("sample.core", "sample.utils", 1)]
+    # helper is unused but other is used
+    assert "dead" not in graph.edges["sample.core", "sample.sub.helpers"]
+    live_graph = graph.live_subgraph()
+    assert "decimal" not in live_graph
+    assert not live_graph.has_edge("sample.utils", "sample.sub.helpers")
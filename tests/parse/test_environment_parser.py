@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from depender.parse.environment import EnvironmentParser
+
+
+def test_parse_environment(site_packages_path: Path) -> None:
+    graph = EnvironmentParser(batch_size=2).parse_environment([str(site_packages_path)])
+    assert list(graph.nodes) == ["alpha", "beta-dist", "gamma", "os"]
+    assert graph.nodes["os"]["external"] is True
+    assert dict(graph.edges) == {
+        ("alpha", "os"): {"count": 1, "context": "module"},
+        ("alpha", "beta-dist"): {"count": 2, "context": "module"},
+        ("beta-dist", "gamma"): {"count": 1, "context": "module"},
+    }
+
+
+def test_parse_environment_without_external(site_packages_path: Path) -> None:
+    graph = EnvironmentParser().parse_environment(
+        [str(site_packages_path)], include_external=False
+    )
+    assert set(graph.nodes) == {"alpha", "beta-dist", "gamma"}
+    assert set(graph.edges) == {("alpha", "beta-dist"), ("beta-dist", "gamma")}
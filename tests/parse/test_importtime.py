@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+
+from depender.graph import DependencyGraph
+from depender.parse.importtime import ImportTimeParser, ImportTiming
+
+OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        300 | site
+import time:        50 |         50 |       sample.sub.helpers
+import time:        20 |         70 |     sample.sub
+import time:        40 |         40 |     json
+import time:        10 |        120 |   sample.utils
+import time:         5 |        125 | sample
+"""
+
+
+def test_parse_output() -> None:
+    timings = ImportTimeParser.parse_output(OUTPUT)
+    assert list(timings) == [
+        "_io",
+        "site",
+        "sample.sub.helpers",
+        "sample.sub",
+        "json",
+        "sample.utils",
+        "sample",
+    ]
+    assert timings["_io"].parent == "site"
+    assert timings["site"] == ImportTiming("site", 300, 300, None)
+    assert timings["sample.sub.helpers"].parent == "sample.sub"
+    assert timings["sample.sub"].parent == "sample.utils"
+    assert timings["json"] == ImportTiming("json", 40, 40, "sample.utils")
+    assert timings["sample.utils"].parent == "sample"
+    assert timings["sample"].parent is None
+
+
+def test_annotate() -> None:
+    timings = ImportTimeParser.parse_output(OUTPUT)
+    graph = DependencyGraph()
+    graph.add_node("sample.utils", label="sample.utils")
+    graph.add_node("json", label="json", external=True)
+    graph.add_node("os", label="os", external=True)
+    graph.add_edge("sample.utils", "json", count=1)
+    ImportTimeParser.annotate(graph, timings)
+    assert graph.nodes["sample.utils"]["self_time"] == 10
+    assert graph.nodes["sample.utils"]["cumulative_time"] == 120
+    assert graph.nodes["json"]["cumulative_time"] == 40
+    assert "self_time" not in graph.nodes["os"]
+
+
+def test_expensive_chains() -> None:
+    timings = ImportTimeParser.parse_output(OUTPUT)
+    chains = ImportTimeParser.expensive_chains(timings, count=2)
+    assert [[timing.module for timing in chain] for chain in chains] == [
+        ["site"],
+        ["site", "_io"],
+    ]
+
+
+def test_measure(package_path: Path) -> None:
+    parser = ImportTimeParser(repeat=1)
+    timings = parser.measure(["sample.core"], [package_path.parent])
+    assert {"sample", "sample.core", "sample.utils", "sample.sub.helpers"} <= set(
+        timings
+    )
+    assert timings["sample.utils"].parent == "sample.core"
+    assert "site" not in timings
+    with pytest.raises(RuntimeError):
+        parser.measure(["sample.missing"], [package_path.parent])
+
+
+def test_measure_without_importtime_support(tmp_path: Path) -> None:
+    # An interpreter ignoring -X importtime, like python 3.6
+    python = tmp_path / "python"
+    python.write_text("#!/bin/sh\nexit 0\n")
+    python.chmod(0o755)
+    with pytest.raises(RuntimeError, match="python 3.7"):
+        ImportTimeParser(python=str(python), repeat=1).measure(["os"])
@@ -0,0 +1,96 @@
+from depender.parse.code import ImportRecord
+from depender.parse.resolver import ImportResolver, ModuleIndex
+
+
+def make_resolver() -> ImportResolver:
+    resolver = ImportResolver({"pkg"})
+    for module in ["pkg.core", "pkg.sub.helpers", "pkg.sub.deep.leaf"]:
+        resolver.add_module(module)
+    return resolver
+
+
+def test_module_index() -> None:
+    index = ModuleIndex()
+    index.add("pkg.sub.helpers")
+    assert "pkg.sub.helpers" in index
+    assert "pkg.sub" not in index
+    assert "pkg.sub.helpers.other" not in index
+    assert index.submodules("pkg.sub", ("helpers", "missing")) == ["pkg.sub.helpers"]
+    assert index.submodules("missing", ("helpers",)) == []
+    index.add("pkg.sub")
+    index.remove("pkg.sub.helpers")
+    assert "pkg.sub.helpers" not in index
+    assert "pkg.sub" in index
+    index.remove("pkg.sub")
+    assert index.submodules("pkg", ("sub",)) == []
+    assert index._root == dict()
+
+
+def test_resolve_relative_imports() -> None:
+    resolver = make_resolver()
+    module = "pkg.sub.deep.leaf"
+    resolved = {
+        ImportRecord("from", None, ("helpers",), level=2): ["pkg.sub.helpers"],
+        ImportRecord("from", "helpers", ("helper",), level=2): ["pkg.sub.helpers"],
+        ImportRecord("from", None, ("core", "missing"), level=3): ["pkg.core"],
+        ImportRecord("from", "sub", ("helpers",), level=3): ["pkg.sub.helpers"],
+        # Beyond the top-level package
+        ImportRecord("from", None, ("core",), level=5): [],
+        ImportRecord("importlib", ".core", (), package="pkg"): ["pkg.core"],
+        ImportRecord("importlib", "..core", (), package="pkg.sub"): ["pkg.core"],
+        ImportRecord("importlib", ".core", ()): [],
+    }
+    for record, expected in resolved.items():
+        imported_nodes = resolver.resolve(record, module, include_external=True)
+        assert [node for node, _ in imported_nodes] == expected, record
+
+
+def test_resolve_absolute_imports() -> None:
+    resolver = make_resolver()
+    record = ImportRecord("import", None, ("os.path", "pkg.core", "pkg.sub"))
+    assert resolver.resolve(record, "pkg.sub.helpers", include_external=True) == (
+        ("os", {"label": "os external", "external": True}),
+        ("pkg.core", {"label": "pkg.core"}),
+    )
+    assert resolver.resolve(record, "pkg.sub.helpers", include_external=False) == (
+        ("pkg.core", {"label": "pkg.core"}),
+    )
+    record = ImportRecord("from", "pkg", ("core", "sub"))
+    assert [
+        node for node, _ in resolver.resolve(record, "pkg.core", include_external=True)
+    ] == ["pkg.core"]
+
+
+def test_new_modules_invalidate_resolutions() -> None:
+    resolver = make_resolver()
+    record = ImportRecord("from", None, ("extra",), level=1)
+    assert resolver.resolve(record, "pkg.core", include_external=True) == ()
+    resolver.add_module("pkg.extra")
+    assert resolver.resolve_all(
+        [record, record], "pkg.core", include_external=True
+    ) == (
+        ("pkg.extra", {"label": "pkg.extra"}),
+        ("pkg.extra", {"label": "pkg.extra"}),
+    )
+
+
+def test_memo_ignores_unrelated_fields_and_modules() -> None:
+    resolver = make_resolver()
+    record = ImportRecord("from", "pkg.sub", ("helpers",))
+    resolver.resolve(record, "pkg.core", include_external=True)
+    # The context and unused names do not change the resolution
+    assert len(resolver._resolved[("pkg", True)]) == 1
+    resolver.resolve(
+        record._replace(context="function", unused=("helpers",)),
+        "pkg.core",
+        include_external=True,
+    )
+    assert len(resolver._resolved[("pkg", True)]) == 1
+    # An unrelated module keeps the memoized resolution
+    resolver.add_module("pkg.other")
+    assert len(resolver._resolved[("pkg", True)]) == 1
+    # A module below the imported package forgets it
+    resolver.add_module("pkg.sub.extra")
+    assert len(resolver._resolved[("pkg", True)]) == 0
+    resolver.remove_module("pkg.sub.helpers")
+    assert resolver.resolve(record, "pkg.core", include_external=True) == ()
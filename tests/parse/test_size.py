@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from depender.parse.code import CodeParser
+from depender.parse.size import ModuleSizeParser
+
+
+def test_module_sizes(package_path: Path) -> None:
+    graph = CodeParser().parse_project(
+        package_path, is_module=False, excluded_directories=[]
+    )
+    sizes = ModuleSizeParser([package_path.parent]).measure(graph)
+    assert sizes["sample.core"] == package_path.joinpath("core.py").stat().st_size
+    assert sizes["sample.sub.helpers"] == (
+        package_path.joinpath("sub", "helpers.py").stat().st_size
+    )
+    assert sizes["json"] > 0
+    # sys is built into the interpreter
+    assert sizes["sys"] == 0
+
+
+def test_is_third_party() -> None:
+    assert ModuleSizeParser.is_third_party("numpy")
+    assert not ModuleSizeParser.is_third_party("json")
+    assert not ModuleSizeParser.is_third_party("sys")
+    assert not ModuleSizeParser.is_third_party("not_installed_package")
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import pytest
+from depender.parse.utilities import traverse_directory
+
+
+@pytest.fixture
+def directory(tmp_path: Path) -> Path:
+    for subdirectory in ("a/b/c", "a/d", "node_modules/x/y", ".git/objects", "e"):
+        tmp_path.joinpath(subdirectory).mkdir(parents=True)
+        tmp_path.joinpath(subdirectory, "file.txt").write_text("")
+    return tmp_path
+
+
+def test_traverse_directory_prunes_subtrees(directory: Path) -> None:
+    visited = [
+        root.relative_to(directory.resolve()).as_posix()
+        for root, _, _ in traverse_directory(
+            directory,
+            [directory.joinpath("node_modules").resolve()],
+            depth=2,
+            followlinks=False,
+        )
+    ]
+    assert sorted(visited) == [".", "a", "a/b", "a/d", "e"]
+
+
+def test_traverse_directory_breadth_first(directory: Path) -> None:
+    depths = [
+        len(root.relative_to(directory.resolve()).parts)
+        for root, _, _ in traverse_directory(
+            directory, [], depth=-1, followlinks=False, breadth_first=True
+        )
+    ]
+    assert depths == sorted(depths)
+    assert len(depths) == 9
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from depender.cli import main
+from depender.parse.cache import ParseCache
+
+
+def test_clear_cache_keeps_other_files(package_path: Path, tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    with ParseCache(cache_dir) as cache:
+        cache.set(package_path / "core.py", [])
+    other_file = cache_dir / "notes.txt"
+    other_file.write_text("not a cache file")
+    result = CliRunner().invoke(
+        main,
+        [
+            str(package_path),
+            "--backend",
+            "matplotlib",
+            "--output-dir",
+            str(tmp_path / "graphs"),
+            "--cache-dir",
+            str(cache_dir),
+            "--clear-cache",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert other_file.read_text() == "not a cache file"
+    # The cache was cleared, then filled again by the run
+    assert len(ParseCache(cache_dir)) == 3
+
+
+def test_clear_cache_removes_empty_directory(tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path / "cache")
+    cache.set(Path(__file__), [])
+    cache.save()
+    cache.clear()
+    assert not cache.cache_dir.exists()
+
+
+def test_packages_with_the_same_name(package_path: Path, tmp_path: Path) -> None:
+    other_package_path = tmp_path / "other" / package_path.name
+    other_package_path.mkdir(parents=True)
+    (other_package_path / "__init__.py").write_text("")
+    result = CliRunner().invoke(
+        main,
+        [
+            str(package_path),
+            "--package",
+            str(other_package_path),
+            "--backend",
+            "matplotlib",
+            "--output-dir",
+            str(tmp_path / "graphs"),
+            "--no-cache",
+        ],
+    )
+    assert result.exit_code == 1
+    assert f"Found two packages named '{package_path.name}'" in result.output
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+from depender.watch import ProjectWatcher
+
+
+def test_watcher_updates_graphs(package_path: Path) -> None:
+    watcher = ProjectWatcher(package_path, is_module=False, excluded_directories=[])
+    assert watcher.refresh() == (True, True)
+    assert watcher.refresh() == (False, False)
+    structure_graph = watcher.structure_graph
+    # Modify the imports of a module
+    package_path.joinpath("utils.py").write_text("import re\n")
+    assert watcher.refresh() == (True, False)
+    assert watcher.structure_graph is structure_graph
+    graph = watcher.dependency_graph
+    assert set(graph.successors("sample.utils")) == {"re"}
+    assert "sys" not in graph.nodes
+    # Add a module that is imported by an existing module
+    package_path.joinpath("extra.py").write_text("")
+    package_path.joinpath("utils.py").write_text("import sample.extra\n")
+    assert watcher.refresh() == (True, True)
+    assert set(watcher.dependency_graph.successors("sample.utils")) == {"sample.extra"}
+    # Delete it again, its importer no longer imports any module
+    package_path.joinpath("utils.py").write_text("from sample import extra\n")
+    watcher.refresh()
+    graph = watcher.dependency_graph
+    graph.layout(matrix=True)
+    package_path.joinpath("extra.py").unlink()
+    assert watcher.refresh() == (True, True)
+    assert watcher.dependency_graph is graph
+    assert "sample.extra" not in graph.nodes
+    assert set(graph.successors("sample.utils")) == set()
+    assert sorted(graph.nodes[node]["index"] for node in graph) == list(
+        range(graph.number_of_nodes())
+    )
+    fresh_watcher = ProjectWatcher(
+        package_path, is_module=False, excluded_directories=[]
+    )
+    fresh_watcher.refresh()
+    assert set(graph.edges) == set(fresh_watcher.dependency_graph.edges)
+
+
+def test_watcher_updates_import_contexts(package_path: Path) -> None:
+    watcher = ProjectWatcher(package_path, is_module=False, excluded_directories=[])
+    watcher.refresh()
+    graph = watcher.dependency_graph
+    assert graph.edges["sample.utils", "sys"]["context"] == "module"
+    # Move the import into a function
+    package_path.joinpath("utils.py").write_text(
+        "from sample.sub.helpers import helper\n\n\ndef f():\n    import sys\n"
+    )
+    assert watcher.refresh() == (True, False)
+    assert graph.edges["sample.utils", "sys"]["context"] == "function"
+    eager_watcher = ProjectWatcher(
+        package_path, is_module=False, excluded_directories=[], eager_only=True
+    )
+    eager_watcher.refresh()
+    assert "sys" not in eager_watcher.dependency_graph
+
+
+def test_watcher_updates_dead_imports(package_path: Path) -> None:
+    watcher = ProjectWatcher(package_path, is_module=False, excluded_directories=[])
+    watcher.refresh()
+    graph = watcher.dependency_graph
+    # utils never uses sys nor helper
+    assert graph.edges["sample.utils", "sys"]["dead"]
+    assert graph.edges["sample.utils", "sample.sub.helpers"]["dead"]
+    package_path.joinpath("utils.py").write_text(
+        "import sys\nfrom sample.sub.helpers import helper\n\n\n"
+        "def f():\n    import sys\n    return sys.argv, helper\n"
+    )
+    assert watcher.refresh() == (True, False)
+    assert graph.edges["sample.utils", "sys"] == {
+        "count": 2,
+        "context": "module",
+        "duplicates": 1,
+    }
+    assert "dead" not in graph.edges["sample.utils", "sample.sub.helpers"]